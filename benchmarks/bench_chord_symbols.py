@@ -0,0 +1,35 @@
+"""
+Times parse_progression on a generated 100k symbol lead sheet.
+
+Run from the repository root:
+    python -m benchmarks.bench_chord_symbols
+"""
+import random
+import timeit
+
+from score.chord_symbol import parse_progression
+from score.config import chord_data
+
+ROOTS = ['C', 'C#', 'Db', 'D', 'Eb', 'E', 'F', 'F#', 'Gb', 'G', 'Ab', 'A', 'Bb', 'B']
+
+
+def lead_sheet(num_symbols, seed=0):
+    rng = random.Random(seed)
+    aliases = [alias for props in chord_data.CHORD_TYPES.values() for alias in props[1]]
+    bars = []
+    for i in range(0, num_symbols):
+        symbol = rng.choice(ROOTS) + rng.choice(aliases)
+        if rng.random() < 0.1:
+            symbol += '/' + rng.choice(ROOTS)
+        bars.append(symbol)
+    return ' | '.join(bars)
+
+
+def main():
+    text = lead_sheet(100000)
+    seconds = min(timeit.repeat(lambda: parse_progression(text), number=1, repeat=3))
+    print('parse_progression, 100000 symbols: {:.1f} ms'.format(seconds * 1000))
+
+
+if __name__ == '__main__':
+    main()
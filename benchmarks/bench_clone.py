@@ -0,0 +1,73 @@
+"""
+Time to clone a 4 clef score of 50000 notes per clef, to replace the
+first 100 notes of every clef of the clone and to walk the whole clone.
+copy.deepcopy of the score is tried for comparison.
+
+Run from the repository root:
+    python -m benchmarks.bench_clone
+"""
+import copy
+import time
+
+from score.note import Note
+from score.score import Score
+from score.staff import Staff
+
+NUM_NOTES = 50000
+NUM_EDITS = 100
+
+
+def build(num_notes):
+    score = Score()
+    for staff_name in ['TrebleStaff', 'GreatStaff', 'BassStaff']:
+        staff = Staff(name=staff_name)
+        for clef in staff.clefs:
+            for i in range(0, num_notes):
+                clef.add_note(Note(48 + i % 24))
+        score.add_staff(staff)
+    return score
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def edit(score, num_edits):
+    for staff in score.staves:
+        for clef in staff.clefs:
+            current = clef.head
+            for _ in range(0, num_edits):
+                current.value = Note(current.value.number + 2)
+                current = current.next
+
+
+def walk(score):
+    count = 0
+    for staff in score.staves:
+        for clef in staff.clefs:
+            current = clef.head
+            while current is not None:
+                count += 1
+                current = current.next
+    return count
+
+
+def main():
+    score = build(NUM_NOTES)
+    clone, clone_time = timed(score.clone)
+    _, edit_time = timed(edit, clone, NUM_EDITS)
+    _, walk_time = timed(walk, clone)
+    print('clone:               {:10.3f} ms'.format(clone_time * 1000))
+    print('edit {} per clef:    {:10.3f} ms'.format(NUM_EDITS, edit_time * 1000))
+    print('walk the clone:      {:10.3f} ms'.format(walk_time * 1000))
+    try:
+        _, deepcopy_time = timed(copy.deepcopy, score)
+        print('copy.deepcopy:       {:10.3f} ms'.format(deepcopy_time * 1000))
+    except RecursionError:
+        print('copy.deepcopy:       RecursionError')
+
+
+if __name__ == '__main__':
+    main()
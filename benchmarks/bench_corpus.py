@@ -0,0 +1,68 @@
+"""
+Writes a corpus of 1000 scores of 1000 notes and chords, then times a
+pitch histogram and mean duration over all of its events, and opening
+one of its scores. Uses a temporary directory.
+
+Run from the repository root:
+    python -m benchmarks.bench_corpus
+"""
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from score.chord import Chord
+from score.corpus import Corpus, CorpusWriter
+from score.note import Note
+from score.score import Score
+from score.staff import Staff
+
+NUM_SCORES = 1000
+NUM_NOTES = 1000
+
+
+def build(seed, num_notes):
+    score = Score()
+    staff = Staff()
+    for i in range(0, num_notes):
+        if i % 8 == 7:
+            staff.clefs[0].add_note(Chord([48 + seed % 12, 52 + seed % 12]))
+        else:
+            staff.clefs[0].add_note(Note(48 + (seed + i) % 36, quarter_length=0.5))
+    score.add_staff(staff)
+    return score
+
+
+def main():
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, 'corpus')
+        start = time.perf_counter()
+        with CorpusWriter(path) as writer:
+            for seed in range(0, NUM_SCORES):
+                writer.add(build(seed, NUM_NOTES))
+        write_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        corpus = Corpus(path)
+        histogram = np.bincount(corpus.pitch, minlength=128)
+        mean_duration = corpus.duration.mean()
+        scan_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        title = corpus.score(NUM_SCORES // 2).title
+        open_time = time.perf_counter() - start
+
+        print('events:              {:10d}'.format(int(histogram.sum())))
+        print('build and write:     {:10.1f} s'.format(write_time))
+        print('scan all events:     {:10.1f} ms'.format(scan_time * 1000))
+        print('open one score:      {:10.3f} ms ({})'.format(open_time * 1000, title))
+        print('mean duration:       {:10.3f}'.format(mean_duration))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Indexes a corpus of 2000 scores of 500 notes in one process and in
+worker processes, re-runs the update with nothing changed, and times a
+metadata query. Uses a temporary directory.
+
+Run from the repository root:
+    python -m benchmarks.bench_corpus_index
+"""
+import os
+import shutil
+import tempfile
+import time
+
+from score.corpus import CorpusWriter
+from score.corpus_index import CorpusIndex
+from score.note import Note
+from score.score import Score
+from score.staff import Staff
+
+NUM_SCORES = 2000
+NUM_NOTES = 500
+INSTRUMENTS = ['Acoustic Grand Piano', 'Violin', 'Cello', 'Acoustic Bass']
+
+
+def build(seed):
+    score = Score(time_signature='3/4' if seed % 3 else '4/4')
+    score.title = 'Piece {}'.format(seed)
+    score.tempo = 60 + seed % 120
+    staff = Staff()
+    score.add_staff(staff)
+    staff.instrument = INSTRUMENTS[seed % len(INSTRUMENTS)]
+    for i in range(0, NUM_NOTES):
+        staff.clefs[0].add_note(Note(48 + (seed + i * 7) % 36, quarter_length=0.5))
+    return score
+
+
+def timed_update(database, path, processes):
+    if os.path.exists(database):
+        os.remove(database)
+    with CorpusIndex(database) as index:
+        start = time.perf_counter()
+        index.update(path, processes=processes)
+        return time.perf_counter() - start
+
+
+def main():
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, 'corpus')
+        database = os.path.join(directory, 'index.sqlite')
+        with CorpusWriter(path) as writer:
+            for seed in range(0, NUM_SCORES):
+                writer.add(build(seed))
+
+        serial_time = timed_update(database, path, 1)
+        parallel_time = timed_update(database, path, None)
+        with CorpusIndex(database) as index:
+            start = time.perf_counter()
+            updated = index.update(path)
+            noop_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            handles = index.find(time_signature='3/4', min_tempo=140, family='string')
+            query_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            handles[0].score
+            load_time = time.perf_counter() - start
+
+        print('scores:              {:10d}'.format(NUM_SCORES))
+        print('index, 1 process:    {:10.2f} s'.format(serial_time))
+        print('index, {:2d} processes: {:10.2f} s'.format(os.cpu_count() or 1, parallel_time))
+        print('update, no change:   {:10.1f} ms ({} indexed)'.format(noop_time * 1000, updated))
+        print('query:               {:10.2f} ms ({} scores)'.format(query_time * 1000, len(handles)))
+        print('load one handle:     {:10.3f} ms'.format(load_time * 1000))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
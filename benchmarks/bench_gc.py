@@ -0,0 +1,63 @@
+"""
+Builds a score of 3 staves and 4 clefs of 50000 notes, chords and rests
+each, drops it and reports how many objects only the cyclic garbage
+collector could free, and the pause of that collection. The pause of a
+full collection while the score is alive, and the time reference
+counting takes to free the score, are reported too.
+
+Run from the repository root:
+    python -m benchmarks.bench_gc
+"""
+import gc
+import time
+
+from score.chord import Chord
+from score.note import Note, Rest
+from score.score import Score
+from score.staff import Staff
+
+NUM_NOTES = 50000
+
+
+def build(num_notes):
+    score = Score()
+    for staff_name in ['TrebleStaff', 'GreatStaff', 'BassStaff']:
+        staff = Staff(name=staff_name)
+        for clef in staff.clefs:
+            for i in range(0, num_notes):
+                if i % 16 == 15:
+                    clef.add_note(Rest())
+                elif i % 16 == 7:
+                    clef.add_note(Chord([60, 64, 67]))
+                else:
+                    clef.add_note(Note(48 + i % 24))
+        score.add_staff(staff)
+    return score
+
+
+def timed_collect():
+    start = time.perf_counter()
+    collected = gc.collect()
+    return collected, time.perf_counter() - start
+
+
+def main():
+    gc.collect()
+    gc.disable()
+    score = build(NUM_NOTES)
+    clefs = sum(len(staff.clefs) for staff in score.staves)
+    _, alive_pause = timed_collect()
+    start = time.perf_counter()
+    del score
+    drop = time.perf_counter() - start
+    collected, pause = timed_collect()
+    gc.enable()
+    print('notes:                        {:8d}'.format(clefs * NUM_NOTES))
+    print('full collection, score alive: {:8.1f} ms'.format(alive_pause * 1000))
+    print('freeing the score:            {:8.1f} ms'.format(drop * 1000))
+    print('objects left to the collector:{:8d}'.format(collected))
+    print('collection after del:         {:8.1f} ms'.format(pause * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Times importing score.score on top of mido with python -X importtime,
+and fails when it takes longer than the budget.
+
+Run from the repository root:
+    python -m benchmarks.bench_import [budget in ms]
+
+Byte code is cached for the timings to mean anything. When
+PYTHONDONTWRITEBYTECODE is set, it is cached under a temporary
+PYTHONPYCACHEPREFIX instead.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+BUDGET_MS = 10.0
+REPEAT = 7
+
+
+def import_time(module, after='mido'):
+    """Cumulative import time of module, in ms, with after imported
+    first, as reported by -X importtime
+    """
+    env = dict(os.environ)
+    if env.pop('PYTHONDONTWRITEBYTECODE', None) and not env.get('PYTHONPYCACHEPREFIX'):
+        env['PYTHONPYCACHEPREFIX'] = os.path.join(tempfile.gettempdir(), 'score-pycache')
+    code = 'import {}; import {}'.format(after, module)
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            stderr=subprocess.PIPE, universal_newlines=True,
+                            env=env, check=True)
+    for line in result.stderr.splitlines():
+        parts = [part.strip() for part in line.split('|')]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1000.0
+    raise RuntimeError('{} was not imported'.format(module))
+
+
+def main():
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else BUDGET_MS
+    import_time('score.score')  # caches byte code
+    mido = min(import_time('mido', after='sys') for _ in range(0, REPEAT))
+    score = min(import_time('score.score') for _ in range(0, REPEAT))
+    print('import mido:                {:8.1f} ms'.format(mido))
+    print('import score.score, + mido: {:8.1f} ms (budget {:.1f} ms)'.format(score, budget))
+    if score > budget:
+        sys.exit('score.score import is over budget')
+
+
+if __name__ == '__main__':
+    main()
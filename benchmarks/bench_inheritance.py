@@ -0,0 +1,47 @@
+"""
+Times appending 20000 notes to a clef, reading their attack velocity, and
+changing the tempo of the score they belong to.
+
+Run from the repository root:
+    python -m benchmarks.bench_inheritance
+"""
+import timeit
+
+from score.note import Note
+from score.score import Score
+from score.staff import Clef, Staff
+
+NUM_NOTES = 20000
+
+
+def append(notes):
+    clef = Clef()
+    for note in notes:
+        note.reset_position()
+        clef.add_note(note)
+    return clef
+
+
+def main():
+    notes = [Note(60 + i % 12) for i in range(0, NUM_NOTES)]
+    appending = min(timeit.repeat(lambda: append(notes), number=1, repeat=3))
+
+    score = Score()
+    staff = Staff()
+    score.add_staff(staff)
+    for note in notes:
+        note.reset_position()
+        staff.clefs[0].add_note(note)
+    reading = min(timeit.repeat(lambda: [n.attack_velocity for n in notes],
+                                number=1, repeat=3))
+
+    def change_tempo():
+        score.tempo = 90 if score.tempo != 90 else 100
+    changing = min(timeit.repeat(change_tempo, number=1000, repeat=3)) / 1000
+    print('append {} notes:        {:8.2f} ms'.format(NUM_NOTES, appending * 1000))
+    print('read {} velocities:   {:8.2f} ms'.format(NUM_NOTES, reading * 1000))
+    print('change the score tempo:   {:8.2f} us'.format(changing * 1e6))
+
+
+if __name__ == '__main__':
+    main()
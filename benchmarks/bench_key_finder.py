@@ -0,0 +1,38 @@
+"""
+Times KeyFinder on a 10000 bar, 4/4 melody that modulates every 8 bars.
+
+Run from the repository root:
+    python -m benchmarks.bench_key_finder
+"""
+import random
+import timeit
+
+from score.key_finder import KeyFinder
+from score.note import Note
+from score.scale import MajorScale
+from score.staff import Clef
+
+
+def melody(num_bars, seed=0):
+    rng = random.Random(seed)
+    clef = Clef()
+    for bar in range(0, num_bars):
+        if bar % 8 == 0:
+            scale = [n.number for n in MajorScale(rng.randint(48, 59)).note_sequence]
+        for beat in range(0, 4):
+            clef.add_note(Note(rng.choice(scale)))
+    return clef
+
+
+def main():
+    clef = melody(10000)
+    finder = KeyFinder()
+    whole = min(timeit.repeat(lambda: finder.find(clef), number=1, repeat=3))
+    windows = min(timeit.repeat(lambda: finder.find_windows(clef, window=32.0, step=4.0),
+                                number=1, repeat=3))
+    print('find, 10000 bars:         {:8.1f} ms'.format(whole * 1000))
+    print('find_windows, 10000 bars: {:8.1f} ms'.format(windows * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Measures the memory held by the notes of a 100000 note clef with
+tracemalloc, in bytes per note, and the time taken to build them.
+
+Run from the repository root:
+    python -m benchmarks.bench_memory
+"""
+import gc
+import time
+import tracemalloc
+
+from score.chord import Chord
+from score.note import Note, Rest
+from score.staff import Clef
+
+NUM_NOTES = 100000
+
+
+def build(num_notes):
+    clef = Clef()
+    for i in range(0, num_notes):
+        if i % 16 == 15:
+            clef.add_note(Rest())
+        elif i % 16 == 7:
+            clef.add_note(Chord([60, 64, 67]))
+        else:
+            clef.add_note(Note(48 + i % 24))
+    return clef
+
+
+def main():
+    build(16)  # imports and caches outside the measurement
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    before = tracemalloc.get_traced_memory()[0]
+    clef = build(NUM_NOTES)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    print('bytes per note: {:8.0f}'.format(held / float(NUM_NOTES)))
+    print('build time:     {:8.2f} s'.format(elapsed))
+    return clef
+
+
+if __name__ == '__main__':
+    main()
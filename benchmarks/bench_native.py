@@ -0,0 +1,59 @@
+"""
+Saves and loads a score of 1000000 notes, chords and rests (4 clefs) in
+the native format, and times building the notes of one loaded clef.
+pickle of the same score is tried for comparison.
+
+Run from the repository root:
+    python -m benchmarks.bench_native
+"""
+import pickle
+import time
+
+from score.chord import Chord
+from score.note import Note, Rest
+from score.score import Score
+from score.staff import Staff
+
+NUM_NOTES = 250000
+
+
+def build(num_notes):
+    score = Score()
+    for staff_name in ['TrebleStaff', 'GreatStaff', 'BassStaff']:
+        staff = Staff(name=staff_name)
+        for clef in staff.clefs:
+            for i in range(0, num_notes):
+                if i % 16 == 15:
+                    clef.add_note(Rest())
+                elif i % 16 == 7:
+                    clef.add_note(Chord([60, 64, 67]))
+                else:
+                    clef.add_note(Note(48 + i % 24, quarter_length=0.5))
+        score.add_staff(staff)
+    return score
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    score = build(NUM_NOTES)
+    data, dumps_time = timed(score.dumps)
+    loaded, loads_time = timed(Score.loads, data)
+    _, build_time = timed(lambda: loaded.staves[0].clefs[0].head)
+    print('dumps:               {:10.1f} ms, {:.1f} MB'.format(dumps_time * 1000,
+                                                          len(data) / 1e6))
+    print('loads:               {:10.1f} ms'.format(loads_time * 1000))
+    print('build one clef:      {:10.1f} ms'.format(build_time * 1000))
+    try:
+        _, pickle_time = timed(pickle.dumps, score)
+        print('pickle.dumps:        {:10.1f} ms'.format(pickle_time * 1000))
+    except (RecursionError, TypeError) as error:
+        print('pickle.dumps:        {}'.format(type(error).__name__))
+
+
+if __name__ == '__main__':
+    main()
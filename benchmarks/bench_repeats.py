@@ -0,0 +1,69 @@
+"""
+Memory of a 16 note motif repeated 5000 times in a clef, once with new
+notes and chords for every repetition and once with the motif's objects
+shared through placements.
+
+Run from the repository root:
+    python -m benchmarks.bench_repeats
+"""
+import gc
+import tracemalloc
+
+from score.chord import Chord
+from score.note import Note, Rest
+from score.staff import Clef
+
+REPEATS = 5000
+MOTIF_LENGTH = 16
+
+
+def motif():
+    objects = []
+    for i in range(0, MOTIF_LENGTH):
+        if i % 8 == 7:
+            objects.append(Chord([60, 64, 67]))
+        elif i % 8 == 3:
+            objects.append(Rest())
+        else:
+            objects.append(Note(60 + i))
+    return objects
+
+
+def copied(repeats):
+    clef = Clef()
+    for _ in range(0, repeats):
+        for obj in motif():
+            clef.add_note(obj)
+    return clef
+
+
+def shared(repeats):
+    clef = Clef()
+    objects = motif()
+    for _ in range(0, repeats):
+        for obj in objects:
+            clef.add_note(obj)
+    return clef
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    clef = build(REPEATS)
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return clef, held / float(REPEATS)
+
+
+def main():
+    copied(1)
+    shared(1)
+    _, per_copy = measure(copied)
+    _, per_share = measure(shared)
+    print('bytes per repetition, new objects: {:8.0f}'.format(per_copy))
+    print('bytes per repetition, placements:  {:8.0f}'.format(per_share))
+
+
+if __name__ == '__main__':
+    main()
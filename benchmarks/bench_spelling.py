@@ -0,0 +1,49 @@
+"""
+Times respell on a 10000 bar, 4/4 melody in A major built from note
+numbers, against spelling each note through Note.enharmonic.
+
+Run from the repository root:
+    python -m benchmarks.bench_spelling
+"""
+import random
+import timeit
+
+from score.key import KeySignature
+from score.note import Note
+from score.spelling import respell, notes
+from score.staff import Clef
+
+A_MAJOR = [57, 59, 61, 62, 64, 66, 68, 69]
+
+
+def melody(num_bars, seed=0):
+    rng = random.Random(seed)
+    clef = Clef()
+    for bar in range(0, num_bars * 4):
+        clef.add_note(Note(rng.choice(A_MAJOR)))
+    return clef
+
+
+def enharmonic_respell(clef, key):
+    # Respells every note by building its enharmonic Note
+    for note in notes(clef):
+        if note.pitch != key.spellings[note.number % 12]:
+            enharmonic = Note(note.enharmonic)
+            note._name = enharmonic.name
+            note._pitch = enharmonic.pitch
+            note._enharmonic = enharmonic.enharmonic
+
+
+def main():
+    key = KeySignature('A')
+    clefs = [melody(10000), melody(10000)]
+    enharmonic = timeit.timeit(lambda: enharmonic_respell(clefs[0], key), number=1)
+    respelled = timeit.timeit(lambda: respell(clefs[1], key), number=1)
+    spelled = min(timeit.repeat(lambda: respell(clefs[1], key), number=1, repeat=3))
+    print('enharmonic Notes, 10000 bars: {:8.1f} ms'.format(enharmonic * 1000))
+    print('respell, 10000 bars:          {:8.1f} ms'.format(respelled * 1000))
+    print('respell, already spelled:     {:8.1f} ms'.format(spelled * 1000))
+
+
+if __name__ == '__main__':
+    main()
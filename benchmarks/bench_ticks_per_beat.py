@@ -0,0 +1,58 @@
+"""
+Times planning midi ticks per beat for a score of 64 clefs, each holding
+2000 notes of 40 different durations: from the denominators the clefs
+keep, and by collecting every clef's unique durations and computing the
+denominators from them.
+
+Run from the repository root:
+    python -m benchmarks.bench_ticks_per_beat
+"""
+import time
+
+from score.midi import Midi, MidiScore
+from score.note import Note
+from score.score import Score
+from score.staff import Staff
+
+NUM_STAVES = 32
+NUM_NOTES = 2000
+REPEATS = 1000
+
+
+def build():
+    score = Score()
+    for s in range(0, NUM_STAVES):
+        staff = Staff('GreatStaff')
+        for clef in staff.clefs:
+            for i in range(0, NUM_NOTES):
+                clef.add_note(Note(60, quarter_length=(1 + i % 40) / 8.0))
+        score.add_staff(staff)
+    return score
+
+
+def main():
+    score = build()
+    clefs = [clef for staff in score.staves for clef in staff.clefs]
+    midi = MidiScore(score)
+
+    start = time.perf_counter()
+    for i in range(0, REPEATS):
+        midi.plan_clefs(clefs)
+    planned_time = (time.perf_counter() - start) / REPEATS
+
+    start = time.perf_counter()
+    for i in range(0, REPEATS):
+        quarter_lengths = []
+        for clef in clefs:
+            quarter_lengths += clef.unique_quarter_lengths
+        ticks_per_beat = Midi.best_ticks_per_beat(*quarter_lengths)
+    collected_time = (time.perf_counter() - start) / REPEATS
+
+    print('clefs:                    {:8d}'.format(len(clefs)))
+    print('ticks per beat:           {:8d} ({})'.format(midi.ticks_per_beat, ticks_per_beat))
+    print('from clef denominators:   {:8.1f} us'.format(planned_time * 1e6))
+    print('from collected durations: {:8.1f} us'.format(collected_time * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Compares Chord.voicings against the permutation based enumeration that
+Chord.inversion_numbers used before it, on 6 and 7 note chords.
+
+Run from the repository root:
+    python -m benchmarks.bench_voicings
+"""
+import timeit
+
+from score.base import unique_permutations
+from score.chord import PopularChord
+from score.config import config
+from score.note import Note
+
+
+def legacy_inversion_numbers(chord):
+    pitches = [n.pitch for n in chord.notes]
+    perms = list(unique_permutations(pitches))
+    numbers = {}
+
+    for i in range(0, len(pitches)):
+        note = pitches[i]
+        base_num = Note.get_base_note_number(note)
+        numbers[note] = [j for j in range(base_num, config.MAX_NOTE_NUM, 12)]
+
+    inversions = []
+    for chd in perms:
+        first_pitch = chd[0]
+        for i in numbers[first_pitch]:
+            inv = [i]
+            for j in range(1, len(chd)):
+                if j != len(inv): break
+                for k in numbers[chd[j]]:
+                    if (k > inv[j - 1]) and (k - inv[0] <= 12):
+                        inv.append(k)
+                        break
+            if len(inv) == len(chd):
+                inversions.append(inv)
+    return inversions
+
+
+def main():
+    for name in ['dominant-11th', 'dominant-13th']:
+        chord = PopularChord('C', name=name)
+        legacy = sorted(legacy_inversion_numbers(chord))
+        current = chord.inversion_numbers
+        assert legacy == current, name
+        legacy_time = min(timeit.repeat(lambda: legacy_inversion_numbers(chord),
+                                        number=1, repeat=3))
+        current_time = min(timeit.repeat(lambda: chord.inversion_numbers,
+                                         number=1, repeat=3))
+        first_time = min(timeit.repeat(lambda: next(chord.voicings()),
+                                       number=1, repeat=3))
+        print('{} ({} notes, {} voicings)'.format(name, len(chord.notes),
+                                                  len(current)))
+        print('  permutations:  {:10.3f} ms'.format(legacy_time * 1000))
+        print('  voicings:      {:10.3f} ms'.format(current_time * 1000))
+        print('  first voicing: {:10.3f} ms'.format(first_time * 1000))
+
+
+if __name__ == '__main__':
+    main()
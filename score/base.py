@@ -1,6 +1,12 @@
+import weakref
+
 from score.config import config
 from score.midi import MidiFactory
 
+# Fields that few music objects ever set (e.g. lyrics), keyed by object so
+# that objects without them carry no storage for them
+_side_table = weakref.WeakKeyDictionary()
+
 
 def unique_permutations(elements):
     if len(elements) == 1:
@@ -14,8 +20,29 @@ def unique_permutations(elements):
                 yield (first_element,) + sub_permutation
 
 
+def get_logger(name):
+    """The logger of a score module. logging is imported on first use so
+    that importing score stays cheap
+    """
+    import logging
+    return logging.getLogger(name)
+
+
+def pitch_class_mask(numbers):
+    """Bit mask of the pitch classes of the given note numbers. Bit i
+    is set when pitch class i is present, so that set operations on
+    pitch classes become integer operations
+    """
+    mask = 0
+    for number in numbers:
+        mask |= 1 << (number % 12)
+    return mask
+
+
 class ScoreObject(object):
 
+    __slots__ = ()
+
     def is_music_letter(self, letter):
         if not self.contains(str(letter).upper(), config.MUSIC_LETTERS):
             return False
@@ -61,16 +88,34 @@ class ScoreObject(object):
         return item in collection
 
 
+class ParentLink(object):
+    """What children hold of their parent. Calling the link returns the
+    parent, or None once it is gone. The parent's children share one link,
+    which holds the parent by weak reference, so that a parent and its
+    children never form a reference cycle. A parent that goes away leaves
+    a stand-in in the link, with the attributes it set itself and its own
+    parent, for its children to keep resolving through
+    """
+
+    __slots__ = ('_parent', 'stand_in')
+
+    def __init__(self, parent):
+        self._parent = weakref.ref(parent)
+        self.stand_in = None
+
+    def __call__(self):
+        return self._parent()
+
+
 class ScoreMusicObject(ScoreObject):
 
+    __slots__ = ('_head', '_current', '_parent', '_link', '__weakref__')
+
     def __init__(self):
         self._head = None
         self._current = None
-        self._midi = None
         self._parent = None
 
-        self._set_midi()
-
     def inherit(self, obj, props=['time_signature', 'tempo', 'volume',
                                   'attack_velocity', 'release_velocity']):
         super(ScoreMusicObject, self).inherit(obj, props=props)
@@ -79,16 +124,42 @@ class ScoreMusicObject(ScoreObject):
         self._head = head
         self._current = head
 
-    def _set_midi(self):
-        self._midi = MidiFactory.create_midi(self)
+    def _set_parent(self, parent):
+        """Parents are held through their ParentLink"""
+        self._parent = None if parent is None else parent._child_link()
+
+    def _child_link(self):
+        """The link the children of this object hold, see ParentLink. It
+        is made when the first child is set, which some objects do before
+        their constructor gets to initialise this one
+        """
+        link = getattr(self, '_link', None)
+        if link is None:
+            link = self._link = ParentLink(self)
+        return link
+
+    def _get_side(self, name, default=None):
+        """A rarely set field, stored in the side table"""
+        return _side_table.get(self, {}).get(name, default)
+
+    def _set_side(self, name, value):
+        fields = _side_table.get(self)
+        if fields is None:
+            fields = _side_table[self] = {}
+        fields[name] = value
 
     @property
     def parent(self):
-        return self._parent
+        if self._parent is None:
+            return None
+        return self._parent()
 
     @property
     def midi(self):
-        return self._midi
+        """A midi file of the object as it is now. Built on every access,
+        the object does not keep it
+        """
+        return MidiFactory.create_midi(self)
 
     @property
     def head(self):
@@ -123,6 +194,18 @@ class KeyException(ScoreException):
     pass
 
 
+class InstrumentException(ScoreException):
+    pass
+
+
+class NativeFormatException(ScoreException):
+    pass
+
+
+class CorpusException(ScoreException):
+    pass
+
+
 def main():
     pass
 
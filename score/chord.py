@@ -1,23 +1,73 @@
-from score.base import unique_permutations, ChordException
-from score.config import chord_data
+import functools
+
+from score.base import ChordException
+from score.chord_symbol import parse_symbol
 from score.config import config
 from score.consonance import ChordConsonance
 from score.note import Note, NoteBase
 
 
+def compile_templates(table):
+    """Parses the comma separated degree strings of a chord_data
+    table into tuples of integers. Done once, on first use, so that
+    chords never re-split the strings when their root or name changes
+    """
+    templates = {}
+    for name, props in table.items():
+        templates[name] = tuple(int(degree) for degree in props[0].split(','))
+    return templates
+
+
+# Template tables and the chord_data tables they are compiled from
+_TEMPLATE_TABLES = {
+    'CHORD_TEMPLATES': 'CHORD_TYPES',
+    'ROMAN_NUMERAL_TEMPLATES': 'ROMAN_NUMERALS'
+}
+
+
+def templates(name):
+    """CHORD_TEMPLATES or ROMAN_NUMERAL_TEMPLATES. chord_data is
+    imported and compiled on first use
+    """
+    table = globals().get(name)
+    if table is None:
+        from score.config import chord_data
+        table = compile_templates(getattr(chord_data, _TEMPLATE_TABLES[name]))
+        globals()[name] = table
+    return table
+
+
+# Chords kept by PopularChord.cached and RomanNumeral.cached, the least
+# recently used ones are dropped first
+CACHED_CHORDS = 1024
+
+
+@functools.lru_cache(maxsize=CACHED_CHORDS)
+def _cached_chord(chord_class, *arguments):
+    chord = chord_class(*arguments)
+    chord._share()
+    return chord
+
+
+def __getattr__(name):
+    if name in _TEMPLATE_TABLES:
+        return templates(name)
+    raise AttributeError('module {} has no attribute {}'.format(__name__, name))
+
+
 class Chord(NoteBase):
 
+    __slots__ = ('_notes', '_input', '_consonance')
+
     def __init__(self, chord_input=['C3', 'E4', 'G4'],
                  quarter_length=1.0):
-        self._lyric = None
-        self._notes = None
+        self._notes = []
         self._input = None
-        self._note_names = None
-        self._note_numbers = None
         self._consonance = None
 
         super(Chord, self).__init__(quarter_length=quarter_length)
-        self.input = chord_input
+        if chord_input is not None:
+            self.input = chord_input
 
     def __str__(self):
         return '{}'.format(self._notes)
@@ -25,6 +75,9 @@ class Chord(NoteBase):
     def __repr__(self):
         return '{}'.format(self._notes)
 
+    def __del__(self):
+        self._orphan_children()
+
     def __lt__(self, other):
         """
         Implemented this method to enable the bisect module to compare
@@ -32,7 +85,21 @@ class Chord(NoteBase):
         """
         return self.consonance < other.consonance
 
+    def _share(self):
+        super(Chord, self)._share()
+        for note in self._notes:
+            note._is_shared = True
+
+    def copy(self):
+        chord = super(Chord, self).copy()
+        chord._notes = [note.copy() for note in self._notes]
+        for note in chord._notes:
+            note._set_parent(chord)
+        return chord
+
     def has_pitch(self, note):
+        if isinstance(note, NoteBase):
+            note = note.value
         if not isinstance(note, Note):
             note = Note(note)
         for i in range(0, len(self.notes)):
@@ -49,11 +116,18 @@ class Chord(NoteBase):
         return False
 
     def add_note(self, note):
+        self._validate_change()
+        if isinstance(note, NoteBase):
+            note = note.value
         if isinstance(note, Note):
+            if note.is_shared:
+                note = note.copy()
             note.quarter_length = self.quarter_length
         else:
             note = Note(note, quarter_length=self.quarter_length)
         if not self.has_note(note):
+            # Chord notes take their unset attributes from the chord
+            note._set_parent(self)
             self._notes.append(note)
 
     def set_attack_velocities(self, vel):
@@ -64,6 +138,34 @@ class Chord(NoteBase):
         for note in self._notes:
             note.release_velocity = vel
 
+    @staticmethod
+    def from_symbol(symbol, octave=4, quarter_length=1.0):
+        """Returns the PopularChord written as a lead sheet symbol, e.g.
+        'F#m7b5/E', rooted in the given octave. A slash bass note is
+        placed below the root
+        """
+        root, name, bass = parse_symbol(symbol)
+        return PopularChord(root='{}{}'.format(root, octave), name=name,
+                            quarter_length=quarter_length, bass=bass)
+
+    @staticmethod
+    def root_number(root):
+        if isinstance(root, NoteBase):
+            root = root.value
+        if isinstance(root, Note):
+            return root.number
+        if Note.is_note_name(root):
+            return Note.name_to_number(root)
+        return root
+
+    def _set_notes_from_degrees(self, root, degrees):
+        self._notes = [Note(root.number + degree,
+                            quarter_length=self.quarter_length)
+                       for degree in degrees]
+        for note in self._notes:
+            note._set_parent(self)
+        self._consonance = None
+
     def _set_consonance(self):
         cns = ChordConsonance(notes=self.notes)
         self._consonance = cns.consonance
@@ -81,8 +183,7 @@ class Chord(NoteBase):
 
     @staticmethod
     def treblelize(chd):
-        top = 84
-        bottom = 60
+        bottom, top = config.TREBLE_RANGE
         numbers = chd.note_numbers
         new_numbers = Chord.shift_range(numbers, top, bottom)
         new_chd = Chord(new_numbers)
@@ -91,8 +192,7 @@ class Chord(NoteBase):
 
     @staticmethod
     def bassify(chd):
-        top = 60
-        bottom = 36
+        bottom, top = config.BASS_RANGE
         numbers = chd.note_numbers
         new_numbers = Chord.shift_range(numbers, top, bottom)
         new_chd = Chord(new_numbers)
@@ -101,30 +201,25 @@ class Chord(NoteBase):
 
     @staticmethod
     def are_treble_clef_numbers(chd):
-        top = 84
-        bottom = 60
+        bottom, top = config.TREBLE_RANGE
         if (min(chd) >= bottom) and (max(chd) <= top):
             return True
         return False
 
     @staticmethod
     def are_bass_clef_numbers(chd):
-        top = 60
-        bottom = 36
+        bottom, top = config.BASS_RANGE
         if (min(chd) >= bottom) and (max(chd) <= top):
             return True
         return False
 
-    @property
-    def quarter_length(self):
-        return self._quarter_length
-
-    @quarter_length.setter
-    def quarter_length(self, quarter_length):
+    @NoteBase.ticks.setter
+    def ticks(self, ticks):
+        NoteBase.ticks.fset(self, ticks)
         if self._notes is not None:
+            # Only the chord is in a sequence, its notes follow it
             for note in self._notes:
-                note.quarter_length = quarter_length
-        self._quarter_length = quarter_length
+                note._ticks = self._ticks
 
     @property
     def consonance(self):
@@ -142,11 +237,13 @@ class Chord(NoteBase):
 
     @input.setter
     def input(self, chord_input):
+        self._validate_change()
         self.validate_type(chord_input, list)
         self._notes = []
         for n in chord_input:
             self.add_note(n)
         self._input = chord_input
+        self._consonance = None
 
     @property
     def note_names(self):
@@ -164,57 +261,128 @@ class Chord(NoteBase):
 
     @property
     def inversion_numbers(self):
-        num_of_notes = len(self._notes)
-        if num_of_notes == 1:
-            return [self._numbers]
-
-        pitches = [n.pitch for n in self._notes]
-        perms = list(unique_permutations(pitches))
-        numbers = {}
-
-        for i in range(0, len(pitches)):
-            note = pitches[i]
-            base_num = Note.get_base_note_number(note)
-            numbers[note] = [j for j in range(base_num, config.MAX_NOTE_NUM, 12)]
-
-        inversions = []
-        for chord in perms:
-            first_pitch = chord[0]
-            for i in numbers[first_pitch]:
-                inv = [i]
-                for j in range(1, len(chord)):
-                    if j != len(inv): break
-                    for k in numbers[chord[j]]:
-                        # if j != len(inv): break
-                        if (k > inv[j - 1]) and (k - inv[0] <= 12):
-                            inv.append(k)
-                            break
-                if len(inv) == len(chord):
-                    inversions.append(inv)
-        return inversions
+        """Close position voicings of this chord, spanning at most an
+        octave, in every octave below the highest midi note
+        """
+        return list(self.voicings(top=config.MAX_NOTE_NUM - 1))
+
+    def voicings(self, bottom=config.MIN_NOTE_NUM, top=config.MAX_NOTE_NUM,
+                 max_span=12, min_spacing=1, max_spacing=None):
+        """Lazily yields the voicings of this chord as ascending lists of
+        note numbers. Each voicing holds every pitch class of the chord as
+        many times as it appears in the chord, lies within bottom and top,
+        spans at most max_span semitones (no limit if None) and keeps
+        adjacent voices between min_spacing and max_spacing semitones
+        apart. Voicings are yielded in ascending lexicographic order and
+        are built note by note, so no permutation is ever materialised
+        """
+        if min_spacing < 1:
+            raise ChordException('Voices must be at least a semitone apart')
+        remaining = [0] * 12
+        for note in self._notes:
+            remaining[note.number % 12] += 1
+        size = len(self._notes)
+        if size == 0:
+            return
+        for bass in range(bottom, top + 1):
+            if bass + (size - 1) * min_spacing > top:
+                break
+            pitch_class = bass % 12
+            if not remaining[pitch_class]:
+                continue
+            ceiling = top if max_span is None else min(top, bass + max_span)
+            remaining[pitch_class] -= 1
+            for voicing in self._extend_voicing([bass], remaining, size - 1,
+                                                ceiling, min_spacing,
+                                                max_spacing):
+                yield voicing
+            remaining[pitch_class] += 1
+
+    @classmethod
+    def _extend_voicing(cls, voicing, remaining, left, ceiling, min_spacing,
+                        max_spacing):
+        if not left:
+            yield list(voicing)
+            return
+        prev = voicing[-1]
+        highest = ceiling - (left - 1) * min_spacing
+        if max_spacing is not None:
+            highest = min(highest, prev + max_spacing)
+        for number in range(prev + min_spacing, highest + 1):
+            pitch_class = number % 12
+            if not remaining[pitch_class]:
+                continue
+            remaining[pitch_class] -= 1
+            voicing.append(number)
+            for extended in cls._extend_voicing(voicing, remaining, left - 1,
+                                                ceiling, min_spacing,
+                                                max_spacing):
+                yield extended
+            voicing.pop()
+            remaining[pitch_class] += 1
 
 
 class PopularChord(Chord):
 
-    def __init__(self, root='C4', name='major', quarter_length=1.0):
-        self._quarter_length = None
+    __slots__ = ('_root', '_name', '_bass')
+
+    def __init__(self, root='C4', name='major', quarter_length=1.0,
+                 bass=None):
+        self._ticks = None
         self._root = None
         self._name = None
+        self._bass = None
 
-        super(PopularChord, self).__init__()
-        self.quarter_length = quarter_length
+        super(PopularChord, self).__init__(chord_input=None,
+                                           quarter_length=quarter_length)
         self.root = root
         self.name = name
+        self.bass = bass
 
     def _update_notes(self):
         if self._root and self._name:
-            chord_props = chord_data.CHORD_TYPES[self._name]
-            degrees = chord_props[0].split(',')
-            self._notes = []
-            notes = [int(n) + self.root.number for n in degrees]
-            for n in notes:
-                note = Note(n, quarter_length=self._quarter_length)
-                self._notes.append(note)
+            self._set_notes_from_degrees(self._root,
+                                         templates('CHORD_TEMPLATES')[self._name])
+            if self._bass is not None:
+                # Closest note below the root with the pitch of the bass
+                below = (self._root.number - self._bass.number) % 12 or 12
+                bass = Note(self._root.number - below,
+                            quarter_length=self.quarter_length)
+                bass._set_parent(self)
+                self._notes.insert(0, bass)
+
+    @classmethod
+    def cached(cls, root='C4', name='major', quarter_length=1.0, bass=None):
+        """Returns a shared chord for the given root, name, quarter
+        length and bass, building it only on the first request. The
+        returned chord is shared by every caller, and read-only: changing
+        it raises NoteException, see NoteBase. Up to CACHED_CHORDS chords
+        are kept
+        """
+        root = cls.root_number(root)
+        if bass is not None:
+            bass = cls.root_number(bass) % 12
+        return _cached_chord(cls, root, name, float(quarter_length), bass)
+
+    def _share(self):
+        super(PopularChord, self)._share()
+        for note in (self._root, self._bass):
+            if note is not None:
+                note._share()
+
+    @property
+    def bass(self):
+        return self._bass
+
+    @bass.setter
+    def bass(self, bass):
+        self._validate_change()
+        if isinstance(bass, NoteBase):
+            bass = bass.value
+        if bass is not None and not isinstance(bass, Note):
+            bass = Note(bass)
+        self._bass = bass
+        self._update_notes()
 
     @property
     def root(self):
@@ -222,6 +390,9 @@ class PopularChord(Chord):
 
     @root.setter
     def root(self, root):
+        self._validate_change()
+        if isinstance(root, NoteBase):
+            root = root.value
         if not isinstance(root, Note):
             root = Note(root)
         self._root = root
@@ -233,7 +404,8 @@ class PopularChord(Chord):
 
     @name.setter
     def name(self, name):
-        if not self.contains(name, chord_data.CHORD_TYPES):
+        self._validate_change()
+        if not self.contains(name, templates('CHORD_TEMPLATES')):
             raise ChordException('Invalid chord name {}'.format(name))
         self._name = name
         self._update_notes()
@@ -241,25 +413,34 @@ class PopularChord(Chord):
 
 class RomanNumeral(Chord):
 
+    __slots__ = ('_root', '_numeral')
+
     def __init__(self, root='C4', numeral='I', quarter_length=1.0):
-        self._quarter_length = None
+        self._ticks = None
         self._root = None
         self._numeral = None
 
-        super(RomanNumeral, self).__init__()
-        self.quarter_length = quarter_length
+        super(RomanNumeral, self).__init__(chord_input=None,
+                                           quarter_length=quarter_length)
         self.root = root
         self.numeral = numeral
 
     def _update_notes(self):
         if self._root and self._numeral:
-            chord_props = chord_data.ROMAN_NUMERALS[self._numeral]
-            degrees = chord_props[0].split(',')
-            self._notes = []
-            notes = [int(n) + self.root.number for n in degrees]
-            for n in notes:
-                note = Note(n, quarter_length=self._quarter_length)
-                self._notes.append(note)
+            self._set_notes_from_degrees(self._root,
+                                         templates('ROMAN_NUMERAL_TEMPLATES')[self._numeral])
+
+    @classmethod
+    def cached(cls, root='C4', numeral='I', quarter_length=1.0):
+        """Returns a shared, read-only chord for the given root, numeral
+        and quarter length, see PopularChord.cached
+        """
+        root = cls.root_number(root)
+        return _cached_chord(cls, root, numeral, float(quarter_length))
+
+    def _share(self):
+        super(RomanNumeral, self)._share()
+        self._root._share()
 
     @property
     def root(self):
@@ -267,6 +448,9 @@ class RomanNumeral(Chord):
 
     @root.setter
     def root(self, root):
+        self._validate_change()
+        if isinstance(root, NoteBase):
+            root = root.value
         if not isinstance(root, Note):
             root = Note(root)
         self._root = root
@@ -278,7 +462,8 @@ class RomanNumeral(Chord):
 
     @numeral.setter
     def numeral(self, numeral):
-        if not self.contains(numeral, chord_data.ROMAN_NUMERALS):
+        self._validate_change()
+        if not self.contains(numeral, templates('ROMAN_NUMERAL_TEMPLATES')):
             raise ChordException('Invalid chord numeral {}'.format(numeral))
         self._numeral = numeral
         self._update_notes()
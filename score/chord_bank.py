@@ -0,0 +1,228 @@
+"""
+A collection of chords kept in order of consonance
+"""
+import bisect
+import heapq
+import itertools
+import json
+
+from score.base import ScoreObject, ChordException, pitch_class_mask
+from score.chord import Chord
+from score.consonance import ChordConsonance
+from score.key import Key
+
+
+class SortedEntries(ScoreObject):
+    """A sorted list kept as blocks of at most 2 * load items, with the
+    last item of every block. Inserting bisects the block ends, then
+    inserts into one block, so that it moves O(load) items instead of
+    O(n), and a full block is split in two
+    """
+    def __init__(self, load=256):
+        self._load = load
+        self._blocks = []
+        self._maxes = []
+        self._length = 0
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        for block in self._blocks:
+            for item in block:
+                yield item
+
+    def insert(self, item):
+        if not self._blocks:
+            self._blocks.append([item])
+            self._maxes.append(item)
+        else:
+            index = bisect.bisect_right(self._maxes, item)
+            if index == len(self._blocks):
+                index -= 1
+                self._blocks[index].append(item)
+                self._maxes[index] = item
+            else:
+                bisect.insort_right(self._blocks[index], item)
+            self._split(index)
+        self._length += 1
+
+    def append(self, item):
+        """Adds an item that is not less than any item already held"""
+        if not self._blocks:
+            self._blocks.append([])
+            self._maxes.append(item)
+        self._blocks[-1].append(item)
+        self._maxes[-1] = item
+        self._split(len(self._blocks) - 1)
+        self._length += 1
+
+    def _split(self, index):
+        block = self._blocks[index]
+        if len(block) > 2 * self._load:
+            half = block[self._load:]
+            del block[self._load:]
+            self._blocks.insert(index + 1, half)
+            self._maxes.insert(index, block[-1])
+
+    def irange(self, low):
+        """Items from the first one that is not less than low"""
+        index = bisect.bisect_left(self._maxes, low)
+        if index == len(self._blocks):
+            return
+        block = self._blocks[index]
+        for item in block[bisect.bisect_left(block, low):]:
+            yield item
+        for block in self._blocks[index + 1:]:
+            for item in block:
+                yield item
+
+
+class ChordBank(ScoreObject):
+    """Stores chords, as ascending tuples of note numbers, sorted by
+    consonance (most consonant first). The consonance, root and pitch
+    class mask of every chord are computed once on insertion.
+
+    Chords are also indexed by pitch class mask, so that the chords of a
+    key are found by looking up the subsets of the key's mask (at most
+    128 for a heptatonic key) instead of scanning the bank.
+
+    Example:
+    >>> bank = ChordBank()
+    >>> bank.add([60, 64, 67])
+    >>> bank.add(PopularChord('D', name='minor'))
+    >>> bank.best(1)
+    [(60, 64, 67)]
+    """
+    def __init__(self, chords=[]):
+        self._entries = SortedEntries()
+        self._masks = {}
+        self._numbers = set()
+
+        for chord in chords:
+            self.add(chord)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        for entry in self._entries:
+            yield entry[1]
+
+    def __contains__(self, chord):
+        return self.chord_numbers(chord) in self._numbers
+
+    def add(self, chord, root=None):
+        """Adds a Chord or a list of note numbers. The root defaults to
+        the root of a PopularChord or RomanNumeral, or the lowest note.
+        Chords already in the bank are ignored
+        """
+        numbers = self.chord_numbers(chord)
+        if not numbers:
+            raise ChordException('Cannot add an empty chord')
+        if numbers in self._numbers:
+            return
+        if root is None:
+            root = getattr(chord, 'root', None)
+            root = root.number if root is not None else numbers[0]
+        consonance = ChordConsonance.consonance_of_numbers(numbers)
+        self._insert((consonance, numbers, root, pitch_class_mask(numbers)))
+
+    def _insert(self, entry):
+        self._entries.insert(entry)
+        self._masks.setdefault(entry[3], SortedEntries()).insert(entry)
+        self._numbers.add(entry[1])
+
+    def best(self, k=1, key=None):
+        """The k most consonant chords, optionally only those whose
+        pitches all belong to the key
+        """
+        if key is None:
+            entries = self._entries
+        else:
+            entries = heapq.merge(*self._key_buckets(key))
+        return [entry[1] for entry in itertools.islice(entries, k)]
+
+    def in_range(self, low, high, key=None):
+        """Chords whose consonance lies between low and high inclusive,
+        most consonant first
+        """
+        if key is None:
+            # (low,) sorts before every entry of consonance low
+            entries = self._entries.irange((low,))
+        else:
+            entries = heapq.merge(*self._key_buckets(key))
+        chords = []
+        for entry in entries:
+            if entry[0] > high:
+                break
+            if entry[0] >= low:
+                chords.append(entry[1])
+        return chords
+
+    def in_key(self, key):
+        """Chords whose pitches all belong to the key, most consonant
+        first
+        """
+        return [entry[1] for entry in heapq.merge(*self._key_buckets(key))]
+
+    def consonance(self, chord):
+        numbers = self.chord_numbers(chord)
+        return ChordConsonance.consonance_of_numbers(numbers)
+
+    def root(self, chord):
+        numbers = self.chord_numbers(chord)
+        for entry in self._masks.get(pitch_class_mask(numbers), ()):
+            if entry[1] == numbers:
+                return entry[2]
+        raise ChordException('The chord {} is not in the bank'.format(chord))
+
+    def _key_buckets(self, key):
+        if not isinstance(key, Key):
+            key = Key(key)
+        key_mask = key.pitch_class_mask
+        buckets = []
+        # Walk every non empty subset of the key's mask
+        subset = key_mask
+        while subset:
+            bucket = self._masks.get(subset)
+            if bucket:
+                buckets.append(bucket)
+            subset = (subset - 1) & key_mask
+        return buckets
+
+    def save(self, filename):
+        with open(filename, 'w') as bank_file:
+            json.dump({'version': 1,
+                       'chords': [[list(entry[1]), entry[2], entry[0]]
+                                  for entry in self._entries]}, bank_file)
+
+    @classmethod
+    def load(cls, filename):
+        with open(filename) as bank_file:
+            data = json.load(bank_file)
+        if data.get('version') != 1:
+            raise ChordException('Unsupported chord bank version {}'
+                                 ''.format(data.get('version')))
+        bank = cls()
+        for numbers, root, consonance in data['chords']:
+            numbers = tuple(numbers)
+            entry = (consonance, numbers, root, pitch_class_mask(numbers))
+            bank._entries.append(entry)
+            bank._masks.setdefault(entry[3], SortedEntries()).append(entry)
+            bank._numbers.add(numbers)
+        return bank
+
+    @staticmethod
+    def chord_numbers(chord):
+        if isinstance(chord, Chord):
+            chord = chord.note_numbers
+        return tuple(sorted(chord))
+
+
+def main():
+    pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""
+Parsing of lead sheet chord symbols such as 'F#m7b5/E'. Symbols are
+read as a root, a chord type alias from chord_data.CHORD_TYPES and an
+optional slash bass note
+"""
+import functools
+
+from score.base import ChordException
+
+_alias_trie = None
+
+
+class AliasTrie(object):
+    """Prefix tree of chord type aliases, compiled once from the alias
+    lists of chord_data.CHORD_TYPES
+    """
+    def __init__(self, aliases):
+        self._root = {}
+        for alias, name in aliases:
+            self.insert(alias, name)
+
+    def insert(self, alias, name):
+        node = self._root
+        for char in alias:
+            node = node.setdefault(char, {})
+        # The first chord type to claim an alias keeps it
+        node.setdefault(None, name)
+
+    def matches(self, text, start=0):
+        """Returns (end, name) for every alias that text[start:end] is
+        equal to, shortest first
+        """
+        found = []
+        node = self._root
+        index = start
+        while node is not None:
+            if None in node:
+                found.append((index, node[None]))
+            if index == len(text):
+                break
+            node = node.get(text[index])
+            index += 1
+        return found
+
+
+def _chord_aliases():
+    from score.config import chord_data
+    for name, props in chord_data.CHORD_TYPES.items():
+        for alias in props[1]:
+            yield alias, name
+
+
+def alias_trie():
+    """ALIAS_TRIE, the trie of every chord type alias. chord_data is
+    imported and the trie is built on first use
+    """
+    global _alias_trie
+    if _alias_trie is None:
+        _alias_trie = AliasTrie(_chord_aliases())
+    return _alias_trie
+
+
+def __getattr__(name):
+    if name == 'ALIAS_TRIE':
+        return alias_trie()
+    raise AttributeError('module {} has no attribute {}'.format(__name__, name))
+
+
+_ACCIDENTALS = {'#': '#', 'b': '-', '-': '-'}
+
+# Parsed symbols kept by parse_symbol, the least recently used ones are
+# dropped first
+PARSED_SYMBOLS = 4096
+
+
+def _parse_note_name(text, index):
+    if index >= len(text) or text[index] not in 'ABCDEFG':
+        return None, index
+    name = text[index]
+    index += 1
+    if index < len(text) and text[index] in _ACCIDENTALS:
+        name += _ACCIDENTALS[text[index]]
+        index += 1
+    return name, index
+
+
+@functools.lru_cache(maxsize=PARSED_SYMBOLS)
+def _parse_symbol(symbol):
+    root, index = _parse_note_name(symbol, 0)
+    if root is None:
+        raise ChordException('Invalid chord symbol {}'.format(symbol))
+    # Longest alias first. An alias is accepted only when what follows
+    # it is either nothing or a slash bass note
+    for end, name in reversed(alias_trie().matches(symbol, index)):
+        if end == len(symbol):
+            return root, name, None
+        if symbol[end] == '/':
+            bass, bass_end = _parse_note_name(symbol, end + 1)
+            if bass is not None and bass_end == len(symbol):
+                return root, name, bass
+    raise ChordException('Invalid chord symbol {}'.format(symbol))
+
+
+def parse_symbol(symbol):
+    """Returns (root, chord type, bass) for a chord symbol. The root and
+    bass are note names without an octave, spelled with '-' for flats,
+    and the bass is None when the symbol has no slash bass note
+
+    Example:
+    >>> parse_symbol('F#m7b5/E')
+    ('F#', 'half-diminished-seventh', 'E')
+    >>> parse_symbol('Bb')
+    ('B-', 'major', None)
+    """
+    if not isinstance(symbol, str):
+        raise ChordException('Invalid chord symbol {}'.format(symbol))
+    return _parse_symbol(symbol)
+
+
+def parse_progression(text):
+    """Parses whitespace separated chord symbols. Bar lines ('|') are
+    ignored. Returns a list of (root, chord type, bass) tuples, see
+    parse_symbol and Chord.from_symbol
+    """
+    return [parse_symbol(symbol)
+            for symbol in text.replace('|', ' ').split()]
+
+
+def main():
+    pass
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,4 @@
 import itertools
-import logging
 
 DEBUG = True
 
@@ -15,12 +14,21 @@ MAX_VEL_NUM = 127
 AVE_ATTACK_VEL = 75
 AVE_RELEASE_VEL = 64
 
+# Resolution of note durations: 2^6 * 3^2 * 5 * 7 * 11 * 13 ticks per
+# quarter note, so that durations down to a 256th note and tuplets of up
+# to 16 notes are whole numbers of ticks
+TICKS_PER_QUARTER = 2882880
+
 MIN_TEMPO_NUM = 0
 MAX_TEMPO_NUM = 1000
 
 MIN_OCTAVE = 0
 MAX_OCTAVE = 10
 
+# (bottom, top) note numbers of the treble and bass registers
+TREBLE_RANGE = (60, 84)
+BASS_RANGE = (36, 60)
+
 KEY_NAMES = [  # all major and minor keys
     'A',  'B',  'C',  'D',  'E',  'F',  'G',
     'a',  'b',  'c',  'd',  'e',  'f',  'g',
@@ -100,13 +108,21 @@ LOGGING_CONFIG = dict(
         'stream': {
             'class': 'logging.StreamHandler',
             'formatter': 'fmt',
-            'level': logging.DEBUG
+            'level': 'DEBUG'
         },
     },
     loggers = {
         '': {
             'handlers': ['stream'],
-            'level': logging.DEBUG if DEBUG else logging.WARNING
+            'level': 'DEBUG' if DEBUG else 'WARNING'
         }
     }
 )
+
+
+def configure_logging(logging_config=LOGGING_CONFIG):
+    """Applies LOGGING_CONFIG, the logging set up score used to apply on
+    import. Importing score configures no logging
+    """
+    import logging.config
+    logging.config.dictConfig(logging_config)
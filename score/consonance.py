@@ -1,7 +1,6 @@
 """
 Chord consonance based on frequency ratio
 """
-from fractions import Fraction
 from itertools import combinations
 
 from score.base import ScoreObject
@@ -13,16 +12,19 @@ TODO: Experiment with consonance. Consider always setting a tonic, and
       http://ray.tomes.biz/alex.htm
 """
 
+# (numerator, denominator) of the frequency ratio of each interval
+RATIO_TERMS = [(1, 1), (15, 16), (8, 9), (5, 6), (4, 5), (3, 4),
+               (5, 7), (2, 3), (5, 8), (3, 5), (9, 16), (8, 15)]
+
+
 class FrequencyRatios(ScoreObject):
     """
     Frequency ratios of the 12 notes that fall
     whithin an octave in an equal temparament scale
     """
     def __init__(self):
-        self._ratios = [Fraction(1, 1), Fraction(15, 16), Fraction(8, 9),
-                        Fraction(5, 6), Fraction(4, 5), Fraction(3, 4),
-                        Fraction(5, 7), Fraction(2, 3), Fraction(5, 8),
-                        Fraction(3, 5), Fraction(9, 16), Fraction(8, 15)]
+        from fractions import Fraction
+        self._ratios = [Fraction(n, d) for n, d in RATIO_TERMS]
         self._errors = [0, 10, 4, 16, 14, 2, 17, 2, 14, 16, 2, 12]
 
     @property
@@ -34,6 +36,20 @@ class FrequencyRatios(ScoreObject):
         return self._errors
 
 
+def _interval_consonance():
+    return [numerator * denominator for numerator, denominator in RATIO_TERMS]
+
+
+# Consonance of each interval, in semitones, within an octave. The smaller
+# the product of the frequency ratio terms, the higher the consonance
+INTERVAL_CONSONANCE = _interval_consonance()
+
+# Consonance between every pair of distinct pitch classes. The diagonal is
+# 0 so that repeated pitch classes add nothing to a chord
+CONSONANCE_TABLE = [[INTERVAL_CONSONANCE[abs(i - j)] if i != j else 0
+                     for j in range(0, 12)] for i in range(0, 12)]
+
+
 class Consonance(FrequencyRatios):
     """Main purpose is to return a measure of the consonance
     between the tonic and another note.
@@ -45,11 +61,11 @@ class Consonance(FrequencyRatios):
     >>> print (csn.get_consonance(nte))
     20
     """
-    def __init__(self, tonic=Note('C')):
+    def __init__(self, tonic=None):
         super(Consonance, self).__init__()
         self._tonic = None
         self._chromatic_scale = None
-        self.tonic = tonic
+        self.tonic = tonic if tonic is not None else Note('C')
 
     def get_consonance(self, nte):
         """Returns a measure of the consonance between the
@@ -58,15 +74,8 @@ class Consonance(FrequencyRatios):
         The smaller the product, the higher the consonance
         """
         self.validate_type(nte, Note)
-        note_number = Note.get_base_note_number(nte.name)
-        note_index = self._chromatic_scale.index(note_number)
-        ratio = self.ratios[note_index]
-        if ratio == float('inf'):
-            return ratio
-        else:
-            consonance = ratio.numerator * ratio.denominator
-            consonance = consonance # + consonance*self.errors[note_index] # Perfornamce is better without adding the errors
-            return consonance
+        note_index = (nte.number - self._tonic.number) % 12
+        return INTERVAL_CONSONANCE[note_index]
 
     @property
     def tonic(self):
@@ -76,12 +85,8 @@ class Consonance(FrequencyRatios):
     def tonic(self, tonic):
         self.validate_type(tonic, Note)
         self._tonic = tonic
-        self._chromatic_scale = []
-        for num in range(0, 12):
-            #note_name = self.strip_digits(Note(tonic.number + num).name)
-            nte = Note(tonic.number + num)
-            note_number = Note.get_base_note_number(nte.name)
-            self._chromatic_scale.append(note_number)
+        self._chromatic_scale = [(tonic.number + num) % 12
+                                 for num in range(0, 12)]
 
     @property
     def chromatic_scale(self):
@@ -105,20 +110,39 @@ class ChordConsonance(ScoreObject):
         self.notes = notes
 
     def _set_consonance(self):
-        note_list = []
-        for nte in self._notes:
-                number = Note.get_base_note_number(nte.name)
-                if number not in note_list:
-                    note_list.append(number)
+        numbers = [nte.number for nte in self._notes]
+        self._consonance = self.consonance_of_numbers(numbers)
 
+    @staticmethod
+    def consonance_of_numbers(numbers):
+        """Consonance of a chord given as a list of note numbers"""
+        pitch_classes = set(number % 12 for number in numbers)
         total_consonance = 0
-        for note_pair in combinations(note_list, 2):
-            #smaller note should always be tonic
-            tonic = Note(min(note_pair))
-            nte = Note(max(note_pair))
-            consonance = Consonance(tonic=tonic)
-            total_consonance += consonance.get_consonance(nte)
-        self._consonance = total_consonance
+        for tonic, nte in combinations(pitch_classes, 2):
+            total_consonance += CONSONANCE_TABLE[tonic][nte]
+        return total_consonance
+
+    @staticmethod
+    def batch_consonance(chords):
+        """Consonance of many chords at once. chords is an (N, k) array
+        like of note numbers, one chord per row. Negative numbers are
+        ignored, so chords with fewer than k notes can be padded with -1.
+        Returns an (N,) numpy array equal to the consonance of each row
+
+        Example:
+        >>> ChordConsonance.batch_consonance([[60, 64, 67], [60, 61, -1]])
+        array([ 56, 240])
+        """
+        import numpy as np
+
+        chords = np.asarray(chords, dtype=np.int64)
+        if chords.ndim != 2:
+            raise ValueError('Expected a two dimensional array of note numbers')
+        rows, cols = np.nonzero(chords >= 0)
+        masks = np.zeros((chords.shape[0], 12), dtype=np.int64)
+        masks[rows, chords[rows, cols] % 12] = 1
+        table = np.array(CONSONANCE_TABLE, dtype=np.int64)
+        return ((masks @ table) * masks).sum(axis=1) // 2
 
     @property
     def consonance(self):
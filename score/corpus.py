@@ -0,0 +1,303 @@
+"""
+On disk corpus of scores. A corpus is a directory holding:
+
+    corpus.json    format version and the number of scores, clefs and events
+    pitch.u1       note number of every event, uint8
+    duration.f8    quarter length of every event, float64
+    velocity.u1    attack velocity of every event, uint8
+    onset.f8       onset of every event in quarter lengths from the start
+                   of its clef, float64
+    clefs.index    score, staff, clef, start and stop event of every clef
+    scores.index   first and last clef, and native data range, of every score
+    scores.native  the scores in the native format, see score.native
+
+An event is a note, or a note of a chord. Every file is memory mapped, so
+statistics over the event arrays read the files without building any
+score, and Corpus.score builds its score lazily from the mapped native
+data
+
+Example:
+>>> with CorpusWriter('pieces') as writer:
+...     writer.add(score)
+>>> corpus = Corpus('pieces')
+>>> numpy.bincount(corpus.pitch, minlength=128)
+"""
+import json
+import os
+
+from score.base import ScoreObject, CorpusException
+from score.score import Score
+
+CORPUS_VERSION = 1
+MANIFEST = 'corpus.json'
+
+# Event arrays, their files and dtypes
+EVENT_COLUMNS = (('pitch', 'pitch.u1', '<u1'),
+                 ('duration', 'duration.f8', '<f8'),
+                 ('velocity', 'velocity.u1', '<u1'),
+                 ('onset', 'onset.f8', '<f8'))
+CLEF_INDEX = 'clefs.index'
+CLEF_FIELDS = [('score', '<u4'), ('staff', '<u2'), ('clef', '<u2'),
+               ('start', '<u8'), ('stop', '<u8')]
+SCORE_INDEX = 'scores.index'
+SCORE_FIELDS = [('clef_start', '<u8'), ('clef_stop', '<u8'),
+                ('offset', '<u8'), ('length', '<u8')]
+NATIVE_DATA = 'scores.native'
+
+
+def clef_events(clef):
+    """Pitches, durations, velocities and onsets of the events of a clef,
+    as lists. Rests only advance the onset, messages take no time
+    """
+    from score.chord import Chord
+    from score.note import Message, Note, TICKS_PER_QUARTER
+
+    pitches = []
+    durations = []
+    velocities = []
+    onsets = []
+    # Onsets are summed in ticks, so that they do not drift
+    onset = 0
+    node = clef.head
+    while node is not None:
+        value = node.value
+        quarter_length = node.quarter_length
+        if isinstance(value, Chord):
+            # The notes of a placed chord resolve through the placement
+            for note in node.notes:
+                pitches.append(note.number)
+                durations.append(quarter_length)
+                velocities.append(note.attack_velocity)
+                onsets.append(onset / TICKS_PER_QUARTER)
+        elif isinstance(value, Note):
+            pitches.append(value.number)
+            durations.append(quarter_length)
+            velocities.append(node.attack_velocity)
+            onsets.append(onset / TICKS_PER_QUARTER)
+        if not isinstance(value, Message):
+            onset += node.ticks
+        node = node.next
+    return pitches, durations, velocities, onsets
+
+
+class CorpusWriter(ScoreObject):
+    """Adds scores to the corpus in directory path, creating it if
+    needed. Files are appended to as scores are added, and the manifest
+    is written on close. Data after what the manifest records, left by a
+    writer that was not closed, is dropped on open
+    """
+
+    def __init__(self, path):
+        self._path = path
+        self._files = None
+        self._counts = None
+        self._open()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _open(self):
+        if not os.path.isdir(self._path):
+            os.makedirs(self._path)
+        manifest = os.path.join(self._path, MANIFEST)
+        if os.path.exists(manifest):
+            self._counts = _read_manifest(self._path)
+        else:
+            self._counts = {'scores': 0, 'clefs': 0, 'events': 0, 'native': 0}
+        self._files = {}
+        for filename, size in _file_sizes(self._counts).items():
+            data_file = open(os.path.join(self._path, filename), 'ab')
+            self._files[filename] = data_file
+            if data_file.tell() < size:
+                self.close(write_manifest=False)
+                raise CorpusException('{} is shorter than its manifest '
+                                      'records'.format(filename))
+        # Drop what a writer that was never closed left after the data
+        # the manifest records
+        self._truncate()
+
+    def _truncate(self):
+        for filename, size in _file_sizes(self._counts).items():
+            self._files[filename].truncate(size)
+
+    def add(self, score):
+        """Appends a score, returns its index in the corpus"""
+        self.validate_type(score, Score)
+        if self._files is None:
+            raise CorpusException('The corpus writer is closed')
+        counts = dict(self._counts)
+        try:
+            return self._add(score)
+        except BaseException:
+            # Forget the part of the score written so far
+            self._counts = counts
+            self._truncate()
+            raise
+
+    def _add(self, score):
+        import numpy as np
+
+        index = self._counts['scores']
+        clef_start = self._counts['clefs']
+        clefs = []
+        for staff_index, staff in enumerate(score.staves):
+            for clef_index, clef in enumerate(staff.clefs):
+                events = clef_events(clef)
+                start = self._counts['events']
+                stop = start + len(events[0])
+                for (_, filename, dtype), values in zip(EVENT_COLUMNS, events):
+                    self._files[filename].write(np.asarray(values, dtype=dtype).tobytes())
+                clefs.append((index, staff_index, clef_index, start, stop))
+                self._counts['events'] = stop
+        self._files[CLEF_INDEX].write(np.array(clefs, dtype=CLEF_FIELDS).tobytes())
+        self._counts['clefs'] += len(clefs)
+        data = score.dumps()
+        record = (clef_start, self._counts['clefs'], self._counts['native'], len(data))
+        self._files[NATIVE_DATA].write(data)
+        self._files[SCORE_INDEX].write(np.array([record], dtype=SCORE_FIELDS).tobytes())
+        self._counts['native'] += len(data)
+        self._counts['scores'] += 1
+        return index
+
+    def close(self, write_manifest=True):
+        if self._files is None:
+            return
+        for native_file in self._files.values():
+            native_file.close()
+        self._files = None
+        if not write_manifest:
+            return
+        manifest = dict(self._counts, version=CORPUS_VERSION)
+        with open(os.path.join(self._path, MANIFEST), 'w') as manifest_file:
+            json.dump(manifest, manifest_file)
+
+
+class Corpus(ScoreObject):
+    """A corpus written by CorpusWriter, memory mapped"""
+
+    def __init__(self, path):
+        self._path = path
+        self._counts = _read_manifest(path)
+        self._arrays = {}
+
+    def __len__(self):
+        return self._counts['scores']
+
+    def _array(self, filename, dtype, count):
+        import numpy as np
+
+        array = self._arrays.get(filename)
+        if array is None:
+            if count:
+                array = np.memmap(os.path.join(self._path, filename),
+                                  dtype=dtype, mode='r', shape=(count,))
+            else:
+                array = np.zeros(0, dtype=dtype)
+            self._arrays[filename] = array
+        return array
+
+    def _event_array(self, name):
+        for column, filename, dtype in EVENT_COLUMNS:
+            if column == name:
+                return self._array(filename, dtype, self._counts['events'])
+
+    def _score_record(self, index):
+        if not 0 <= index < len(self):
+            raise IndexError('Score index {} out of range'.format(index))
+        return self.scores[index]
+
+    def score(self, index):
+        """The score at index, built lazily from the mapped native data"""
+        record = self._score_record(index)
+        start = int(record['offset'])
+        return Score.loads(self.native[start:start + int(record['length'])])
+
+    def events(self, index, staff=None, clef=None):
+        """The pitch, duration, velocity and onset arrays of the events of
+        a score, as a dict. Events of one staff or clef only if given.
+        The arrays are views of the corpus files, except for a clef
+        index without a staff, which selects clefs of several staves
+        """
+        record = self._score_record(index)
+        clefs = self.clefs[int(record['clef_start']):int(record['clef_stop'])]
+        if staff is not None:
+            clefs = clefs[clefs['staff'] == staff]
+        if clef is not None:
+            clefs = clefs[clefs['clef'] == clef]
+        if clef is not None and staff is None and len(clefs) > 1:
+            # The clefs of different staves are not adjacent
+            import numpy as np
+            return dict((name, np.concatenate([self._event_array(name)[c['start']:c['stop']]
+                                               for c in clefs]))
+                        for name, _, _ in EVENT_COLUMNS)
+        start = int(clefs['start'].min()) if len(clefs) else 0
+        stop = int(clefs['stop'].max()) if len(clefs) else 0
+        return dict((name, self._event_array(name)[start:stop])
+                    for name, _, _ in EVENT_COLUMNS)
+
+    @property
+    def pitch(self):
+        return self._event_array('pitch')
+
+    @property
+    def duration(self):
+        return self._event_array('duration')
+
+    @property
+    def velocity(self):
+        return self._event_array('velocity')
+
+    @property
+    def onset(self):
+        return self._event_array('onset')
+
+    @property
+    def clefs(self):
+        """Record array of the clefs of the corpus: score, staff, clef,
+        start and stop event
+        """
+        return self._array(CLEF_INDEX, CLEF_FIELDS, self._counts['clefs'])
+
+    @property
+    def scores(self):
+        return self._array(SCORE_INDEX, SCORE_FIELDS, self._counts['scores'])
+
+    @property
+    def native(self):
+        """The native data of every score, see scores for their ranges"""
+        return self._array(NATIVE_DATA, '<u1', self._counts['native'])
+
+
+def _file_sizes(counts):
+    """Size in bytes of every file of a corpus with the given counts"""
+    import numpy as np
+
+    sizes = dict((filename, counts['events'] * np.dtype(dtype).itemsize)
+                 for _, filename, dtype in EVENT_COLUMNS)
+    sizes[CLEF_INDEX] = counts['clefs'] * np.dtype(CLEF_FIELDS).itemsize
+    sizes[SCORE_INDEX] = counts['scores'] * np.dtype(SCORE_FIELDS).itemsize
+    sizes[NATIVE_DATA] = counts['native']
+    return sizes
+
+
+def _read_manifest(path):
+    try:
+        with open(os.path.join(path, MANIFEST)) as manifest_file:
+            manifest = json.load(manifest_file)
+    except (IOError, OSError, ValueError):
+        raise CorpusException('{} is not a corpus'.format(path))
+    if manifest.get('version', 0) > CORPUS_VERSION:
+        raise CorpusException('Unsupported corpus version {}. Expected at '
+                              'most {}'.format(manifest['version'], CORPUS_VERSION))
+    return manifest
+
+
+def main():
+    pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,329 @@
+"""
+SQLite index of the metadata and features of the scores of one or more
+corpora (see score.corpus), so that scores can be found without loading
+them. For every score the index holds:
+
+    title, music_by, lyrics_by, genre, tempo and time signature
+    the instrument of every staff
+    key, found by KeyFinder from the corpus events
+    length, the quarter length until the last note ends
+    note count and pitch range, from the corpus events
+
+Updates are incremental. Corpora are only appended to (see
+score.corpus.CorpusWriter), so an update checks that the last score it
+indexed is unchanged, and indexes the scores added after it. A corpus
+rewritten since, whose last indexed score changed, is compared score by
+score. Extraction runs in worker processes, each
+reading the memory mapped corpus; a score's metadata comes from its
+header only and its notes are never built
+
+Example:
+>>> index = CorpusIndex('pieces.sqlite')
+>>> index.update('pieces')
+>>> for handle in index.find(time_signature='3/4', min_tempo=140,
+...                          family='string'):
+...     print(handle.title, handle.score.staves)
+"""
+import os
+import sqlite3
+import zlib
+
+from score.base import ScoreObject, CorpusException
+
+# Layout of the index, in the database's user_version. An index of
+# another layout is rebuilt
+INDEX_VERSION = 2
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    corpus TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    checksum INTEGER NOT NULL,
+    title TEXT,
+    music_by TEXT,
+    lyrics_by TEXT,
+    genre TEXT,
+    tempo INTEGER,
+    time_signature TEXT,
+    key TEXT,
+    length REAL,
+    note_count INTEGER,
+    lowest INTEGER,
+    highest INTEGER,
+    UNIQUE (corpus, position)
+);
+CREATE TABLE IF NOT EXISTS instruments (
+    score_id INTEGER NOT NULL REFERENCES scores (id) ON DELETE CASCADE,
+    staff INTEGER NOT NULL,
+    number INTEGER NOT NULL,
+    name TEXT,
+    is_percussion INTEGER NOT NULL,
+    is_keyboard INTEGER NOT NULL,
+    is_string INTEGER NOT NULL,
+    is_bass INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_time_signature ON scores (time_signature);
+CREATE INDEX IF NOT EXISTS scores_tempo ON scores (tempo);
+CREATE INDEX IF NOT EXISTS scores_key ON scores (key);
+CREATE INDEX IF NOT EXISTS instruments_score ON instruments (score_id);
+"""
+
+# Score columns filled by extraction, in row order
+SCORE_COLUMNS = ('position', 'offset', 'size', 'checksum', 'title',
+                 'music_by', 'lyrics_by', 'genre', 'tempo', 'time_signature',
+                 'key', 'length', 'note_count', 'lowest', 'highest')
+INSTRUMENT_COLUMNS = ('staff', 'number', 'name', 'is_percussion',
+                      'is_keyboard', 'is_string', 'is_bass')
+FAMILIES = ('keyboard', 'string', 'bass', 'percussion')
+
+# Scores extracted per worker task
+CHUNK_SIZE = 64
+
+
+def fingerprint(corpus, position):
+    """(offset, size, checksum) of the native data of a score of a
+    Corpus. A score is re-indexed when any of them changes
+    """
+    record = corpus.scores[position]
+    start = int(record['offset'])
+    stop = start + int(record['length'])
+    return start, stop - start, zlib.crc32(corpus.native[start:stop])
+
+
+def extract(path, positions):
+    """Index rows of the scores at positions of the corpus at path: a
+    list of (score row, instrument rows), with the columns of
+    SCORE_COLUMNS and INSTRUMENT_COLUMNS. Runs in worker processes
+    """
+    import numpy as np
+    from score.corpus import Corpus
+    from score.key_finder import KeyFinder
+
+    corpus = Corpus(path)
+    histograms = np.zeros((len(positions), 12))
+    rows = []
+    for i, position in enumerate(positions):
+        events = corpus.events(position)
+        pitches = events['pitch']
+        durations = events['duration']
+        histograms[i] = np.bincount(pitches % 12, weights=durations,
+                                    minlength=12)
+        if len(pitches):
+            length = float((events['onset'] + durations).max())
+            lowest, highest = int(pitches.min()), int(pitches.max())
+        else:
+            length, lowest, highest = 0.0, None, None
+        score = corpus.score(position)
+        instruments = []
+        for staff_index, staff in enumerate(score.staves):
+            instrument = staff.instrument
+            instruments.append((staff_index, instrument.number, instrument.name,
+                                int(instrument.is_percussion),
+                                int(instrument.is_keyboard),
+                                int(instrument.is_string),
+                                int(instrument.is_bass)))
+        offset, size, checksum = fingerprint(corpus, position)
+        rows.append([position, offset, size, checksum, score.title, score.music_by,
+                     score.lyrics_by, score.genre, score.tempo,
+                     str(score.time_signature), None, length, len(pitches),
+                     lowest, highest, instruments])
+    keys = KeyFinder().find_histograms(histograms)
+    result = []
+    for row, key in zip(rows, keys):
+        row[SCORE_COLUMNS.index('key')] = None if key is None else str(key)
+        result.append((tuple(row[:-1]), row[-1]))
+    return result
+
+
+def _extract_chunk(task):
+    return extract(*task)
+
+
+class ScoreHandle(ScoreObject):
+    """An indexed score. The metadata is read from the index, the score
+    is loaded from its corpus on first access to score
+    """
+
+    def __init__(self, row):
+        self._row = row
+        self._score = None
+
+    def __repr__(self):
+        return 'ScoreHandle: {} - {}[{}]'.format(self.title, self.corpus,
+                                                 self.position)
+
+    def __getattr__(self, name):
+        row = self.__dict__.get('_row')
+        if row is not None and name in row.keys():
+            return row[name]
+        raise AttributeError(name)
+
+    @property
+    def score(self):
+        if self._score is None:
+            from score.corpus import Corpus
+            self._score = Corpus(self._row['corpus']).score(self._row['position'])
+        return self._score
+
+
+class CorpusIndex(ScoreObject):
+    """The index in the SQLite database at path, created if needed"""
+
+    def __init__(self, path):
+        self._path = path
+        self._connection = sqlite3.connect(path)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute('PRAGMA foreign_keys = ON')
+        version = self._connection.execute('PRAGMA user_version').fetchone()[0]
+        if version > INDEX_VERSION:
+            self._connection.close()
+            raise CorpusException('Unsupported corpus index version {}. Expected '
+                                  'at most {}'.format(version, INDEX_VERSION))
+        if version < INDEX_VERSION:
+            # Indexed again by the next update
+            self._connection.executescript('DROP TABLE IF EXISTS instruments; '
+                                           'DROP TABLE IF EXISTS scores;')
+            self._connection.execute('PRAGMA user_version = {}'.format(INDEX_VERSION))
+        self._connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self._connection.execute('SELECT COUNT(*) FROM scores').fetchone()[0]
+
+    def close(self):
+        self._connection.close()
+
+    def update(self, path, processes=None):
+        """Indexes the new and changed scores of the corpus at path, and
+        drops scores no longer in it. Takes time proportional to the number
+        of new scores, unless the corpus was rewritten, see the module
+        documentation. Extraction is split over processes worker
+        processes, os.cpu_count() by default; 1 extracts in this process.
+        Returns the number of scores (re)indexed
+        """
+        from score.corpus import Corpus
+
+        path = os.path.abspath(path)
+        corpus = Corpus(path)
+        count, last = self._connection.execute(
+            'SELECT COUNT(*), MAX(position) FROM scores WHERE corpus = ?',
+            (path,)).fetchone()
+        if count and count == last + 1 and last < len(corpus) and \
+                self._fingerprint(path, last) == fingerprint(corpus, last):
+            positions = list(range(count, len(corpus)))
+        else:
+            indexed = dict((row['position'], tuple(row)[1:])
+                           for row in self._connection.execute(
+                               'SELECT position, offset, size, checksum FROM scores '
+                               'WHERE corpus = ?', (path,)))
+            positions = [position for position in range(0, len(corpus))
+                         if indexed.get(position) != fingerprint(corpus, position)]
+        tasks = [(path, positions[i:i + CHUNK_SIZE])
+                 for i in range(0, len(positions), CHUNK_SIZE)]
+        processes = processes or os.cpu_count() or 1
+        with self._connection:
+            self._connection.execute('DELETE FROM scores WHERE corpus = ? '
+                                     'AND position >= ?', (path, len(corpus)))
+            if processes > 1 and len(tasks) > 1:
+                import multiprocessing
+                with multiprocessing.Pool(min(processes, len(tasks))) as pool:
+                    for rows in pool.imap_unordered(_extract_chunk, tasks):
+                        self._insert(path, rows)
+            else:
+                for task in tasks:
+                    self._insert(path, _extract_chunk(task))
+        return len(positions)
+
+    def _fingerprint(self, path, position):
+        # The fingerprint of an indexed score, see fingerprint
+        row = self._connection.execute(
+            'SELECT offset, size, checksum FROM scores WHERE corpus = ? AND '
+            'position = ?', (path, position)).fetchone()
+        return tuple(row)
+
+    def _insert(self, path, rows):
+        connection = self._connection
+        for score_row, instrument_rows in rows:
+            connection.execute('DELETE FROM scores WHERE corpus = ? AND position = ?',
+                               (path, score_row[0]))
+            cursor = connection.execute(
+                'INSERT INTO scores (corpus, {}) VALUES (?{})'.format(
+                    ', '.join(SCORE_COLUMNS), ', ?' * len(SCORE_COLUMNS)),
+                (path,) + score_row)
+            connection.executemany(
+                'INSERT INTO instruments (score_id, {}) VALUES (?{})'.format(
+                    ', '.join(INSTRUMENT_COLUMNS), ', ?' * len(INSTRUMENT_COLUMNS)),
+                [(cursor.lastrowid,) + row for row in instrument_rows])
+
+    def query(self, where='1', parameters=()):
+        """Handles of the scores matching an SQL condition on the scores
+        table, e.g. query('tempo > ? AND key = ?', (140, 'C minor')).
+        The condition is run as SQL as it is, and must come from trusted
+        code: values, user input in particular, go in parameters. find
+        builds its conditions this way
+        """
+        rows = self._connection.execute(
+            'SELECT * FROM scores WHERE {} ORDER BY corpus, position'.format(where),
+            parameters)
+        return [ScoreHandle(row) for row in rows]
+
+    def find(self, title=None, music_by=None, lyrics_by=None, genre=None,
+             time_signature=None, key=None, min_tempo=None, max_tempo=None,
+             min_length=None, max_length=None, lowest=None, highest=None,
+             instrument=None, family=None):
+        """Handles of the scores matching every given criterion. Tempo and
+        length bounds are inclusive. lowest and highest bound the pitch
+        range. instrument is an instrument name or number, and family one
+        of FAMILIES, played by any staff
+        """
+        conditions = []
+        parameters = []
+        for column, value in [('title', title), ('music_by', music_by),
+                              ('lyrics_by', lyrics_by), ('genre', genre),
+                              ('time_signature', time_signature), ('key', key)]:
+            if value is not None:
+                conditions.append('{} = ?'.format(column))
+                parameters.append(str(value))
+        for condition, value in [('tempo >= ?', min_tempo), ('tempo <= ?', max_tempo),
+                                 ('length >= ?', min_length), ('length <= ?', max_length),
+                                 ('lowest >= ?', lowest), ('highest <= ?', highest)]:
+            if value is not None:
+                conditions.append(condition)
+                parameters.append(value)
+        instrument_conditions = []
+        if instrument is not None:
+            column = 'number' if isinstance(instrument, int) else 'name'
+            instrument_conditions.append('{} = ?'.format(column))
+            parameters.append(instrument)
+        if family is not None:
+            if not self.contains(family, FAMILIES):
+                raise CorpusException('Invalid instrument family {}. Expected one '
+                                      'of {}'.format(family, ', '.join(FAMILIES)))
+            instrument_conditions.append('is_{} = 1'.format(family))
+        if instrument_conditions:
+            conditions.append('id IN (SELECT score_id FROM instruments WHERE {})'
+                              ''.format(' AND '.join(instrument_conditions)))
+        return self.query(' AND '.join(conditions) or '1', tuple(parameters))
+
+    def instruments(self, handle):
+        """(staff, number, name) of the instrument of every staff of an
+        indexed score
+        """
+        return [tuple(row) for row in self._connection.execute(
+            'SELECT staff, number, name FROM instruments WHERE score_id = ? '
+            'ORDER BY staff', (handle.id,))]
+
+
+def main():
+    pass
+
+
+if __name__ == '__main__':
+    main()
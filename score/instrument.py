@@ -1,13 +1,47 @@
-from score.base import ScoreObject
-from score.config import instrument_data
+from score.base import ScoreObject, InstrumentException
+
+DEFAULT_INSTRUMENT = 'Acoustic Grand Piano'
+
+_instrument_tables = None
+
+
+def _names_by_number(instruments):
+    names = {}
+    for name in instruments:
+        names.setdefault(instruments[name][0], name)
+    return names
+
+
+def instrument_tables():
+    """(INSTRUMENTS, PERCUSSION, instrument names by number, percussion
+    names by number). instrument_data is imported and the reverse
+    indexes are built on first use
+    """
+    global _instrument_tables
+    if _instrument_tables is None:
+        from score.config import instrument_data
+        _instrument_tables = (
+            instrument_data.INSTRUMENTS, instrument_data.PERCUSSION,
+            _names_by_number(instrument_data.INSTRUMENTS),
+            _names_by_number(instrument_data.PERCUSSION))
+    return _instrument_tables
 
 
 class Instrument(ScoreObject):
+    """A midi instrument. Instrument(name) is a new instrument that can be
+    changed with set_number or name. Instrument.shared and
+    Instrument.from_number return one shared instance per
+    (number, is_percussion), which cannot be changed: assign another
+    shared instrument instead. Music objects use shared instruments
+    """
+
+    _shared = {}
 
-    def __init__(self, name='Acoustic Grand Piano'):
+    def __init__(self, name=DEFAULT_INSTRUMENT):
         self._name = str()
         self._number = int()
         self._is_percussion = False
+        self._is_shared = False
         self.name = name
 
     def __str__(self):
@@ -16,25 +50,51 @@ class Instrument(ScoreObject):
     def __repr__(self):
         return self.name
 
+    @classmethod
+    def from_number(cls, num, is_percussion=False):
+        """The shared instrument with the given number"""
+        instrument = cls._shared.get((num, is_percussion))
+        if instrument is None:
+            instrument = cls(DEFAULT_INSTRUMENT)
+            instrument.set_number(num, is_percussion=is_percussion)
+            instrument._is_shared = True
+            cls._shared[(num, is_percussion)] = instrument
+        return instrument
+
+    @classmethod
+    def shared(cls, name=DEFAULT_INSTRUMENT):
+        """The shared instrument with the given name"""
+        if isinstance(name, Instrument):
+            return cls.from_number(name.number, is_percussion=name.is_percussion)
+        instrument = cls._shared.get(name)
+        if instrument is not None:
+            return instrument
+        cls.validate_type(name, str)
+        instruments, percussion = instrument_tables()[:2]
+        if name in instruments:
+            instrument = cls.from_number(instruments[name][0])
+        elif name in percussion:
+            instrument = cls.from_number(percussion[name][0], is_percussion=True)
+        else:
+            raise ValueError('{} is not a valid midi instrument name'.format(name))
+        # Also kept by name, every music object starts with a shared instrument
+        cls._shared[name] = instrument
+        return instrument
+
     def set_number(self, num, is_percussion=False):
         if num not in range(0, 129):
             raise ValueError('Invalid instrument number {}'.format(str(num)))
         if num not in range(35, 82) and is_percussion:
             raise ValueError('Number not that of a percussion in midi.')
-        else:
-            self._is_percussion = is_percussion
-        self.name = self.name_from_number(num, is_percussion=self._is_percussion)
+        self.name = self.name_from_number(num, is_percussion=is_percussion)
 
     @staticmethod
     def name_from_number(num, is_percussion=False):
+        instrument_names, percussion_names = instrument_tables()[2:]
         if is_percussion:
-            for instrument in instrument_data.PERCUSSION:
-                if instrument_data.PERCUSSION[instrument][0] == num:
-                    return instrument
+            return percussion_names.get(num)
         else:
-            for instrument in instrument_data.INSTRUMENTS:
-                if instrument_data.INSTRUMENTS[instrument][0] == num:
-                    return instrument
+            return instrument_names.get(num)
 
     @property
     def is_keyboard(self):
@@ -58,6 +118,10 @@ class Instrument(ScoreObject):
     def is_percussion(self):
         return self._is_percussion
 
+    @property
+    def is_shared(self):
+        return self._is_shared
+
     @property
     def number(self):
         return self._number
@@ -68,13 +132,18 @@ class Instrument(ScoreObject):
 
     @name.setter
     def name(self, name):
+        if self._is_shared:
+            raise InstrumentException('Shared instruments cannot be changed. '
+                                      'Assign Instrument.shared({}) instead'
+                                      ''.format(name))
         self.validate_type(name, str)
-        if self.contains(name, instrument_data.INSTRUMENTS):
+        instruments, percussion = instrument_tables()[:2]
+        if self.contains(name, instruments):
             self._is_percussion = False
-            self._number = instrument_data.INSTRUMENTS[name][0]
-        elif self.contains(name, instrument_data.PERCUSSION):
+            self._number = instruments[name][0]
+        elif self.contains(name, percussion):
             self._is_percussion = True
-            self._number = instrument_data.PERCUSSION[name][0]
+            self._number = percussion[name][0]
         else:
             raise ValueError('{} is not a valid midi instrument name'.format(name))
         self._name = name
@@ -1,18 +1,46 @@
-from score.base import ScoreObject, KeyException
+from score.base import ScoreObject, KeyException, pitch_class_mask
 from score.config import config
+from score.note import Note, NON_STANDARD_PITCHES
 from score.scale import MajorScale, MinorScale
 
+MODE_INTERVALS = {
+    'major': [0, 2, 4, 5, 7, 9, 11],
+    'minor': [0, 2, 3, 5, 7, 8, 10]
+}
+
+# One bit per music letter, for accidental masks
+LETTER_BITS = dict((letter, 1 << i)
+                   for i, letter in enumerate(config.MUSIC_LETTERS))
+ALL_LETTERS_MASK = (1 << len(config.MUSIC_LETTERS)) - 1
+
 
 class Key(ScoreObject):
+    """A major or minor key. Keys are interned by key string: Key('E-')
+    always returns the same object, so keys cannot be changed once
+    created
+    """
+
+    _instances = {}
+
+    def __new__(cls, key):
+        instance = cls._instances.get((cls, key)) \
+            if isinstance(key, str) else None
+        if instance is None:
+            instance = super(Key, cls).__new__(cls)
+            instance._key = None
+        return instance
 
     def __init__(self, key):
-        self._key = None
+        if self._key is not None:
+            return
         self._tonic = None
         self._mode_type = None
         self._name = None
+        self._pitch_class_mask = None
 
         self.key = key
         super(Key, self).__init__()
+        self._instances[(type(self), key)] = self
 
     def __str__(self):
         return self._name
@@ -39,10 +67,24 @@ class Key(ScoreObject):
     def _set_name(self):
         self._name = '{} {}'.format(self.key.upper(), self.mode_type)
 
+    def _set_pitch_class_mask(self):
+        tonic = self.tonic_pitch_class
+        self._pitch_class_mask = pitch_class_mask(
+            tonic + i for i in MODE_INTERVALS[self._mode_type])
+
     @property
     def tonic(self):
         return self._tonic
 
+    @property
+    def tonic_pitch_class(self):
+        return Note.get_base_note_number(self._tonic)
+
+    @property
+    def pitch_class_mask(self):
+        """Bit mask of the pitch classes of the key's scale"""
+        return self._pitch_class_mask
+
     @property
     def mode_type(self):
         return self._mode_type
@@ -57,19 +99,47 @@ class Key(ScoreObject):
 
     @key.setter
     def key(self, key):
+        if self._key is not None and key != self._key:
+            raise KeyException('Keys are shared and cannot be changed. '
+                               'Use Key({}) instead'.format(key))
         self.validate(key)
         self._key = key
         self._set_tonic()
         self._set_mode_type()
         self._set_name()
+        self._set_pitch_class_mask()
 
 
 class Accidentals(ScoreObject):
+    """Music letters to sharpen, flatten or leave natural. Each list is
+    mirrored by a bit mask of LETTER_BITS so that membership is a bit
+    test. The accidentals of a KeySignature are shared with every user
+    of the key signature and cannot be changed: change a copy instead
+    """
 
     def __init__(self):
         self._sharpen = []
         self._flatten = []
-        self._naturalize = config.MUSIC_LETTERS
+        self._naturalize = list(config.MUSIC_LETTERS)
+        self._sharpen_mask = 0
+        self._flatten_mask = 0
+        self._shared = False
+
+    def copy(self):
+        """Accidentals with the same letters, that can be changed"""
+        accidentals = Accidentals()
+        accidentals._sharpen = list(self._sharpen)
+        accidentals._flatten = list(self._flatten)
+        accidentals._naturalize = list(self._naturalize)
+        accidentals._sharpen_mask = self._sharpen_mask
+        accidentals._flatten_mask = self._flatten_mask
+        return accidentals
+
+    def _validate_change(self, letters):
+        if self._shared:
+            raise KeyException('The accidentals of a key signature are shared '
+                               'and cannot be changed. Change a copy instead')
+        self.validate_music_letters(letters)
 
     def validate_music_letters(self, letters):
         self.validate_type(letters, list)
@@ -81,13 +151,34 @@ class Accidentals(ScoreObject):
         self.validate_type(items, list)
         return [x for x in items if x != i]
 
+    def is_sharpened(self, letter):
+        return bool(self._sharpen_mask & LETTER_BITS.get(letter, 0))
+
+    def is_flattened(self, letter):
+        return bool(self._flatten_mask & LETTER_BITS.get(letter, 0))
+
+    def is_naturalized(self, letter):
+        return bool(self.naturalize_mask & LETTER_BITS.get(letter, 0))
+
+    @property
+    def sharpen_mask(self):
+        return self._sharpen_mask
+
+    @property
+    def flatten_mask(self):
+        return self._flatten_mask
+
+    @property
+    def naturalize_mask(self):
+        return ALL_LETTERS_MASK & ~(self._sharpen_mask | self._flatten_mask)
+
     @property
     def sharpen(self):
-        return self._sharpen
+        return list(self._sharpen)
 
     @sharpen.setter
     def sharpen(self, keys):
-        self.validate_music_letters(keys)
+        self._validate_change(keys)
         for k in keys:
             k = k.upper()
             if k not in self._sharpen:
@@ -96,14 +187,16 @@ class Accidentals(ScoreObject):
                 self._flatten = self.remove_item(k, self._flatten)
             if k in self._naturalize:
                 self._naturalize = self.remove_item(k, self._naturalize)
+            self._sharpen_mask |= LETTER_BITS[k]
+            self._flatten_mask &= ~LETTER_BITS[k]
 
     @property
     def flatten(self):
-        return self._flatten
+        return list(self._flatten)
 
     @flatten.setter
     def flatten(self, keys):
-        self.validate_music_letters(keys)
+        self._validate_change(keys)
         for k in keys:
             k = k.upper()
             if k not in self._flatten:
@@ -112,14 +205,16 @@ class Accidentals(ScoreObject):
                 self._sharpen = self.remove_item(k, self._sharpen)
             if k in self._naturalize:
                 self._naturalize = self.remove_item(k, self._naturalize)
+            self._flatten_mask |= LETTER_BITS[k]
+            self._sharpen_mask &= ~LETTER_BITS[k]
 
     @property
     def naturalize(self):
-        return self._naturalize
+        return list(self._naturalize)
 
     @naturalize.setter
     def naturalize(self, keys):
-        self.validate_music_letters(keys)
+        self._validate_change(keys)
         for k in keys:
             k = k.upper()
             if k not in self._naturalize:
@@ -128,20 +223,41 @@ class Accidentals(ScoreObject):
                 self._sharpen = self.remove_item(k, self._sharpen)
             if k in self._flatten:
                 self._flatten = self.remove_item(k, self._flatten)
+            self._sharpen_mask &= ~LETTER_BITS[k]
+            self._flatten_mask &= ~LETTER_BITS[k]
 
 
 class KeySignature(ScoreObject):
+    """The accidentals of a key. Key signatures are interned by key
+    string like Key, and their accidentals are worked out from pitch
+    classes without building the key's scale, with each degree of the
+    key on the next music letter. The scale is built on first access
+    """
+
+    _instances = {}
+
+    def __new__(cls, key):
+        key_string = key.key if isinstance(key, Key) else key
+        instance = cls._instances.get((cls, key_string)) \
+            if isinstance(key_string, str) else None
+        if instance is None:
+            instance = super(KeySignature, cls).__new__(cls)
+            instance._key = None
+        return instance
 
     def __init__(self, key):
+        if self._key is not None:
+            return
         self._accidentals = Accidentals()
         self._scale = None
-        self._key = None
+        self._spellings = None
 
         self.key = key
         super(KeySignature, self).__init__()
+        self._instances[(type(self), self._key.key)] = self
 
     def __str__(self):
-        return '{} {}'.format(self._key.name, self._scale)
+        return '{} {}'.format(self._key.name, self.scale)
 
     @property
     def accidentals(self):
@@ -152,22 +268,73 @@ class KeySignature(ScoreObject):
             self._scale = MajorScale(self.key.tonic)
         elif self.key.mode_type == 'minor':
             self._scale = MinorScale(self.key.tonic)
-        self._set_accidentals()
+
+    def _degree_spellings(self):
+        """(pitch class, letter, accidental) of every degree of the key,
+        each degree on the next music letter. The accidental is the number
+        of semitones above the natural letter
+        """
+        letters = config.MUSIC_LETTERS
+        start = letters.index(Note.letter_from_name(self._key.tonic))
+        tonic = self._key.tonic_pitch_class
+        degrees = []
+        for degree, interval in enumerate(MODE_INTERVALS[self._key.mode_type]):
+            letter = letters[(start + degree) % len(letters)]
+            pitch_class = (tonic + interval) % 12
+            accidental = (pitch_class - config.NOTENAMES_PITCHCLASS[letter] + 6) % 12 - 6
+            degrees.append((pitch_class, letter, accidental))
+        return degrees
 
     def _set_accidentals(self):
         sharp_list = []
         flat_list = []
-        for n in self._scale.note_sequence:
-            note = self.strip_digits(n.name)
-            if '#' in note:
-                sharp_list.append(note.replace('#',''))
-            elif '-' in note:
-                flat_list.append(note.replace('-', ''))
-        self.accidentals.sharpen = sharp_list
-        self.accidentals.flatten = flat_list
+        for pitch_class, letter, accidental in self._degree_spellings():
+            if accidental > 0:
+                sharp_list.append(letter)
+            elif accidental < 0:
+                flat_list.append(letter)
+        self._accidentals.sharpen = sharp_list
+        self._accidentals.flatten = flat_list
+        self._accidentals._shared = True
+
+    def _set_spellings(self):
+        # Pitches outside the key take the key's accidental
+        if self._accidentals.sharpen_mask:
+            chromatic = '#'
+        elif self._accidentals.flatten_mask:
+            chromatic = '-'
+        else:
+            chromatic = None
+        spellings = []
+        for pitch_class in range(0, 12):
+            names = [name for name in config.PITCHCLASS_NOTENAMES[pitch_class]
+                     if name not in NON_STANDARD_PITCHES]
+            spelling = names[0]
+            for name in names:
+                if chromatic is not None and chromatic in name:
+                    spelling = name
+            spellings.append(spelling)
+        for pitch_class, letter, accidental in self._degree_spellings():
+            if accidental in (-1, 0, 1):
+                name = letter + {-1: '-', 0: '', 1: '#'}[accidental]
+                if name not in NON_STANDARD_PITCHES:
+                    spellings[pitch_class] = name
+        self._spellings = spellings
+
+    @property
+    def spellings(self):
+        """Pitch name of each pitch class in this key, from 0 (C) to 11.
+        Pitches of the key are spelled with its accidentals, others with
+        a sharp in sharp keys and a flat otherwise
+        """
+        if self._spellings is None:
+            self._set_spellings()
+        return self._spellings
 
     @property
     def scale(self):
+        if self._scale is None:
+            self._set_scale()
         return self._scale
 
     @property
@@ -176,11 +343,14 @@ class KeySignature(ScoreObject):
 
     @key.setter
     def key(self, key):
-        if isinstance(key, Key):
-            self._key = key
-        else:
-            self._key = Key(key)
-        self._set_scale()
+        if not isinstance(key, Key):
+            key = Key(key)
+        if self._key is not None and key is not self._key:
+            raise KeyException('Key signatures are shared and cannot be '
+                               'changed. Use KeySignature({}) instead'
+                               ''.format(key.key))
+        self._key = key
+        self._set_accidentals()
 
 
 def main():
@@ -0,0 +1,178 @@
+"""
+Key detection by correlating duration weighted pitch class histograms
+with major and minor key profiles (Krumhansl-Schmuckler)
+"""
+import numpy as np
+
+from score.base import ScoreObject
+from score.chord import Chord
+from score.key import Key
+from score.note import Note, Message, TICKS_PER_QUARTER
+
+# Krumhansl-Kessler probe tone profiles, starting on the tonic
+MAJOR_PROFILE = [6.35, 2.23, 3.48, 2.33, 4.38, 4.09,
+                 2.52, 5.19, 2.39, 3.66, 2.29, 2.88]
+MINOR_PROFILE = [6.33, 2.68, 3.52, 5.38, 2.60, 3.53,
+                 2.54, 4.75, 3.98, 2.69, 3.34, 3.17]
+
+# Name of the key on each tonic pitch class, as in config.KEY_NAMES
+MAJOR_KEY_NAMES = ['C', 'D-', 'D', 'E-', 'E', 'F',
+                   'F#', 'G', 'A-', 'A', 'B-', 'B']
+MINOR_KEY_NAMES = ['c', 'c#', 'd', 'e-', 'e', 'f',
+                   'f#', 'g', 'g#', 'a', 'b-', 'b']
+
+
+class KeyFinder(ScoreObject):
+    """Finds the key of a Score, Staff or Clef, or of every window of
+    it. The key profiles are rotated to all 12 tonics once, so that any
+    number of histograms is scored with one matrix product.
+
+    Example:
+    >>> finder = KeyFinder()
+    >>> str(finder.find(score))
+    'C minor'
+    >>> [(onset, str(key)) for onset, key in finder.find_windows(score, 16, 16)]
+    [(0.0, 'E- major'), (16.0, 'E- major'), (32.0, 'C minor'), (48.0, 'C minor')]
+    """
+    def __init__(self, major_profile=MAJOR_PROFILE,
+                 minor_profile=MINOR_PROFILE):
+        profiles = []
+        for profile in [major_profile, minor_profile]:
+            for tonic in range(0, 12):
+                profiles.append(np.roll(profile, tonic))
+        profiles = np.array(profiles, dtype=float)
+        profiles -= profiles.mean(axis=1, keepdims=True)
+        profiles /= np.linalg.norm(profiles, axis=1, keepdims=True)
+        self._profiles = profiles.T
+        self._keys = [Key(name) for name in MAJOR_KEY_NAMES + MINOR_KEY_NAMES]
+
+    def histogram(self, obj):
+        """Total quarter length of each pitch class"""
+        onsets, durations, pitch_classes = self.note_events(obj)
+        return np.bincount(pitch_classes, weights=durations, minlength=12)
+
+    def correlations(self, histograms):
+        """Correlation of each row of an (N, 12) array of histograms
+        with the 24 key profiles, majors then minors. Rows without any
+        notes correlate 0 with every key
+        """
+        histograms = np.atleast_2d(np.asarray(histograms, dtype=float))
+        centred = histograms - histograms.mean(axis=1, keepdims=True)
+        norms = np.linalg.norm(centred, axis=1, keepdims=True)
+        norms[norms == 0] = np.inf
+        return (centred / norms) @ self._profiles
+
+    def find(self, obj):
+        """The most likely Key of the object, or None if it has no
+        notes
+        """
+        return self._best_keys(self.histogram(obj)[np.newaxis])[0]
+
+    def find_histograms(self, histograms):
+        """The most likely Key of each row of an (N, 12) array of pitch
+        class histograms, None for rows without notes. Scores many pieces
+        with one matrix product
+        """
+        return self._best_keys(np.atleast_2d(np.asarray(histograms, dtype=float)))
+
+    def find_windows(self, obj, window=16.0, step=4.0):
+        """The most likely Key of every window of window quarter lengths,
+        starting every step quarter lengths. Returns a list of
+        (onset, Key), with None for windows without notes.
+
+        The time line is cut into steps, and each step's histogram is
+        computed exactly from the notes sounding in it. Window histograms
+        are running sums of step histograms, so the score is analysed in
+        one linear pass however many windows overlap
+        """
+        if window <= 0 or step <= 0:
+            raise ValueError('Window and step should be positive')
+        steps_per_window = int(round(float(window) / step))
+        if steps_per_window < 1 or abs(steps_per_window * step - window) > 1e-9:
+            raise ValueError('The window should be a multiple of the step')
+        onsets, durations, pitch_classes = self.note_events(obj)
+        if not len(onsets):
+            return []
+        ends = onsets + durations
+        num_steps = int(np.ceil(ends.max() / step))
+        num_windows = max(num_steps - steps_per_window + 1, 1)
+        edges = np.arange(num_steps + 1) * float(step)
+
+        # sounding[k, pc] is how long pitch class pc has sounded by edges[k]
+        sounding = np.zeros((num_steps + 1, 12))
+        for pitch_class in range(0, 12):
+            selected = pitch_classes == pitch_class
+            if selected.any():
+                sounding[:, pitch_class] = self._sounding_time(
+                    onsets[selected], ends[selected], edges)
+        last = min(steps_per_window, num_steps)
+        windows = sounding[last:last + num_windows] - sounding[:num_windows]
+        keys = self._best_keys(windows)
+        return [(float(edges[i]), keys[i]) for i in range(0, num_windows)]
+
+    def _best_keys(self, histograms):
+        correlations = self.correlations(histograms)
+        has_notes = np.asarray(histograms).sum(axis=1) > 0
+        best = correlations.argmax(axis=1)
+        return [self._keys[b] if has_notes[i] else None
+                for i, b in enumerate(best)]
+
+    @staticmethod
+    def _sounding_time(onsets, ends, times):
+        """Total time, summed over notes, that the notes have sounded by
+        each of the given times
+        """
+        onsets = np.sort(onsets)
+        ends = np.sort(ends)
+        onset_sums = np.concatenate(([0.0], np.cumsum(onsets)))
+        end_sums = np.concatenate(([0.0], np.cumsum(ends)))
+        started = np.searchsorted(onsets, times, side='right')
+        ended = np.searchsorted(ends, times, side='right')
+        return (times * started - onset_sums[started]) - \
+            (times * ended - end_sums[ended])
+
+    @staticmethod
+    def note_events(obj):
+        """Onsets, quarter lengths and pitch classes of every note of a
+        Score, Staff or Clef, as numpy arrays. Chords contribute one
+        event per note. Messages take no time
+        """
+        if hasattr(obj, 'staves'):
+            clefs = [clef for staff in obj.staves for clef in staff.clefs]
+        elif hasattr(obj, 'clefs'):
+            clefs = obj.clefs
+        else:
+            clefs = [obj]
+        onsets = []
+        durations = []
+        pitch_classes = []
+        for clef in clefs:
+            # Onsets are summed in ticks, exactly
+            onset = 0
+            current = clef.head
+            while current is not None:
+                ticks = current.ticks
+                value = current.value
+                if isinstance(value, Chord):
+                    for note in value.notes:
+                        onsets.append(onset)
+                        durations.append(ticks)
+                        pitch_classes.append(note.number % 12)
+                elif isinstance(value, Note):
+                    onsets.append(onset)
+                    durations.append(ticks)
+                    pitch_classes.append(value.number % 12)
+                if not isinstance(value, Message):
+                    onset += ticks
+                current = current.next
+        return (np.array(onsets, dtype=np.int64) / TICKS_PER_QUARTER,
+                np.array(durations, dtype=np.int64) / TICKS_PER_QUARTER,
+                np.array(pitch_classes, dtype=np.int64))
+
+
+def main():
+    pass
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,15 @@
-import itertools
-import math
-from fractions import Fraction
 from functools import reduce
 
 from mido import MidiFile, MidiTrack, MetaMessage, Message, bpm2tempo
 
+from score.config import config
+
+# Ticks per beat are at least MIN_TICKS_PER_BEAT. The midi limit is 32767:
+# above it, ticks per beat are capped at MAX_TICKS_PER_BEAT, the largest
+# value under the limit with small prime factors (2^3 * 3^2 * 5 * 7 * 13)
+MIN_TICKS_PER_BEAT = 96
+MAX_TICKS_PER_BEAT = 32760
+
 
 def gcd(*numbers):
     from math import gcd
@@ -21,6 +26,11 @@ class Midi(MidiFile):
 
     def __init__(self, score):
         self._score = None
+        # Score and midi ticks written so far to each track
+        self._positions = {}
+        # Largest error of a duration, in quarter lengths, when ticks per
+        # beat are capped. Onsets are never further than half a tick off
+        self.rounding_error = 0.0
         super(Midi, self).__init__()
         self._set_score(score)
 
@@ -71,16 +81,18 @@ class Midi(MidiFile):
 
     def add_obj(self, obj, track_index=0, channel=0):
         self.create_track_if_none(track_index)
-        if type(obj).__name__ in ['Chord', 'RomanNumeral', 'PopularChord']:
+        # obj may be a placement of a shared note, chord, rest or message
+        obj_type = type(obj.value).__name__
+        if obj_type in ['Chord', 'RomanNumeral', 'PopularChord']:
             self.add_chord(obj, track_index=track_index, channel=channel)
-        elif type(obj).__name__ in ['Note', 'Rest']:
+        elif obj_type in ['Note', 'Rest']:
             self.add_note(obj, track_index=track_index, channel=channel)
         else:
             self.add_message(obj, track_index=track_index)
 
     def add_note(self, note, track_index=0, channel=0):
         self.create_track_if_none(track_index)
-        time = int(note.quarter_length * self.ticks_per_beat)
+        time = self.advance(note.ticks, track_index)
         score_lyric = note.lyric
         if score_lyric:
             lyric = MetaMessage('lyrics', text=score_lyric)
@@ -108,13 +120,14 @@ class Midi(MidiFile):
 
         for i in range(0, len(chord.notes)):
             note = chord.notes[i]
-            time = int(note.quarter_length * self.ticks_per_beat) if i == 0 else 0
+            time = self.advance(chord.ticks, track_index) if i == 0 else 0
             self.tracks[track_index].append(Message('note_off', channel=channel,
                                                     note=note.number, time=time,
                                                     velocity=note.release_velocity))
 
     def _score_to_midi(self):
         self.tracks = []
+        self._positions = {}
         first_track = MidiTrack()
         score = self._score
         if hasattr(score, 'copyright'):
@@ -186,20 +199,75 @@ class Midi(MidiFile):
             mode = 'm'
         return mido_key.format(key_letter, accidental, mode)
 
+    def to_midi_ticks(self, ticks):
+        """Midi ticks of a time in score ticks, see
+        config.TICKS_PER_QUARTER. Exact when ticks_per_beat is a multiple of
+        its denominator, rounded to the nearest tick otherwise
+        """
+        ticks_per_quarter = config.TICKS_PER_QUARTER
+        return (ticks * self.ticks_per_beat + ticks_per_quarter // 2) // ticks_per_quarter
+
+    def advance(self, ticks, track_index=0):
+        """Moves a track on by a duration in score ticks, and returns the
+        duration in midi ticks. Onsets are rounded rather than durations,
+        so rounding never accumulates along a track
+        """
+        position, midi_position = self._positions.get(track_index, (0, 0))
+        position += ticks
+        time = self.to_midi_ticks(position) - midi_position
+        self._positions[track_index] = (position, midi_position + time)
+        return time
+
+    def plan_ticks_per_beat(self, denominator, durations=()):
+        """Sets ticks_per_beat to the smallest exact value for durations
+        whose denominators divide denominator, see smallest_ticks_per_beat.
+        When it is capped, rounding_error is set from the durations, in
+        ticks, and a warning is logged
+        """
+        self.ticks_per_beat = self.smallest_ticks_per_beat(denominator)
+        self.rounding_error = 0.0
+        if self.ticks_per_beat % denominator:
+            ticks_per_quarter = config.TICKS_PER_QUARTER
+            for ticks in durations:
+                error = abs(self.to_midi_ticks(ticks) * ticks_per_quarter -
+                            ticks * self.ticks_per_beat)
+                error /= float(ticks_per_quarter * self.ticks_per_beat)
+                self.rounding_error = max(self.rounding_error, error)
+            from score.base import get_logger
+            get_logger(__name__).warning(
+                'No ticks per beat up to {} represent every duration exactly. '
+                'Durations are rounded by up to {:.3g} quarter lengths'
+                ''.format(MAX_TICKS_PER_BEAT, self.rounding_error))
+
+    def plan_clefs(self, clefs):
+        """Plans ticks per beat for the clefs from their denominators,
+        which the clefs keep up to date, in time proportional to the
+        number of clefs
+        """
+        clefs = list(clefs)
+        denominator = lcm(*[clef.denominator for clef in clefs])
+        self.plan_ticks_per_beat(denominator, (ticks for clef in clefs
+                                               for ticks in clef.unique_ticks))
+
+    @staticmethod
+    def denominator(ticks):
+        from score.note import ticks_denominator
+        return ticks_denominator(ticks)
+
     @staticmethod
-    def best_ticks_per_beat(*note_lengths):
-        denominators = []
-        for length in note_lengths:
-            length = math.modf(length)[0]
-            denominators.append(Fraction(length).limit_denominator().denominator)
-        min_tpb = 96
-        tpb = min_tpb
-        if len(denominators) > 0:
-            for i in itertools.count():
-                tpb = gcd(*tuple(denominators)) * max(denominators) * i
-                if tpb >= min_tpb:
-                    break
-        return tpb
+    def smallest_ticks_per_beat(denominator):
+        """The smallest multiple of denominator of at least
+        MIN_TICKS_PER_BEAT, or MAX_TICKS_PER_BEAT if it is larger
+        """
+        ticks_per_beat = denominator * -(-MIN_TICKS_PER_BEAT // denominator)
+        return min(ticks_per_beat, MAX_TICKS_PER_BEAT)
+
+    @classmethod
+    def best_ticks_per_beat(cls, *note_lengths):
+        from score.note import NoteBase
+        denominators = [cls.denominator(NoteBase.to_ticks(length))
+                        for length in note_lengths]
+        return cls.smallest_ticks_per_beat(lcm(*denominators))
 
     @classmethod
     def change_instrument_message(cls, score_instr, track, channel=0):
@@ -236,7 +304,7 @@ class MidiNote(MidiNoteBase):
     def _score_to_midi(self):
         super(MidiNote, self)._score_to_midi()
         note = self._score
-        self.ticks_per_beat = self.best_ticks_per_beat(note.quarter_length)
+        self.plan_ticks_per_beat(self.denominator(note.ticks), [note.ticks])
         self.add_note(note, track_index=0, channel=0)
         end = MetaMessage('end_of_track')
         self.tracks[0].append(end)
@@ -253,8 +321,7 @@ class MidiChord(Midi):
     def _score_to_midi(self):
         super(MidiChord, self)._score_to_midi()
         chord = self._score
-        quarter_lengths = [ql.quarter_length for ql in chord.notes]
-        self.ticks_per_beat = self.best_ticks_per_beat(*quarter_lengths)
+        self.plan_ticks_per_beat(self.denominator(chord.ticks), [chord.ticks])
         self.add_chord(chord, track_index=0, channel=0)
         end = MetaMessage('end_of_track')
         self.tracks[0].append(end)
@@ -273,8 +340,9 @@ class MidiScaleBase(Midi):
     def _score_to_midi(self):
         super(MidiScaleBase, self)._score_to_midi()
         scale = self._score
-        quarter_lengths = [ql.quarter_length for ql in scale.note_sequence]
-        self.ticks_per_beat = self.best_ticks_per_beat(*quarter_lengths)
+        durations = [note.ticks for note in scale.note_sequence]
+        self.plan_ticks_per_beat(lcm(*[self.denominator(ticks) for ticks in durations]),
+                                 durations)
         for note in scale.note_sequence:
             self.add_note(note, track_index=0, channel=0)
 
@@ -305,8 +373,7 @@ class MidiClef(Midi):
     def _score_to_midi(self):
         super(MidiClef, self)._score_to_midi()
         clef = self._score
-        quarter_lengths = clef.unique_quarter_lengths
-        self.ticks_per_beat = self.best_ticks_per_beat(*quarter_lengths)
+        self.plan_clefs([clef])
         self.add_clef(clef, track_index=0, channel=0)
 
 
@@ -315,10 +382,7 @@ class MidiStaff(Midi):
     def _score_to_midi(self):
         super(MidiStaff, self)._score_to_midi()
         staff = self._score
-        quarter_lengths = []
-        for clef in staff.clefs:
-            quarter_lengths += clef.unique_quarter_lengths
-        self.ticks_per_beat = self.best_ticks_per_beat(*quarter_lengths)
+        self.plan_clefs(staff.clefs)
         self.add_staff(staff, initial_track_index=0)
 
 
@@ -327,11 +391,7 @@ class MidiScore(Midi):
     def _score_to_midi(self):
         super(MidiScore, self)._score_to_midi()
         score = self._score
-        quarter_lengths = []
-        for staff in score.staves:
-            for clef in staff.clefs:
-                quarter_lengths += clef.unique_quarter_lengths
-        self.ticks_per_beat = self.best_ticks_per_beat(*quarter_lengths)
+        self.plan_clefs(clef for staff in score.staves for clef in staff.clefs)
 
         for staff in score.staves:
             self.add_staff(staff, initial_track_index=len(self.tracks))
@@ -0,0 +1,335 @@
+"""
+Versioned binary format of a Score: a header of metadata followed by the
+notes of each clef as columnar arrays.
+
+Layout, all little endian:
+    MAGIC, format version (uint16), header length (uint32)
+    header, utf-8 json
+    padding to a multiple of 8 bytes
+    columns, each starting at a multiple of 8 bytes
+
+Loading reads the header and maps the columns with numpy.frombuffer,
+without copying them. The notes of a clef are built from its columns
+the first time the clef is used
+"""
+import json
+import struct
+
+from score.base import NativeFormatException
+from score.config import config
+
+MAGIC = b'SCORE\x00'
+FORMAT_VERSION = 2
+PRELUDE = struct.Struct('<6sHI')
+
+# Kinds of sequence positions
+NOTE, REST, CHORD, MESSAGE = range(0, 4)
+
+# Position flags. The spelling is an index in PITCHCLASS_NOTENAMES
+INHERITS = 1
+SPELLING_SHIFT = 1
+
+# Columns of the positions of a clef, and of the notes of its chords.
+# Durations are in ticks, see NoteBase.ticks
+POSITION_COLUMNS = (('kind', '<u1'), ('flags', '<u1'), ('number', '<u1'),
+                    ('chord_size', '<u2'), ('ticks', '<u8'),
+                    ('tempo', '<i2'), ('volume', '<i2'),
+                    ('attack_velocity', '<i2'), ('release_velocity', '<i2'))
+# Version 1 stored durations as float quarter lengths
+VERSION_1_POSITION_COLUMNS = tuple(
+    ('quarter_length', '<f8') if name == 'ticks' else (name, dtype)
+    for name, dtype in POSITION_COLUMNS)
+CHORD_COLUMNS = (('chord_number', '<u1'), ('chord_flags', '<u1'),
+                 ('chord_attack_velocity', '<i2'),
+                 ('chord_release_velocity', '<i2'))
+
+# Attributes stored per position and per chord note. -1 is unset
+STORED_ATTRIBUTES = ('tempo', 'volume', 'attack_velocity', 'release_velocity')
+CHORD_ATTRIBUTES = ('attack_velocity', 'release_velocity')
+
+
+def dumps(score):
+    """The score in the native format, as bytes"""
+    import numpy as np
+
+    columns = []
+    size = [0]
+
+    def add_column(values, dtype):
+        data = np.asarray(values, dtype=dtype).tobytes()
+        offset = size[0]
+        columns.append(data)
+        columns.append(b'\x00' * (-len(data) % 8))
+        size[0] += len(data) + (-len(data) % 8)
+        return offset
+
+    staves = []
+    for staff in score.staves:
+        clefs = []
+        for clef in staff.clefs:
+            clef_header, values = _clef_columns(clef)
+            clef_header['columns'] = dict(
+                (name, add_column(values[name], dtype))
+                for name, dtype in POSITION_COLUMNS + CHORD_COLUMNS)
+            clefs.append(clef_header)
+        staff_header = _object_header(staff)
+        staff_header.update({'name': staff.name, 'clefs': clefs,
+                             'inherits': staff.parent is score})
+        staves.append(staff_header)
+    header = _object_header(score)
+    header.update({'title': score.title, 'lyrics_by': score.lyrics_by,
+                   'music_by': score.music_by, 'genre': score.genre,
+                   'staves': staves})
+    header = json.dumps(header, default=list).encode('utf-8')
+    prelude = PRELUDE.pack(MAGIC, FORMAT_VERSION, len(header))
+    padding = b'\x00' * (-(PRELUDE.size + len(header)) % 8)
+    return b''.join([prelude, header, padding] + columns)
+
+
+def loads(data):
+    """The score stored in data, bytes or any buffer in the native
+    format. The columns are views of data, which must not change while
+    the score is in use
+    """
+    from score.instrument import Instrument
+    from score.score import Score
+    from score.staff import Staff
+
+    view = memoryview(data)
+    if len(view) < PRELUDE.size:
+        raise NativeFormatException('Not a native score')
+    magic, version, header_length = PRELUDE.unpack_from(view)
+    if magic != MAGIC:
+        raise NativeFormatException('Not a native score')
+    if version > FORMAT_VERSION:
+        raise NativeFormatException('Unsupported native format version {}. '
+                                    'Expected at most {}'
+                                    ''.format(version, FORMAT_VERSION))
+    header_end = PRELUDE.size + header_length
+    if header_end > len(view):
+        raise NativeFormatException('Truncated native score: the header ends at '
+                                    'byte {}, past the end of the data at byte {}'
+                                    ''.format(header_end, len(view)))
+    try:
+        header = json.loads(bytes(view[PRELUDE.size:header_end]).decode('utf-8'))
+    except ValueError as error:
+        raise NativeFormatException('Invalid native score header: {}'.format(error))
+    start = header_end + (-header_end % 8)
+    position_columns = POSITION_COLUMNS if version > 1 else VERSION_1_POSITION_COLUMNS
+
+    score = Score()
+    _apply_header(score, header, Instrument)
+    for key in ['title', 'lyrics_by', 'music_by', 'genre']:
+        setattr(score, key, header[key])
+    for staff_header in header['staves']:
+        staff = Staff(name=staff_header['name'])
+        _apply_header(staff, staff_header, Instrument)
+        score.add_staff(staff, inherit=staff_header['inherits'])
+        for clef, clef_header in zip(staff.clefs, staff_header['clefs']):
+            clef.name = clef_header['name']
+            _apply_header(clef, clef_header, Instrument)
+            if not clef_header['inherits']:
+                clef._parent = None
+            columns = _map_columns(view, start, clef_header, position_columns)
+            clef._stored = (columns, clef_header)
+    return score
+
+
+def load_sequence(clef, stored):
+    """Appends the notes, chords, rests and messages stored for a clef"""
+    from score.chord import Chord, PopularChord, RomanNumeral
+    from score.note import Message, Note, NoteBase, Rest
+    from score.time_signature import TimeSignature
+
+    columns, header = stored
+    values = dict((name, column.tolist()) for name, column in columns.items())
+    if 'ticks' not in values:
+        values['ticks'] = [NoteBase.to_ticks(quarter_length)
+                           for quarter_length in values.pop('quarter_length')]
+    lyrics = header['lyrics']
+    messages = header['messages']
+    chords = header['chords']
+    time_signatures = header['time_signatures']
+    chord_start = 0
+    for i in range(0, header['length']):
+        kind = values['kind'][i]
+        if kind == MESSAGE:
+            msg_type, parameters = messages[str(i)]
+            message = Message(msg_type, **parameters)
+            if str(i) in lyrics:
+                message.lyric = lyrics[str(i)]
+            clef.add_message(message)
+            continue
+        if kind == NOTE:
+            obj = Note(values['number'][i])
+            _spell(obj, values['flags'][i])
+        elif kind == REST:
+            obj = Rest()
+        else:
+            chord_size = values['chord_size'][i]
+            chord_end = chord_start + chord_size
+            stored_chord = chords.get(str(i))
+            if stored_chord is None:
+                obj = Chord(values['chord_number'][chord_start:chord_end])
+            elif stored_chord[0] == 'PopularChord':
+                obj = PopularChord(root=stored_chord[1], name=stored_chord[2],
+                                   bass=stored_chord[3])
+            else:
+                obj = RomanNumeral(root=stored_chord[1], numeral=stored_chord[2])
+            for j, note in enumerate(obj.notes[:chord_size]):
+                k = chord_start + j
+                _spell(note, values['chord_flags'][k])
+                _set_attributes(note, values, k, CHORD_ATTRIBUTES, 'chord_')
+            chord_start = chord_end
+        obj.ticks = values['ticks'][i]
+        _set_attributes(obj, values, i, STORED_ATTRIBUTES)
+        if str(i) in lyrics:
+            obj.lyric = lyrics[str(i)]
+        if str(i) in time_signatures:
+            obj.time_signature = TimeSignature(time_signatures[str(i)])
+        clef.add_note(obj, inherit=bool(values['flags'][i] & INHERITS))
+
+
+def _clef_columns(clef):
+    from score.chord import Chord, PopularChord, RomanNumeral
+    from score.note import Message, Rest
+
+    values = dict((name, []) for name, _ in POSITION_COLUMNS + CHORD_COLUMNS)
+    lyrics = {}
+    messages = {}
+    chords = {}
+    time_signatures = {}
+    node = clef.head
+    i = 0
+    while node is not None:
+        value = node.value
+        flags = INHERITS if node._parent is not None else 0
+        number = 0
+        chord_size = 0
+        if isinstance(value, Message):
+            kind = MESSAGE
+            messages[i] = [value.type, value.parameters]
+        elif isinstance(value, Rest):
+            kind = REST
+        elif isinstance(value, Chord):
+            kind = CHORD
+            chord_size = len(value.notes)
+            for note in value.notes:
+                values['chord_number'].append(note.number)
+                values['chord_flags'].append(_spelling_flags(note))
+                for name in CHORD_ATTRIBUTES:
+                    values['chord_' + name].append(_own_value(note, note, '_' + name))
+            if isinstance(value, PopularChord):
+                bass = value.bass.number if value.bass is not None else None
+                chords[i] = ['PopularChord', value.root.number, value.name, bass]
+            elif isinstance(value, RomanNumeral):
+                chords[i] = ['RomanNumeral', value.root.number, value.numeral]
+        else:
+            kind = NOTE
+            number = value.number
+            flags |= _spelling_flags(value)
+        values['kind'].append(kind)
+        values['flags'].append(flags)
+        values['number'].append(number)
+        values['chord_size'].append(chord_size)
+        values['ticks'].append(node.ticks)
+        for name in STORED_ATTRIBUTES:
+            values[name].append(_own_value(node, value, '_' + name))
+        lyric = node.lyric
+        if lyric is not None:
+            lyrics[i] = lyric
+        time_signature = _own_attribute(node, value, '_time_signature')
+        if time_signature is not None:
+            time_signatures[i] = time_signature.value
+        node = node.next
+        i += 1
+    header = _object_header(clef)
+    header.update({'name': clef.name, 'inherits': clef._parent is not None,
+                   'length': i, 'chord_length': len(values['chord_number']),
+                   'lyrics': lyrics, 'messages': messages, 'chords': chords,
+                   'time_signatures': time_signatures})
+    return header, values
+
+
+def _map_columns(view, start, header, position_columns):
+    import numpy as np
+
+    columns = {}
+    for name, dtype in position_columns + CHORD_COLUMNS:
+        count = header['length'] if (name, dtype) in position_columns \
+            else header['chord_length']
+        offset = start + header['columns'][name]
+        end = offset + count * np.dtype(dtype).itemsize
+        if end > len(view):
+            raise NativeFormatException('Truncated native score: column {} of clef '
+                                        '{} ends at byte {}, past the end of the '
+                                        'data at byte {}'
+                                        ''.format(name, header['name'], end, len(view)))
+        columns[name] = np.frombuffer(view, dtype=dtype, count=count, offset=offset)
+    return columns
+
+
+def _object_header(obj):
+    """Attributes a score, staff or clef sets itself, and its public
+    attributes such as a copyright
+    """
+    time_signature = obj._time_signature
+    return {
+        'time_signature': time_signature.value if time_signature else None,
+        'tempo': obj._tempo,
+        'volume': obj._volume,
+        'attack_velocity': obj._attack_velocity,
+        'release_velocity': obj._release_velocity,
+        'instrument': [obj.instrument.number, obj.instrument.is_percussion],
+        'extra': dict((key, value) for key, value in vars(obj).items()
+                      if not key.startswith('_') and
+                      isinstance(value, (str, int, float, bool)))
+    }
+
+
+def _apply_header(obj, header, instrument_class):
+    for name in ('time_signature',) + STORED_ATTRIBUTES:
+        if header[name] is not None:
+            setattr(obj, name, header[name])
+    obj._instrument = instrument_class.from_number(*header['instrument'])
+    for key, value in header['extra'].items():
+        setattr(obj, key, value)
+
+
+def _own_attribute(node, value, attribute):
+    # The attribute a node sets itself, or its placed value
+    own = getattr(node, attribute)
+    if own is None and value is not node:
+        own = getattr(value, attribute)
+    return own
+
+
+def _own_value(node, value, attribute):
+    own = _own_attribute(node, value, attribute)
+    return -1 if own is None else own
+
+
+def _set_attributes(obj, values, index, names, prefix=''):
+    for name in names:
+        value = values[prefix + name][index]
+        if value != -1 and value != getattr(obj, '_' + name):
+            setattr(obj, name, value)
+
+
+def _spelling_flags(note):
+    names = config.PITCHCLASS_NOTENAMES[note.number % 12]
+    return names.index(note.pitch) << SPELLING_SHIFT if note.pitch in names else 0
+
+
+def _spell(note, flags):
+    spelling = flags >> SPELLING_SHIFT
+    if spelling:
+        note.spell(config.PITCHCLASS_NOTENAMES[note.number % 12][spelling])
+
+
+def main():
+    pass
+
+
+if __name__ == '__main__':
+    main()
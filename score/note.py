@@ -1,32 +1,135 @@
-import logging.config
+import math
+import numbers
+import operator
 import re
+import weakref
 
-from score.base import ScoreMusicObject, NoteException
+from score.base import ScoreMusicObject, NoteException, get_logger
 from score.config import config
-from score.config.controllers_data import MIDI_CONTROLLERS
 from score.instrument import Instrument
 from score.time_signature import TimeSignature
 
-logging.config.dictConfig(config.LOGGING_CONFIG)
+# Spellings that sanitize_name replaces with their enharmonic
+NON_STANDARD_PITCHES = ('E#', 'B#', 'F-', 'C-')
+
+TICKS_PER_QUARTER = config.TICKS_PER_QUARTER
+
+
+def ticks_denominator(ticks):
+    """Denominator of a duration in ticks, as a fraction of a quarter
+    note
+    """
+    return TICKS_PER_QUARTER // math.gcd(ticks, TICKS_PER_QUARTER)
+
+
+def common_denominator(denominator, ticks):
+    """Least common multiple of denominator and the denominator of a
+    duration in ticks
+    """
+    other = ticks_denominator(ticks)
+    return denominator * other // math.gcd(denominator, other)
+
+
+# Note.number_spelling of every note number built so far
+_number_spellings = {}
+
+
+# Attributes that music objects leave unset, to be resolved through their
+# parents (note, chord, clef, staff, score), and their values at the top
+INHERITED_DEFAULTS = {
+    'time_signature': TimeSignature('4/4'),
+    'tempo': 120,
+    'volume': 64,
+    'attack_velocity': config.AVE_ATTACK_VEL,
+    'release_velocity': config.AVE_RELEASE_VEL
+}
 
 
 class MusicObject(ScoreMusicObject):
+    """Base of notes, clefs, staves and scores. Time signature, tempo,
+    volume and velocities are only stored when set on the object itself.
+    Otherwise they are those of its parent, or INHERITED_DEFAULTS. A
+    parent that goes away leaves its children a stand-in to resolve them
+    through, see ParentLink
+    """
 
-    def __init__(self, time_signature=TimeSignature('4/4')):
-        self._time_signature = None
-        self._tempo = 120
-        self._volume = 64
-        self._instrument = Instrument()
-        self._attack_velocity = config.AVE_ATTACK_VEL
-        self._release_velocity = config.AVE_RELEASE_VEL
+    __slots__ = ('_time_signature', '_tempo', '_volume', '_instrument',
+                 '_attack_velocity', '_release_velocity')
 
-        self.time_signature = time_signature
+    # Bumped whenever an attribute that children resolve changes, so that
+    # cached resolutions can be recognised as stale
+    _generation = 0
+
+    def __init__(self, time_signature=None):
+        self._time_signature = None
+        self._tempo = None
+        self._volume = None
+        self._instrument = Instrument.shared()
+        self._attack_velocity = None
+        self._release_velocity = None
+
+        if time_signature is not None:
+            self.time_signature = time_signature
         super(MusicObject, self).__init__()
 
     def _set_head(self, head):
         self.validate_type(head, NoteBase)
         super(MusicObject, self)._set_head(head)
 
+    def _orphan_children(self):
+        """Called by the objects that have children as they go away, see
+        ParentLink. Notes, rests and messages have none, and spare their
+        removal the call
+        """
+        link = getattr(self, '_link', None)
+        if link is not None:
+            link.stand_in = self._stand_in()
+
+    def _stand_in(self):
+        """An object with the attributes this object sets itself and its
+        parent, to resolve through once this object is gone
+        """
+        stand_in = MusicObject.__new__(MusicObject)
+        stand_in._copy_own_attributes(self)
+        stand_in._parent = self._parent
+        return stand_in
+
+    def _inherited(self, name):
+        link = self._parent
+        if link is None:
+            return INHERITED_DEFAULTS[name]
+        parent = link()
+        if parent is None:
+            parent = link.stand_in
+        return parent._resolved(name)
+
+    def _resolved(self, name):
+        """The value of an inherited attribute, as seen by a child"""
+        return getattr(self, name)
+
+    def _changed(self):
+        MusicObject._generation += 1
+
+    def _validate_change(self):
+        # Notes shared by several placements refuse changes, see NoteBase
+        pass
+
+    def _duration_changed(self):
+        # Called when the duration of a child changed. Clefs count the
+        # durations of their notes, see NoteBase._duration_changed
+        pass
+
+    def _copy_own_attributes(self, obj):
+        """Takes over the attributes obj sets itself, leaving the
+        inherited ones unset
+        """
+        self._time_signature = obj._time_signature
+        self._tempo = obj._tempo
+        self._volume = obj._volume
+        self._instrument = obj._instrument
+        self._attack_velocity = obj._attack_velocity
+        self._release_velocity = obj._release_velocity
+
     @property
     def note_sequence(self):
         objects = []
@@ -38,13 +141,17 @@ class MusicObject(ScoreMusicObject):
                 current = current.next
         return objects
 
+    @property
+    def total_ticks(self):
+        total_ticks = 0
+        for nte in self.note_sequence:
+            total_ticks += nte.ticks
+        return total_ticks
+
     @property
     def total_quarter_length(self):
-        notes = self.note_sequence
-        total_quarter_length = 0
-        for nte in notes:
-            total_quarter_length += nte.quarter_length
-        return total_quarter_length
+        # Summed in ticks, so that long sequences do not drift
+        return self.total_ticks / TICKS_PER_QUARTER
 
     @property
     def instrument(self):
@@ -52,72 +159,131 @@ class MusicObject(ScoreMusicObject):
 
     @instrument.setter
     def instrument(self, instrument):
+        self._validate_change()
         if not isinstance(instrument, Instrument):
-            self._instrument = Instrument(name=instrument)
+            self._instrument = Instrument.shared(instrument)
         else:
             self._instrument = instrument
 
     @property
     def tempo(self):
-        return self._tempo
+        if self._tempo is not None:
+            return self._tempo
+        return self._inherited('tempo')
 
     @tempo.setter
     def tempo(self, tempo):
+        self._validate_change()
         self.validate_type(tempo, int)
         if config.MIN_TEMPO_NUM > tempo or tempo > config.MAX_TEMPO_NUM:
             raise ValueError('Invalid tempo {}'.format(tempo))
         self._tempo = tempo
+        self._changed()
 
     @property
     def volume(self):
-        return self._volume
+        if self._volume is not None:
+            return self._volume
+        return self._inherited('volume')
 
     @volume.setter
     def volume(self, volume):
+        self._validate_change()
         self.validate_type(volume, int)
         if config.MIN_VEL_NUM > volume or volume > config.MAX_VEL_NUM:
             raise ValueError('Invalid volume {}'.format(volume))
         self._volume = volume
+        self._changed()
 
     @property
     def attack_velocity(self):
-        return self._attack_velocity
+        if self._attack_velocity is not None:
+            return self._attack_velocity
+        return self._inherited('attack_velocity')
 
     @attack_velocity.setter
     def attack_velocity(self, vel):
+        self._validate_change()
         self.validate_velocity(vel)
         self._attack_velocity = vel
+        self._changed()
 
     @property
     def release_velocity(self):
-        return self._release_velocity
+        if self._release_velocity is not None:
+            return self._release_velocity
+        return self._inherited('release_velocity')
 
     @release_velocity.setter
     def release_velocity(self, vel):
+        self._validate_change()
         self.validate_velocity(vel)
         self._release_velocity = vel
+        self._changed()
 
     @property
     def time_signature(self):
-        return self._time_signature
+        if self._time_signature is not None:
+            return self._time_signature
+        return self._inherited('time_signature')
 
     @time_signature.setter
     def time_signature(self, time_signature):
+        self._validate_change()
         if not isinstance(time_signature, TimeSignature):
             time_signature = TimeSignature(time_signature)
         self._time_signature = time_signature
+        self._changed()
 
 
 class NoteBase(MusicObject):
+    """Base of the objects of a clef's sequence. Its subclasses define
+    __slots__, so that they carry no instance __dict__. Rarely set fields
+    such as the lyric are kept in a side table.
+
+    A sequence holds its objects through the next links only. Previous
+    objects and parents are weak references, so that a dropped sequence
+    is freed by reference counting without the cyclic garbage collector.
+    The previous object of a note is None once nothing else holds it.
+
+    Durations are stored as an integer number of ticks, TICKS_PER_QUARTER
+    per quarter note, and quarter_length is derived from them. Onsets and
+    totals are sums of ticks, exact however long the sequence.
+
+    An object placed by a Placement is shared, and read-only from then
+    on: changing it raises NoteException. It is changed through the
+    placement, which takes a copy of its own first, see
+    Placement.own_value, or through a copy
+    """
+
+    __slots__ = ('_ticks', '_next', '_prev', '_is_shared')
+
+    # Bumped whenever the duration of an object linked in a sequence but
+    # without a parent changes, so that the durations every clef counts
+    # can be recognised as stale. Objects with a parent tell their clef
+    # only, see _duration_changed
+    _duration_generation = 0
 
     def __init__(self, quarter_length=1.0):
-        self._quarter_length = None
-        self._lyric = None
+        self._is_shared = False
+        self._ticks = None
         self._next = None
         self._prev = None
-        self.quarter_length = quarter_length
         super(NoteBase, self).__init__()
-        self._set_head(self)
+        self.quarter_length = quarter_length
+
+    def _changed(self):
+        # Resolutions are only cached for clefs, and never of notes
+        pass
+
+    def _share(self):
+        self._is_shared = True
+
+    def _validate_change(self):
+        if self._is_shared:
+            raise NoteException('{} is shared by placements and cannot be changed. '
+                                'Change it through a placement, or change a copy '
+                                'instead'.format(self))
 
     def reset_position(self):
         self._next = None
@@ -125,28 +291,81 @@ class NoteBase(MusicObject):
 
     def set_prev(self, prev_item):
         self.validate_type(prev_item, NoteBase)
-        self._prev = prev_item
+        self._prev = weakref.ref(prev_item)
+
+    def copy(self):
+        """A copy with the same fields, outside of any sequence and
+        without a parent
+        """
+        obj = type(self).__new__(type(self))
+        for cls in type(self).__mro__:
+            for slot in cls.__dict__.get('__slots__', ()):
+                if slot == '__weakref__':
+                    continue
+                descriptor = cls.__dict__[slot]
+                try:
+                    descriptor.__set__(obj, descriptor.__get__(self))
+                except AttributeError:
+                    pass
+        obj._next = None
+        obj._prev = None
+        obj._parent = None
+        obj._link = None
+        obj._is_shared = False
+        lyric = self._get_side('lyric')
+        if lyric is not None:
+            obj._set_side('lyric', lyric)
+        return obj
+
+    @staticmethod
+    def to_ticks(quarter_length):
+        """Ticks of a quarter length given as an int, float or Fraction.
+        Floats are rounded to the nearest tick, so that a third written as
+        0.333... is an exact third
+        """
+        ScoreMusicObject.validate_type(quarter_length, numbers.Real)
+        if quarter_length < 0:
+            raise ValueError('Quarter length should be positive')
+        return int(round(quarter_length * TICKS_PER_QUARTER))
+
+    @property
+    def ticks(self):
+        return self._ticks
+
+    @ticks.setter
+    def ticks(self, ticks):
+        self._validate_change()
+        self.validate_type(ticks, numbers.Integral)
+        if ticks < 0:
+            raise ValueError('Ticks should be positive')
+        self._ticks = int(ticks)
+        self._duration_changed()
+
+    def _duration_changed(self):
+        if self.is_placed:
+            parent = self.parent
+            if parent is None:
+                NoteBase._duration_generation += 1
+            else:
+                parent._duration_changed()
 
     @property
     def quarter_length(self):
-        return self._quarter_length
+        return self._ticks / TICKS_PER_QUARTER
 
     @quarter_length.setter
     def quarter_length(self, length):
-        self.validate_type(length, (int, float))
-        if length < 0:
-            raise ValueError('Quarter length should be positive')
-        else:
-            self._quarter_length = float(length)
+        self.ticks = self.to_ticks(length)
 
     @property
     def lyric(self):
-        return self._lyric
+        return self._get_side('lyric')
 
     @lyric.setter
     def lyric(self, lyric):
+        self._validate_change()
         self.validate_type(lyric, str)
-        self._lyric = lyric
+        self._set_side('lyric', lyric)
 
     @property
     def next(self):
@@ -160,12 +379,244 @@ class NoteBase(MusicObject):
 
     @property
     def prev(self):
-        return self._prev
+        if self._prev is None:
+            return None
+        return self._prev()
+
+    @property
+    def value(self):
+        """The note, chord, rest or message at this position of a
+        sequence
+        """
+        return self
+
+    @property
+    def is_shared(self):
+        return self._is_shared
+
+    @property
+    def is_placed(self):
+        """Whether the object is linked into a sequence or belongs to a
+        parent, in which case a clef places it again through a Placement
+        """
+        return self._prev is not None or self._next is not None or \
+            self._parent is not None
+
+    @property
+    def head(self):
+        # A note heads the sequence that starts at it
+        return self
+
+    @property
+    def current(self):
+        return self
+
+
+def _value_field(name):
+    """A placement property for a field of its value, read from the
+    value and set on the placement's own copy of it
+    """
+    def set_field(placement, value):
+        setattr(placement.own_value(), name, value)
+    return property(operator.attrgetter('_value.' + name), set_field)
+
+
+class Placement(NoteBase):
+    """A position of a shared note, chord, rest or message in a sequence,
+    so that the same object can be placed in many clefs and repeats.
+
+    The placement carries the sequence links, and optionally a quarter
+    length and inherited attributes of its own. Anything else is read
+    from the value, which placing makes shared and read-only. Setting
+    the input, name, root, bass, numeral, type or parameters of a
+    placement, or changing own_value(), changes a copy of the value that
+    is the placement's own. Unset inherited attributes are those of the
+    value, then those of the placement's parent
+
+    Example:
+    >>> motif = Note('C')
+    >>> clef.add_note(motif)
+    >>> clef.add_note(motif, quarter_length=2.0)
+    >>> clef.head.next.value is motif
+    True
+    """
+
+    __slots__ = ('_value', '_source')
+
+    input = _value_field('input')
+    name = _value_field('name')
+    root = _value_field('root')
+    bass = _value_field('bass')
+    numeral = _value_field('numeral')
+    type = _value_field('type')
+    parameters = _value_field('parameters')
+
+    def __init__(self, value, quarter_length=None):
+        self.validate_type(value, NoteBase)
+        # Set here, so that it is not looked up on the value
+        self._link = None
+        self._value = value.value
+        self._value._share()
+        # Set while the placements that follow this one in a cloned
+        # sequence are still to be created, see Clef.clone
+        self._source = None
+        super(Placement, self).__init__(quarter_length=quarter_length)
+        if isinstance(value, Placement):
+            # Placing a placement again keeps what it sets itself
+            self._copy_own_attributes(value)
+            if quarter_length is None:
+                self._ticks = value._ticks
+            lyric = value._get_side('lyric')
+            if lyric is not None:
+                self._set_side('lyric', lyric)
+
+    def __del__(self):
+        self._orphan_children()
+
+    def __getattr__(self, name):
+        # Only called for attributes the placement does not have itself
+        if name in Placement.__slots__:
+            raise AttributeError(name)
+        return getattr(self._value, name)
+
+    def own_value(self):
+        """The value of this placement only, which can be changed: a shared
+        value is first replaced by a copy, parented to the placement
+        """
+        if self._value._is_shared:
+            self._value = self._value.copy()
+            self._value._set_parent(self)
+        return self._value
+
+    def copy(self):
+        placement = super(Placement, self).copy()
+        placement._source = None
+        placement._value._share()
+        return placement
+
+    def __str__(self):
+        return 'Placement of {}'.format(self._value)
+
+    def __repr__(self):
+        return 'Placement of {!r}'.format(self._value)
+
+    def _stand_in(self):
+        stand_in = super(Placement, self)._stand_in()
+        for name in INHERITED_DEFAULTS:
+            if getattr(stand_in, '_' + name) is None:
+                setattr(stand_in, '_' + name, getattr(self._value, '_' + name))
+        return stand_in
+
+    def _inherited(self, name):
+        override = getattr(self._value, '_' + name)
+        if override is not None:
+            return override
+        return super(Placement, self)._inherited(name)
+
+    def _place_next(self):
+        source, end_source, end, parent = self._source
+        following = source.next
+        if following is None or following is end_source:
+            self.next = end
+            return
+        placement = Placement(following)
+        if following._parent is not None:
+            placement._parent = parent
+        placement._source = (following, end_source, end, parent)
+        placement._prev = weakref.ref(self)
+        self._next = placement
+        self._source = None
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        """Places another note, chord, rest or message here, leaving the
+        previous value untouched
+        """
+        self.validate_type(value, NoteBase)
+        self._value = value.value
+        self._value._share()
+        if self._ticks is None:
+            self._duration_changed()
+
+    @property
+    def next(self):
+        # The placements of a cloned sequence are created as it is walked
+        if self._next is None and self._source is not None:
+            self._place_next()
+        return self._next
+
+    @next.setter
+    def next(self, next_item):
+        self._source = None
+        NoteBase.next.fset(self, next_item)
+
+    @property
+    def ticks(self):
+        if self._ticks is not None:
+            return self._ticks
+        return self._value.ticks
+
+    @ticks.setter
+    def ticks(self, ticks):
+        if ticks is None:
+            if self._ticks is not None:
+                self._ticks = None
+                self._duration_changed()
+        else:
+            NoteBase.ticks.fset(self, ticks)
+
+    @property
+    def quarter_length(self):
+        return self.ticks / TICKS_PER_QUARTER
+
+    @quarter_length.setter
+    def quarter_length(self, length):
+        self.ticks = None if length is None else self.to_ticks(length)
+
+    @property
+    def notes(self):
+        """Placements of the notes of a placed chord, parented to this
+        placement, so that the attributes the notes do not set resolve
+        through this placement rather than through the chord's first
+        sequence. They are created once and kept while the value holds
+        the same notes
+        """
+        notes = self._value.notes
+        views = self._get_side('notes')
+        if views is None or len(views) != len(notes) or \
+                any(view._value is not note for view, note in zip(views, notes)):
+            parent = self._child_link()
+            views = []
+            for note in notes:
+                view = Placement(note)
+                view._parent = parent
+                views.append(view)
+            self._set_side('notes', views)
+        return views
+
+    @property
+    def lyric(self):
+        lyric = self._get_side('lyric')
+        if lyric is None:
+            return self._value.lyric
+        return lyric
+
+    @lyric.setter
+    def lyric(self, lyric):
+        self.validate_type(lyric, str)
+        self._set_side('lyric', lyric)
 
 
 class Message(NoteBase):
 
+    __slots__ = ('_type', '_parameters')
+
     def __init__(self, msg_type, **parameters):
+        self._is_shared = False
         self._type = None
         self._parameters = None
 
@@ -182,6 +633,7 @@ class Message(NoteBase):
 
     @parameters.setter
     def parameters(self, parameters):
+        self._validate_change()
         self._parameters = parameters
 
     @property
@@ -190,6 +642,7 @@ class Message(NoteBase):
 
     @type.setter
     def type(self, msg_type):
+        self._validate_change()
         self.validate_type(msg_type, str)
         if msg_type == 'control_change':
             control = self._parameters.get('control', None)
@@ -205,7 +658,13 @@ class Message(NoteBase):
             pass
         self._type = msg_type
 
+    def copy(self):
+        message = super(Message, self).copy()
+        message._parameters = dict(self._parameters)
+        return message
+
     def validate_control(self, control, value):
+        from score.config.controllers_data import MIDI_CONTROLLERS
         if not self.contains(control, MIDI_CONTROLLERS.keys()):
             raise ValueError('Invalid control {}'.format(control))
         if not self.contains(value, MIDI_CONTROLLERS[control][1]):
@@ -215,15 +674,17 @@ class Message(NoteBase):
 
 class Note(NoteBase):
 
+    __slots__ = ('_name', '_number', '_octave', '_pitch', '_input',
+                 '_enharmonic', '_note_input')
+
     def __init__(self, note_input, quarter_length=1.0):
+        self._is_shared = False
         self._name = None
         self._number = None
         self._octave = None
         self._pitch = None
         self._input = None
         self._enharmonic = None
-        self._attack_velocity = config.AVE_ATTACK_VEL
-        self._release_velocity = config.AVE_RELEASE_VEL
 
         self.input = note_input
         super(Note, self).__init__(quarter_length=quarter_length)
@@ -245,26 +706,101 @@ class Note(NoteBase):
         return nte
 
     def closest_note_forward(self, letter):
-        nte_num = self.number + 1
-        while nte_num <= config.MAX_NOTE_NUM:
-            nte = Note(nte_num)
-            names = [self.strip_digits(nte.name)]
-            if nte.enharmonic:
-                names.append(self.strip_digits(nte.enharmonic))
-            if letter in names:
-                return nte
-            nte_num += 1
+        number = self.next_number(self.number, letter, forward=True)
+        if number is not None:
+            return Note(number)
 
     def closest_note_backward(self, letter):
-        nte_num = self.number - 1
-        while nte_num >= config.MIN_NOTE_NUM:
-            nte = Note(nte_num)
-            names = [self.strip_digits(nte.name)]
-            if nte.enharmonic:
-                names.append(self.strip_digits(nte.enharmonic))
-            if letter in names:
-                return nte
-            nte_num -= 1
+        number = self.next_number(self.number, letter, forward=False)
+        if number is not None:
+            return Note(number)
+
+    @staticmethod
+    def next_number(number, pitch, forward=True):
+        """Closest note number strictly above (or below) number whose
+        pitch is the given pitch name, e.g. 'F#' or 'G-', or pitch class.
+        Returns None if there is none within the midi range
+        """
+        if not isinstance(pitch, int):
+            pitch = config.NOTENAMES_PITCHCLASS.get(pitch)
+            if pitch is None:
+                return None
+        if forward:
+            number += (pitch - number) % 12 or 12
+            return number if number <= config.MAX_NOTE_NUM else None
+        number -= (number - pitch) % 12 or 12
+        return number if number >= config.MIN_NOTE_NUM else None
+
+    @staticmethod
+    def closest_notes(numbers, letters, forward=True):
+        """Batch closest_note over numpy arrays. letters holds pitch
+        names or pitch classes, one per number. Returns an array of note
+        numbers, with -1 where a pitch name is invalid
+        """
+        import numpy as np
+
+        numbers = np.asarray(numbers, dtype=np.int64)
+        letters = np.asarray(letters)
+        if letters.dtype.kind in 'iu':
+            pitch_classes = letters.astype(np.int64)
+        else:
+            pitch_classes = np.array([config.NOTENAMES_PITCHCLASS.get(letter, -1)
+                                      for letter in letters.ravel()],
+                                     dtype=np.int64).reshape(letters.shape)
+        numbers, pitch_classes = np.broadcast_arrays(numbers, pitch_classes)
+        up = (pitch_classes - numbers) % 12
+        up[up == 0] = 12
+        down = (numbers - pitch_classes) % 12
+        down[down == 0] = 12
+        above = numbers + up
+        below = numbers - down
+        if forward:
+            closest = np.where(above <= config.MAX_NOTE_NUM, above, below)
+        else:
+            closest = np.where(below >= config.MIN_NOTE_NUM, below, above)
+        return np.where(pitch_classes >= 0, closest, -1)
+
+    def spell(self, pitch):
+        """Spells the note as pitch (e.g. 'C#' or 'D-'), which must be a
+        standard name of the note's pitch class. The number is unchanged
+        """
+        names = config.PITCHCLASS_NOTENAMES[self._number % 12]
+        if pitch not in names or pitch in NON_STANDARD_PITCHES:
+            raise NoteException('{} is not a spelling of {}'.format(pitch, self._name))
+        if pitch == self._pitch:
+            return
+        self._validate_change()
+        octave = str(self._octave)
+        self._enharmonic = None
+        for name in names:
+            if name != pitch:
+                self._enharmonic = name + octave
+        self._name = pitch + octave
+        self._pitch = pitch
+
+    def _share(self):
+        # The notes of a chord are shared with it
+        if self._is_shared:
+            return
+        parent = self.parent
+        if isinstance(parent, NoteBase) and not isinstance(parent, Placement):
+            parent._share()
+        else:
+            self._is_shared = True
+
+    @classmethod
+    def number_spelling(cls, number):
+        """(name, enharmonic, octave, pitch) of a note number, computed
+        once per number
+        """
+        spelling = _number_spellings.get(number)
+        if spelling is None:
+            name = cls.number_to_name(number)
+            spelling = (name, cls.enharmonic_from_name(name),
+                        cls.octave_from_number(number),
+                        cls.pitch_from_number(number))
+            _number_spellings[number] = spelling
+        return spelling
 
     @property
     def name(self):
@@ -292,6 +828,7 @@ class Note(NoteBase):
 
     @input.setter
     def input(self, note_input):
+        self._validate_change()
         if self.is_note(note_input):
             if self.is_note_name(note_input):
                 self._note_input = note_input
@@ -303,10 +840,8 @@ class Note(NoteBase):
             elif self.is_note_num(note_input):
                 self._note_input = note_input
                 self._number = note_input
-                self._name = self.number_to_name(note_input)
-                self._enharmonic = self.enharmonic_from_name(self._name)
-                self._octave = self.octave_from_number(note_input)
-                self._pitch = self.pitch_from_number(note_input)
+                self._name, self._enharmonic, self._octave, self._pitch = \
+                    self.number_spelling(note_input)
             self._input = note_input
         else:
             raise NoteException('Invalid note {0}'.format(note_input))
@@ -332,24 +867,6 @@ class Note(NoteBase):
         fn = 440.00 * 1.0594630943592953 ** (self.number - 57)
         return int(fn * 100 + .5) / 100.0  # Round to first two decimals
 
-    @property
-    def attack_velocity(self):
-        return self._attack_velocity
-
-    @attack_velocity.setter
-    def attack_velocity(self, vel):
-        self.validate_velocity(vel)
-        self._attack_velocity = vel
-
-    @property
-    def release_velocity(self):
-        return self._release_velocity
-
-    @release_velocity.setter
-    def release_velocity(self, vel):
-        self.validate_velocity(vel)
-        self._release_velocity = vel
-
     @classmethod
     def letter_from_number(cls, num):
         pitch = cls.pitch_from_number(num)
@@ -366,9 +883,9 @@ class Note(NoteBase):
         }
         for n in bad_names:
             if n in name:
-                logging.warning('The note name {0} is not a standard note name. '
-                                'It will be replaced with its valid equivalent '
-                                ''.format(name))
+                get_logger(__name__).warning('The note name {0} is not a standard note name. '
+                                             'It will be replaced with its valid equivalent '
+                                             ''.format(name))
                 name = name.replace(n, bad_names[n])
                 base_num = cls.get_base_note_number(name)
                 base_name = config.PITCHCLASS_NOTENAMES[base_num][0]
@@ -394,6 +911,8 @@ class Note(NoteBase):
 
     @staticmethod
     def is_note_instance(note):
+        if isinstance(note, NoteBase):
+            note = note.value
         return isinstance(note, Note)
 
     @classmethod
@@ -568,6 +1087,8 @@ class Note(NoteBase):
 
 class Rest(NoteBase):
 
+    __slots__ = ('number',)
+
     def __init__(self, quarter_length=1.0):
         self.number = 60  # random
         super(Rest, self).__init__(quarter_length=quarter_length)
@@ -575,7 +1096,7 @@ class Rest(NoteBase):
         self.release_velocity = 0
 
     def __str__(self):
-        return 'Rest {}'.format(self._quarter_length)
+        return 'Rest {}'.format(self.quarter_length)
 
 
 def main():
@@ -1,13 +1,39 @@
-from score.base import ScaleException
+import collections
+
+from score.base import ScoreObject, ScaleException
 from score.config import config
 from score.note import Note, MusicObject
 
 
+def rotate_intervals(intervals, degree):
+    """Intervals of the scale that starts on the given degree of the
+    scale with the given intervals
+    """
+    start = intervals[degree]
+    size = len(intervals)
+    return [(intervals[(degree + i) % size] - start) % 12
+            for i in range(0, size)]
+
+
+IONIAN_INTERVALS = [0, 2, 4, 5, 7, 9, 11]
+
+MODE_NAMES = ['ionian', 'dorian', 'phrygian', 'lydian', 'mixolydian',
+              'aeolian', 'locrian']
+
+# Intervals of the modes of the diatonic scale, in order of the degree of
+# the ionian mode they start on
+DIATONIC_MODES = collections.OrderedDict(
+    (name, rotate_intervals(IONIAN_INTERVALS, degree))
+    for degree, name in enumerate(MODE_NAMES))
+
+
 class ScaleBase(MusicObject):
 
     def __init__(self, tonic, intervals=[0, 2, 4, 5, 7, 9, 11]):
         self._tonic = None
         self._intervals = None
+        self._pitch_classes = None
+        self._degree_table = None
 
         super(ScaleBase, self).__init__()
         self.intervals = intervals
@@ -41,37 +67,114 @@ class ScaleBase(MusicObject):
         for i in self._intervals[1:]:
             current.next = Note(self._tonic.number + i)
             current = current.next
+        self._update_degree_table()
+
+    def _update_degree_table(self):
+        tonic_pitch_class = self._tonic.number % 12
+        self._pitch_classes = [(tonic_pitch_class + i) % 12
+                               for i in self._intervals]
+        self._degree_table = [None] * 12
+        for degree, pitch_class in enumerate(self._pitch_classes):
+            self._degree_table[pitch_class] = degree
+
+    def degree_of(self, note):
+        """Index of the note's pitch class in the scale (0 for the
+        tonic), or None if the pitch class is not part of the scale
+        """
+        return self._degree_table[self.note_number(note) % 12]
+
+    def note_at_degree(self, degree, octave=4):
+        """Note number of the given degree counted from the tonic of
+        the given octave. Degrees beyond the last note of the scale, or
+        negative degrees, continue into the octaves above or below
+        """
+        octaves, index = divmod(degree, len(self._intervals))
+        tonic_number = octave * 12 + self._tonic.number % 12
+        return tonic_number + octaves * 12 + self._intervals[index]
 
     def leap(self, note, leap, forward=True):
-        has_pitch, idx = self.has_pitch(note)
-        if not has_pitch:
-            raise ScaleException('The note {} is not part of the scale'.format(note))
-
         if leap == 0:
+            if not isinstance(note, Note):
+                note = Note(note)
+            if self.degree_of(note) is None:
+                raise ScaleException('The note {} is not part of the scale'.format(note))
             return note
-
-        note_list = self.note_sequence
-        note_list = note_list[idx:] + note_list[:idx]
-
+        return Note(self.leap_number(note, leap, forward=forward))
+
+    def leap_number(self, note, leap, forward=True):
+        """Note number of the degree leap steps forward (or backward)
+        along the scale from note. As with Note.closest_note, the result
+        is the closest note above note with the pitch of that degree, or
+        the closest one below when there is none in the midi range
+        """
+        number = self.note_number(note)
+        pitch_class = number % 12
+        degree = self._degree_table[pitch_class]
+        if degree is None:
+            raise ScaleException('The note {} is not part of the scale'.format(note))
+        if leap == 0:
+            return number
         if not forward:
-            note_list.reverse()
-            note_list = [note_list[-1]] + note_list[:-1]
-
-        quot, next_idx = divmod(leap, len(note_list))
-        next_note = note_list[next_idx]
-
-        return note.closest_note(Note.strip_digits(next_note.name))
+            leap = -leap
+        target = self._pitch_classes[(degree + leap) % len(self._pitch_classes)]
+        closest = Note.next_number(number, target, forward=True)
+        if closest is None:
+            closest = Note.next_number(number, target, forward=False)
+        return closest
+
+    def notes_at_degrees(self, degrees, octave=4):
+        """Vectorised note_at_degree over an array of degrees. Returns
+        a numpy array of note numbers
+        """
+        import numpy as np
+
+        degrees = np.asarray(degrees, dtype=np.int64)
+        octaves, indices = np.divmod(degrees, len(self._intervals))
+        intervals = np.array(self._intervals, dtype=np.int64)
+        tonic_number = octave * 12 + self._tonic.number % 12
+        return tonic_number + octaves * 12 + intervals[indices]
+
+    def leap_numbers(self, numbers, leap, forward=True):
+        """Vectorised leap_number over an array of note numbers. Returns
+        a numpy array of note numbers
+        """
+        import numpy as np
+
+        numbers = np.asarray(numbers, dtype=np.int64)
+        pitch_classes = numbers % 12
+        table = np.array([-1 if d is None else d for d in self._degree_table])
+        degrees = table[pitch_classes]
+        if (degrees < 0).any():
+            raise ScaleException('Not all notes are part of the scale')
+        if leap == 0:
+            return numbers.copy()
+        if not forward:
+            leap = -leap
+        scale = np.array(self._pitch_classes, dtype=np.int64)
+        targets = scale[(degrees + leap) % len(scale)]
+        return Note.closest_notes(numbers, targets, forward=True)
 
     def has_pitch(self, note):
         if not isinstance(note, Note):
             note = Note(note)
-        for i in range(0, len(self.note_sequence)):
-            nte = self.note_sequence[i]
+        note_sequence = self.note_sequence
+        for i in range(0, len(note_sequence)):
+            nte = note_sequence[i]
             if Note.are_equal(nte, note) or \
                     Note.strip_digits(nte.name) == Note.strip_digits(note.name):
                 return True, i
         return False, None
 
+    @staticmethod
+    def note_number(note):
+        if isinstance(note, Note):
+            return note.number
+        if Note.is_note_num(note):
+            return note
+        if Note.is_note_name(note):
+            return Note.name_to_number(note)
+        raise ValueError('Invalid note {}'.format(note))
+
     @property
     def is_major_scale(self):
         return self._intervals == [0, 2, 4, 5, 7, 9, 11]
@@ -209,17 +312,19 @@ class MinorScale(Scale):
                                          scale_type=_scale_type)
 
 
-class DiatonicScale(object):
+class DiatonicScale(ScoreObject):
+    """The seven modes of the diatonic scale on an ionian tonic. A mode is
+    built the first time it is read and is shared by every DiatonicScale
+    on the same tonic note number and spelling, so modes must not be
+    mutated. Modes never hold the caller's tonic Note, but a copy of it
+    """
+
+    _modes = {}
 
     def __init__(self, ionian_tonic):
-        self._ionian_mode = None
-        self._dorian_mode = None
-        self._phrygian_mode = None
-        self._lydian_mode = None
-        self._mixolydian_mode = None
-        self._aeolian_mode = None
-        self._locrian_mode = None
         self._ionian_tonic = None
+        self._tonic_key = None
+        self._tonic_number = None
 
         self.ionian_tonic = ionian_tonic
 
@@ -232,68 +337,69 @@ class DiatonicScale(object):
 
     @ionian_tonic.setter
     def ionian_tonic(self, ionian_tonic):
-        self._update_modes(ionian_tonic)
+        try:
+            self._tonic_number = ScaleBase.note_number(ionian_tonic)
+        except ValueError:
+            raise ValueError('Invalid note {}'.format(ionian_tonic))
+        if Note.is_note_instance(ionian_tonic):
+            name = ionian_tonic.name
+        else:
+            name = Note(ionian_tonic).name
+        self._tonic_key = (self._tonic_number, name)
         self._ionian_tonic = ionian_tonic
 
-    def _update_modes(self, ionian_tonic):
-        # degree_intervals = [2, 2, 1, 2, 2, 2, 1]
-        ionian_intervals = [0, 2, 4, 5, 7, 9, 11]
-        self._ionian_mode = ScaleBase(ionian_tonic,
-                                      intervals=ionian_intervals)
-        ionian_notes = self._ionian_mode.note_sequence
-
-        dorian_intervals = [0, 2, 3, 5, 7, 9, 10]
-        dorian_tonic = ionian_notes[1].name
-        self._dorian_mode = ScaleBase(dorian_tonic,
-                                      intervals=dorian_intervals)
-        phrygian_intervals = [0, 1, 3, 5, 7, 8, 10]
-        phrygian_tonic = ionian_notes[2].name
-        self._phrygian_mode = ScaleBase(phrygian_tonic,
-                                        intervals=phrygian_intervals)
-        lydian_intervals = [0, 2, 4, 6, 7, 9, 11]
-        lydian_tonic = ionian_notes[3].name
-        self._lydian_mode = ScaleBase(lydian_tonic,
-                                      intervals=lydian_intervals)
-        mixolydian_intervals = [0, 2, 4, 5, 7, 9, 10]
-        mixolydian_tonic = ionian_notes[4].name
-        self._mixolydian_mode = ScaleBase(mixolydian_tonic,
-                                          intervals=mixolydian_intervals)
-        aeolian_intervals = [0, 2, 3, 5, 7, 8, 10]
-        aeolian_tonic = ionian_notes[5].name
-        self._aeolian_mode = ScaleBase(aeolian_tonic,
-                                       intervals=aeolian_intervals)
-        locrian_intervals = [0, 1, 3, 5, 6, 8, 10]
-        locrian_tonic = ionian_notes[6].name
-        self._locrian_mode = ScaleBase(locrian_tonic,
-                                       intervals=locrian_intervals)
+    def mode(self, mode):
+        """Returns a mode by name, e.g. 'dorian', or by the degree of the
+        ionian mode it starts on
+        """
+        degree = mode
+        if isinstance(mode, str):
+            if mode not in MODE_NAMES:
+                raise ScaleException('Invalid diatonic mode {}'.format(mode))
+            degree = MODE_NAMES.index(mode)
+        self.validate_type(degree, int)
+        if degree not in range(0, len(MODE_NAMES)):
+            raise ScaleException('Invalid diatonic mode {}'.format(mode))
+        key = (self._tonic_key, degree)
+        scale = self._modes.get(key)
+        if scale is None:
+            if degree == 0:
+                # A new note, with the spelling of the ionian tonic
+                tonic = Note(self._tonic_key[1])
+            else:
+                tonic = self._tonic_number + IONIAN_INTERVALS[degree]
+            scale = ScaleBase(tonic,
+                              intervals=list(DIATONIC_MODES[MODE_NAMES[degree]]))
+            self._modes[key] = scale
+        return scale
 
     @property
     def ionian_mode(self):
-        return self._ionian_mode
+        return self.mode(0)
 
     @property
     def dorian_mode(self):
-        return self._dorian_mode
+        return self.mode(1)
 
     @property
     def phrygian_mode(self):
-        return self._phrygian_mode
+        return self.mode(2)
 
     @property
     def lydian_mode(self):
-        return self._lydian_mode
+        return self.mode(3)
 
     @property
     def mixolydian_mode(self):
-        return self._mixolydian_mode
+        return self.mode(4)
 
     @property
     def aeolian_mode(self):
-        return self._aeolian_mode
+        return self.mode(5)
 
     @property
     def locrian_mode(self):
-        return self._locrian_mode
+        return self.mode(6)
 
 
 class ChromaticScale(Scale):
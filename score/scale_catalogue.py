@@ -0,0 +1,110 @@
+"""
+Catalogue of scale shapes on every tonic, searchable by pitch content
+"""
+from score.base import ScaleException, ScoreObject, pitch_class_mask
+from score.config import config
+from score.scale import ScaleBase, DIATONIC_MODES
+
+# Number of set bits of every 12 bit pitch class mask
+POPCOUNT = [bin(mask).count('1') for mask in range(0, 1 << 12)]
+
+
+class ScaleCatalogue(ScoreObject):
+    """Every registered scale shape on each of the 12 tonics, stored as
+    pitch class masks. Shapes are the default intervals of
+    config.SCALE_PROPS and the diatonic modes, plus any interval set
+    added with register.
+
+    For each pitch class the catalogue keeps an integer whose bit i is
+    set when scale i contains that pitch class. The scales containing a
+    set of pitches are then the bitwise and of a few integers.
+
+    Example:
+    >>> catalogue = ScaleCatalogue()
+    >>> ('ionian', 7) in catalogue.containing(['F#', 'B', 'D'])
+    True
+    """
+    def __init__(self):
+        self._scales = []
+        self._masks = []
+        self._names = {}
+        self._index = [0] * 12
+
+        for scale_type in config.SCALE_PROPS:
+            self.register(scale_type, config.SCALE_PROPS[scale_type][1])
+        for mode in DIATONIC_MODES:
+            self.register(mode, DIATONIC_MODES[mode])
+
+    def __len__(self):
+        return len(self._scales)
+
+    def register(self, name, intervals):
+        """Adds the scale shape given by intervals on all 12 tonics"""
+        self.validate_type(name, str)
+        is_interval, reason = ScaleBase.are_scale_intervals(intervals)
+        if not is_interval:
+            raise ScaleException(reason)
+        if self.contains(name, self._names):
+            raise ScaleException('A scale named {} is already registered'
+                                 ''.format(name))
+        self._names[name] = list(intervals)
+        for tonic in range(0, 12):
+            mask = pitch_class_mask(tonic + i for i in intervals)
+            bit = 1 << len(self._scales)
+            self._scales.append((name, tonic))
+            self._masks.append(mask)
+            for pitch_class in range(0, 12):
+                if mask >> pitch_class & 1:
+                    self._index[pitch_class] |= bit
+
+    def containing(self, pitches):
+        """(name, tonic pitch class) of every scale containing all the
+        given pitches, in order of registration
+        """
+        matches = (1 << len(self._scales)) - 1
+        query = self.pitches_mask(pitches)
+        for pitch_class in range(0, 12):
+            if query >> pitch_class & 1:
+                matches &= self._index[pitch_class]
+        scales = []
+        while matches:
+            low_bit = matches & -matches
+            scales.append(self._scales[low_bit.bit_length() - 1])
+            matches ^= low_bit
+        return scales
+
+    def closest(self, pitches, k=5):
+        """The k scales whose pitch classes differ from the given pitches
+        by the fewest pitch classes (Hamming distance of the masks), as
+        (distance, name, tonic pitch class)
+        """
+        query = self.pitches_mask(pitches)
+        distances = [(POPCOUNT[mask ^ query], i)
+                     for i, mask in enumerate(self._masks)]
+        distances.sort()
+        return [(distance,) + self._scales[i] for distance, i in distances[:k]]
+
+    def mask(self, name, tonic):
+        return pitch_class_mask(tonic + i for i in self.intervals(name))
+
+    def intervals(self, name):
+        if not self.contains(name, self._names):
+            raise ScaleException('Unknown scale {}'.format(name))
+        return self._names[name]
+
+    def scale(self, name, tonic, octave=4):
+        """Builds the ScaleBase for a catalogue entry"""
+        return ScaleBase(octave * 12 + tonic, intervals=self.intervals(name))
+
+    @staticmethod
+    def pitches_mask(pitches):
+        numbers = [ScaleBase.note_number(pitch) for pitch in pitches]
+        return pitch_class_mask(numbers)
+
+
+def main():
+    pass
+
+
+if __name__ == '__main__':
+    main()
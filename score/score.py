@@ -1,12 +1,11 @@
 from score.base import ScoreException
-from score.note import MusicObject
+from score.note import MusicObject, NoteBase
 from score.staff import Staff
-from score.time_signature import TimeSignature
 
 
 class Score(MusicObject):
 
-    def __init__(self, time_signature=TimeSignature('4/4')):
+    def __init__(self, time_signature=None):
         self._title = 'Untitled'
         self._lyrics_by = 'Unknown'
         self._music_by = 'Uknown'
@@ -14,14 +13,62 @@ class Score(MusicObject):
         self._staves = []
         super(Score, self).__init__(time_signature=time_signature)
 
+    def __del__(self):
+        self._orphan_children()
+
     def add_staff(self, staff, position=None, inherit=True):
+        """Inserts a staff. Unless inherit is False, the staff takes the
+        attributes it does not set itself from this score
+        """
         position = position or len(self._staves)
         self.validate_type(position, int)
         self.validate_type(staff, Staff)
         if inherit:
-            staff.inherit(self)
+            staff.parent = self
         self._staves.insert(position, staff)
 
+    def clone(self):
+        """A copy of the score that shares the notes, chords, rests and
+        messages of its clefs with this score, see Clef.clone. Cloning
+        takes time proportional to the number of clefs only
+        """
+        score = Score.__new__(Score)
+        score.__dict__.update(self.__dict__)
+        score._copy_own_attributes(self)
+        score._head = self._head
+        score._current = self._current
+        score._parent = self._parent
+        score._staves = []
+        for staff in self._staves:
+            clone = staff.clone()
+            if staff.parent is self:
+                clone.parent = score
+            score._staves.append(clone)
+        return score
+
+    def dumps(self):
+        """The score in the native binary format, see score.native"""
+        from score.native import dumps
+        return dumps(self)
+
+    @staticmethod
+    def loads(data):
+        """The score stored in data by Score.dumps. Loading takes time
+        proportional to the number of clefs: the notes of a clef are
+        built from its stored columns the first time the clef is used
+        """
+        from score.native import loads
+        return loads(data)
+
+    def save_native(self, filename):
+        with open(filename, 'wb') as native_file:
+            native_file.write(self.dumps())
+
+    @staticmethod
+    def load_native(filename):
+        with open(filename, 'rb') as native_file:
+            return Score.loads(native_file.read())
+
     def has_instrument(self, number, is_percussion=False):
         for staff in self.staves:
             if staff.instrument.number == number and \
@@ -30,14 +77,13 @@ class Score(MusicObject):
         return False
 
     def round_up(self, quarter_length=None):
-        longest_quater_length = 0
+        ticks = None if quarter_length is None else NoteBase.to_ticks(quarter_length)
+        longest_ticks = 0
         for staff in self.staves:
-            staff.round_up(quarter_length=quarter_length)
-            tql = staff.clefs[0].total_quarter_length
-            if longest_quater_length < tql:
-                longest_quater_length = tql
+            staff._round_up_ticks(ticks)
+            longest_ticks = max(longest_ticks, staff.clefs[0].total_ticks)
         for staff in self.staves:
-            staff.round_up(quarter_length=longest_quater_length)
+            staff._round_up_ticks(longest_ticks)
 
     def merge(self, score):
         self.validate_type(score, Score)
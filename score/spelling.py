@@ -0,0 +1,101 @@
+"""
+Key aware enharmonic spelling of the notes of a Score, Staff or Clef
+"""
+from score.chord import Chord
+from score.key import KeySignature
+from score.note import Note
+
+
+def respell(obj, key=None):
+    """Spells every note of a Score, Staff, Clef or Chord as in the given
+    key (a key string, Key or KeySignature), e.g. C#5 rather than D-5 in
+    D major. Without a key the key is detected with KeyFinder. Returns
+    the KeySignature used, or None if there are no notes to spell.
+
+    Notes are spelled from the key signature's table of 12 pitch names in
+    one pass. Notes already spelled as in the table are left untouched.
+    Shared notes are spelled on copies of the clef's own, see
+    Clef.own_value, so that other clefs and clones are unchanged
+
+    Example:
+    >>> clef.add_note(Note(61))
+    >>> respell(clef, 'D').key.name
+    'D major'
+    >>> clef.head.name
+    'C#5'
+    """
+    if key is None:
+        # Imported here, key detection needs numpy
+        from score.key_finder import KeyFinder
+        key = KeyFinder().find(obj)
+        if key is None:
+            return None
+    if not isinstance(key, KeySignature):
+        key = KeySignature(key)
+    spellings = key.spellings
+    if isinstance(obj, Chord):
+        _spell(obj.notes, spellings)
+        return key
+    for clef in _clefs(obj):
+        node = clef.head
+        while node is not None:
+            # Taken first, a shared note is replaced at its position
+            following = node.next
+            value = node.value
+            if isinstance(value, Chord):
+                if _misspelled(value.notes, spellings):
+                    _spell(clef.own_value(node).notes, spellings)
+            elif isinstance(value, Note):
+                if _misspelled([value], spellings):
+                    _spell([clef.own_value(node)], spellings)
+            node = following
+    return key
+
+
+def _misspelled(notes, spellings):
+    for note in notes:
+        if note.pitch != spellings[note.number % 12]:
+            return True
+    return False
+
+
+def _spell(notes, spellings):
+    for note in notes:
+        note.spell(spellings[note.number % 12])
+
+
+def _clefs(obj):
+    if hasattr(obj, 'staves'):
+        return [clef for staff in obj.staves for clef in staff.clefs]
+    if hasattr(obj, 'clefs'):
+        return obj.clefs
+    return [obj]
+
+
+def notes(obj):
+    """Every Note of a Score, Staff, Clef or Chord, including the notes of
+    chords, as placed: through their placements, see Placement. A note
+    placed more than once is yielded once per placement
+    """
+    if isinstance(obj, Chord):
+        for note in obj.notes:
+            yield note
+        return
+    for clef in _clefs(obj):
+        node = clef.head
+        while node is not None:
+            value = node.value
+            if isinstance(value, Chord):
+                for note in node.notes:
+                    yield note
+            elif isinstance(value, Note):
+                yield node
+            node = node.next
+
+
+def main():
+    pass
+
+
+if __name__ == '__main__':
+    main()
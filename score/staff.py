@@ -1,79 +1,248 @@
-import logging.config
+import weakref
 
-from score.base import StaffException
+from score.base import StaffException, get_logger
 from score.chord import Chord
-from score.config import config
 from score.instrument import Instrument
-from score.note import MusicObject, NoteBase, Note, Message, Rest
-from score.time_signature import TimeSignature
-
-logging.config.dictConfig(config.LOGGING_CONFIG)
+from score.note import (MusicObject, NoteBase, Note, Message, Rest, Placement,
+                        INHERITED_DEFAULTS, TICKS_PER_QUARTER, common_denominator)
 
 
 class Clef(MusicObject):
 
     def __init__(self, name='Treble'):
-        self._quarter_lengths = []
+        # Number of notes of each duration, in ticks, and the least common
+        # multiple of their denominators, kept up to date as notes are
+        # added. They are counted again when the duration of a note of the
+        # clef changed since, see NoteBase._duration_changed
+        self._durations = {}
+        self._denominator = 1
+        self._duration_generation = NoteBase._duration_generation
         self._name = None
+        self._resolved_values = None
+        self._resolved_generation = None
+        self._resolved_parent = None
+        # Columns of a clef loaded from the native format, until its
+        # notes are built on first use
+        self._stored = None
 
         self.name = name
         super(Clef, self).__init__()
 
+    def __del__(self):
+        self._orphan_children()
+
     def __str__(self):
         return 'Clef: {} - Instrument: {}'.format(self._name, self._instrument)
 
     def __repr__(self):
         return 'Clef: {} - Instrument: {}'.format(self._name, self._instrument)
 
+    def _load_stored(self):
+        if self._stored is not None:
+            from score.native import load_sequence
+            stored = self._stored
+            self._stored = None
+            load_sequence(self, stored)
+
     def add_note(self, note, quarter_length=None, inherit=True):
+        """Appends a note, chord or rest. Unless inherit is False, the
+        note takes the attributes it does not set itself (tempo,
+        velocities...) from this clef. A note that is already placed in a
+        sequence, or shared, is appended through a Placement, and the
+        quarter length is that of the placement. It is read-only from then
+        on, see NoteBase
+        """
         if not isinstance(note, (NoteBase, Chord)):
             if isinstance(note, list):
                 note = Chord(note)
             else:
                 note = Note(note)
-        if inherit:
-            note.inherit(self)
+        elif note.is_placed or note.is_shared:
+            note = Placement(note)
+        # The duration is set before the note is placed, so that it does
+        # not make the counted durations stale
         if quarter_length is not None:
             note.quarter_length = quarter_length
+        if inherit:
+            note._set_parent(self)
         self.update_neighbors(note)
-        self._quarter_lengths.append(note.quarter_length)
+        if self._duration_generation == NoteBase._duration_generation:
+            self._count(note.ticks)
+
+    def _duration_changed(self):
+        # The durations are counted again when next read
+        self._duration_generation = None
+
+    def _count(self, ticks):
+        count = self._durations.get(ticks, 0)
+        if not count:
+            self._denominator = common_denominator(self._denominator, ticks)
+        self._durations[ticks] = count + 1
+
+    def _count_durations(self):
+        """Counts the durations of the notes again if one changed since
+        they were counted, or if the clef holds a single note, which may
+        be linked to nothing that would tell
+        """
+        if self._duration_generation == NoteBase._duration_generation and \
+                self._head is not self._current:
+            return
+        self._durations = {}
+        self._denominator = 1
+        self._duration_generation = NoteBase._duration_generation
+        node = self._head
+        while node is not None:
+            if not isinstance(node.value, Message):
+                self._count(node.ticks)
+            node = node.next
 
     def add_message(self, message):
         self.validate_type(message, Message)
+        if message.is_placed or message.is_shared:
+            message = Placement(message)
         self.update_neighbors(message)
 
+    def own_value(self, node):
+        """The value at node, a position of this clef, that can be changed
+        without changing any other position: a shared value is first
+        replaced by a copy of its own, placed at node
+        """
+        if isinstance(node, Placement):
+            return node.own_value()
+        if not node.is_shared:
+            return node
+        placement = Placement(node)
+        placement._parent = node._parent
+        if self._head is node:
+            self._head = placement
+        else:
+            prev = node.prev
+            prev._next = placement
+            placement._prev = weakref.ref(prev)
+        following = node._next
+        if following is not None:
+            placement._next = following
+            following._prev = weakref.ref(placement)
+        if self._current is node:
+            self._current = placement
+        node.reset_position()
+        return placement.own_value()
+
     def update_neighbors(self, obj):
         if obj.prev or obj.next:
-            logging.warning('The current note/chord/message is already in use. '
-                            'Adding it will break it\'s previous use case')
+            get_logger(__name__).warning('The current note/chord/message is already in use. '
+                                         'Adding it will break it\'s previous use case')
         if not self.head:
             self._set_head(obj)
         else:
             self._current.next = obj
             self._current = obj
 
-    def round_up(self, quarter_length):
-        current_tql = self.total_quarter_length
-        if current_tql > quarter_length:
-            logging.info('The quarter length to round up to, {}, is less than the '
-                         'current total quarter length, {}, of the clef. No change will '
-                         'result from this method'.format(quarter_length, current_tql))
+    def clone(self):
+        """A copy of the clef that shares its notes, chords, rests and
+        messages with this one. Cloning takes constant time: the sequence
+        as it is now is kept unchanged, and both clefs continue with
+        placements of its first and last objects only. The placements in
+        between are created as either clef is walked. This clef's head,
+        current and every position after them are therefore Placements
+        after cloning, not the objects that were added.
+
+        Objects appended to either clef afterwards are not seen by the
+        other. The shared objects are read-only from the time a placement
+        reaches them (see NoteBase): edits go through the placements of
+        either clef, or Clef.own_value, and change a copy that is the
+        clef's own, so the other clef is untouched. This holds for library
+        transforms such as score.spelling.respell. Objects held from
+        before the clone must not be changed
+
+        Example:
+        >>> variant = clef.clone()
+        >>> variant.head.value = Note('D')
+        >>> variant.head.next.input = 'E'
+        >>> variant.volume = 30
+        """
+        clef = Clef(self._name)
+        clef._copy_own_attributes(self)
+        clef._parent = self._parent
+        clef._durations = dict(self._durations)
+        clef._denominator = self._denominator
+        clef._duration_generation = self._duration_generation
+        if self._stored is not None:
+            clef._stored = self._stored
+            return clef
+        if self._head is None:
+            return clef
+        head, current = self._head, self._current
+        source = head._source if isinstance(head, Placement) else None
+        if source is not None and source[2] is current:
+            # Nothing was walked or appended since this clef was last
+            # cloned, its placements still follow an unchanged sequence
+            clef._place(head, current, source[0], source[1])
+        else:
+            self._place(head, current, head, current)
+            clef._place(head, current, head, current)
+        return clef
+
+    def _place(self, head, current, first, last):
+        """Makes the sequence of the clef placements of head and current,
+        the first and last objects of a sequence that is no longer
+        modified. The placements in between are created from the
+        objects that follow first, up to last
+        """
+        parent = self._child_link()
+        end = Placement(current)
+        if current._parent is not None:
+            end._parent = parent
+        if first is last:
+            start = end
         else:
-            available_length = quarter_length - current_tql
-            if available_length > 0:
-                self.add_note(Rest(), quarter_length=available_length)
+            start = Placement(head)
+            if head._parent is not None:
+                start._parent = parent
+            start._source = (first, last, end, parent)
+        self._head = start
+        self._current = end
+
+    def _resolved(self, name):
+        # Every note of the clef resolves through here, so the clef's
+        # resolutions are cached until an attribute changes anywhere or
+        # the clef gets another parent. A parent that goes away leaves
+        # what it resolves through, see ParentLink, so those stay valid
+        if self._resolved_generation != MusicObject._generation or \
+                self._resolved_parent is not self._parent:
+            self._resolved_values = dict((attribute, getattr(self, attribute))
+                                         for attribute in INHERITED_DEFAULTS)
+            self._resolved_generation = MusicObject._generation
+            self._resolved_parent = self._parent
+        return self._resolved_values[name]
+
+    def round_up(self, quarter_length):
+        self._round_up_ticks(NoteBase.to_ticks(quarter_length))
+
+    def _round_up_ticks(self, ticks):
+        # Compared in ticks, so that equal lengths are never padded
+        total_ticks = self.total_ticks
+        if total_ticks > ticks:
+            get_logger(__name__).info('The quarter length to round up to, {}, is less than the '
+                                      'current total quarter length, {}, of the clef. No change will '
+                                      'result from this method'.format(ticks / TICKS_PER_QUARTER,
+                                                                       total_ticks / TICKS_PER_QUARTER))
+        elif total_ticks < ticks:
+            rest = Rest()
+            rest.ticks = ticks - total_ticks
+            self.add_note(rest)
 
     @MusicObject.instrument.setter
     def instrument(self, instrument):
         if not isinstance(instrument, Instrument):
-            self._instrument = Instrument(name=instrument)
+            self._instrument = Instrument.shared(instrument)
         else:
             self._instrument = instrument
         if self._instrument.is_percussion and self._name is not 'Percussion':
-            logging.warning('Updating clef to a percussion clef')
+            get_logger(__name__).warning('Updating clef to a percussion clef')
             self.name = 'Percussion'
-            if self._parent:
-                self._parent.name = 'PercussionStaff'
+            if self.parent:
+                self.parent.name = 'PercussionStaff'
 
     @property
     def name(self):
@@ -85,23 +254,46 @@ class Clef(MusicObject):
             raise ValueError('Invalid clef name')
         self._name = name
 
+    @property
+    def head(self):
+        self._load_stored()
+        return self._head
+
+    @property
+    def current(self):
+        self._load_stored()
+        return self._current
+
     @property
     def unique_quarter_lengths(self):
-        return list(set(self._quarter_lengths))
+        return [ticks / TICKS_PER_QUARTER for ticks in self.unique_ticks]
 
     @property
-    def parent(self):
-        return self._parent
+    def unique_ticks(self):
+        self._load_stored()
+        self._count_durations()
+        return list(self._durations)
 
-    @parent.setter
+    @property
+    def denominator(self):
+        """Least common multiple of the denominators of the durations of
+        the clef, as fractions of a quarter note. Midi ticks per beat that
+        are multiples of it represent every duration exactly
+        """
+        self._load_stored()
+        self._count_durations()
+        return self._denominator
+
+    @MusicObject.parent.setter
     def parent(self, parent):
         self.validate_type(parent, Staff)
-        self._parent = parent
+        self._set_parent(parent)
+        self._changed()
 
 
 class Staff(MusicObject):
 
-    def __init__(self, name='TrebleStaff', time_signature=TimeSignature('4/4')):
+    def __init__(self, name='TrebleStaff', time_signature=None):
 
         self._name = None
         self._clefs = None
@@ -109,21 +301,24 @@ class Staff(MusicObject):
         self.name = name
         super(Staff, self).__init__(time_signature=time_signature)
 
+    def __del__(self):
+        self._orphan_children()
+
     def __str__(self):
-        return '{} {}'.format(self._name, self._time_signature)
+        return '{} {}'.format(self._name, self.time_signature)
 
     def __repr__(self):
-        return '{} {}'.format(self._name, self._time_signature)
+        return '{} {}'.format(self._name, self.time_signature)
 
     def round_up(self, quarter_length=None):
-        longest_quarter_length = 0
+        self._round_up_ticks(None if quarter_length is None else NoteBase.to_ticks(quarter_length))
+
+    def _round_up_ticks(self, ticks=None):
+        longest_ticks = 0
         for clf in self.clefs:
-            tql = clf.total_quarter_length
-            if tql > longest_quarter_length:
-                longest_quarter_length = tql
-        round_to_ql = quarter_length or longest_quarter_length
+            longest_ticks = max(longest_ticks, clf.total_ticks)
         for c in self.clefs:
-            c.round_up(round_to_ql)
+            c._round_up_ticks(ticks or longest_ticks)
 
     def _set_clefs(self):
         if self._name == 'TrebleStaff':
@@ -142,17 +337,41 @@ class Staff(MusicObject):
     @MusicObject.instrument.setter
     def instrument(self, instrument):
         if not isinstance(instrument, Instrument):
-            self._instrument = Instrument(name=instrument)
+            self._instrument = Instrument.shared(instrument)
         else:
             self._instrument = instrument
 
         for clef in self._clefs:
             clef.instrument = instrument
 
+    def clone(self):
+        """A copy of the staff whose clefs are clones of this staff's
+        clefs, see Clef.clone
+        """
+        staff = Staff.__new__(Staff)
+        staff.__dict__.update(self.__dict__)
+        staff._copy_own_attributes(self)
+        staff._head = self._head
+        staff._current = self._current
+        staff._parent = self._parent
+        staff._clefs = []
+        for clef in self._clefs:
+            clone = clef.clone()
+            if clef.parent is self:
+                clone.parent = staff
+            staff._clefs.append(clone)
+        return staff
+
     @property
     def clefs(self):
         return self._clefs
 
+    @MusicObject.parent.setter
+    def parent(self, parent):
+        self.validate_type(parent, MusicObject)
+        self._set_parent(parent)
+        self._changed()
+
     @property
     def name(self):
         return self._name
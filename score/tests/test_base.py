@@ -1,3 +1,6 @@
+import os
+import subprocess
+import sys
 import unittest
 
 from .. import base
@@ -16,11 +19,20 @@ class TestBase(unittest.TestCase):
         for p in expected_perms:
             self.assertIn(p, actual_perms)
 
+    def test_pitch_class_mask(self):
+        self.assertEqual(base.pitch_class_mask([60, 64, 67]), 0b10010001)
+        self.assertEqual(base.pitch_class_mask([0, 12, 24]), 1)
+        self.assertEqual(base.pitch_class_mask([]), 0)
+
 
 class TestScoreObject(unittest.TestCase):
 
     def setUp(self):
-        self.score_object = base.ScoreObject()
+        # ScoreObject has empty __slots__, subclasses without them take
+        # any attribute
+        class Obj(base.ScoreObject):
+            pass
+        self.score_object = Obj()
 
     def test_is_music_letter(self):
         music_letters = ['a', 'b', 'c', 'd', 'e', 'f', 'g',
@@ -73,3 +85,22 @@ class TestScoreMusicObject(unittest.TestCase):
 
     def setUp(self):
         self.music_object = base.ScoreMusicObject()
+
+
+class TestImport(unittest.TestCase):
+
+    def test_import_is_lazy(self):
+        code = ('import logging, sys\n'
+                'before = set(sys.modules)\n'
+                'import score.score\n'
+                'print(len(logging.getLogger().handlers))\n'
+                'print(" ".join(sorted(set(sys.modules) - before)))\n')
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        output = subprocess.check_output([sys.executable, '-c', code], cwd=root,
+                                         universal_newlines=True).split('\n')
+        self.assertEqual(output[0], '0')
+        imported = output[1].split()
+        self.assertIn('score.chord', imported)
+        for module in ['logging.config', 'fractions', 'score.config.chord_data',
+                       'score.config.instrument_data', 'score.config.controllers_data']:
+            self.assertNotIn(module, imported)
@@ -1,8 +1,10 @@
 import unittest
 
 from ..base import ChordException, NoteException
-from ..chord import Chord, PopularChord, RomanNumeral
+from ..chord import Chord, PopularChord, RomanNumeral, CHORD_TEMPLATES, \
+    ROMAN_NUMERAL_TEMPLATES, compile_templates
 from ..note import Note
+from ..staff import Clef
 
 
 class TestChord(unittest.TestCase):
@@ -84,6 +86,29 @@ class TestChord(unittest.TestCase):
             self.assertIn(chd, inversions1)
         self.assertEqual(len(inversions2), 30)
 
+    def test_voicings(self):
+        c = Chord(['C4', 'E4', 'G4'])
+        voicings = list(c.voicings(bottom=60, top=84))
+        self.assertEqual(voicings[:3], [[60, 64, 67], [64, 67, 72], [67, 72, 76]])
+        self.assertEqual(voicings, sorted(voicings))
+        self.assertEqual(len(voicings), 5)
+
+        open_voicings = list(c.voicings(bottom=48, top=72, max_span=24, min_spacing=5))
+        for voicing in open_voicings:
+            self.assertTrue(voicing[-1] - voicing[0] <= 24)
+            self.assertTrue(voicing[1] - voicing[0] >= 5)
+            self.assertTrue(voicing[2] - voicing[1] >= 5)
+        self.assertIn([48, 55, 64], open_voicings)
+
+        close = list(c.voicings(bottom=48, top=72, max_span=None, max_spacing=4))
+        self.assertEqual(close, [[48, 52, 55], [60, 64, 67]])
+        self.assertRaises(ChordException, next, c.voicings(min_spacing=0))
+
+    def test_voicings_extended_chord(self):
+        c = PopularChord('C', name='dominant-13th')
+        voicing = next(c.voicings(bottom=60))
+        self.assertEqual(voicing, [60, 62, 64, 65, 67, 69, 70])
+
 
 class TestPopularChord(unittest.TestCase):
 
@@ -99,6 +124,51 @@ class TestPopularChord(unittest.TestCase):
         p.root = 'A'
         self.assertEqual(p.note_numbers, [57, 60, 64])
 
+    def test_compile_templates(self):
+        self.assertEqual(CHORD_TEMPLATES['major'], (0, 4, 7))
+        self.assertEqual(CHORD_TEMPLATES['dominant-13th'], (0, 4, 7, 10, 14, 17, 21))
+        self.assertEqual(ROMAN_NUMERAL_TEMPLATES['V7'], (7, 11, 2, 5))
+        self.assertEqual(compile_templates({'a': ['0, 3'], 'b': ['5']}),
+                         {'a': (0, 3), 'b': (5,)})
+
+    def test_bass(self):
+        p = PopularChord('C', name='major', bass='E')
+        self.assertEqual(p.note_numbers, [40, 48, 52, 55])
+        p.bass = None
+        self.assertEqual(p.note_numbers, [48, 52, 55])
+        p.bass = 'C'
+        self.assertEqual(p.note_numbers, [36, 48, 52, 55])
+
+    def test_from_symbol(self):
+        c = Chord.from_symbol('F#m7b5/E')
+        self.assertTrue(isinstance(c, PopularChord))
+        self.assertEqual(c.name, 'half-diminished-seventh')
+        self.assertEqual(c.note_names, ['E4', 'F#4', 'A4', 'C5', 'E5'])
+        c = Chord.from_symbol('Bbmaj7', octave=3, quarter_length=2.0)
+        self.assertEqual(c.note_numbers, [46, 50, 53, 57])
+        self.assertEqual(c.quarter_length, 2.0)
+        self.assertRaises(ChordException, Chord.from_symbol, 'Hm')
+
+    def test_cached(self):
+        p1 = PopularChord.cached('C', name='minor', quarter_length=2)
+        p2 = PopularChord.cached(Note('C'), name='minor', quarter_length=2.0)
+        self.assertIs(p1, p2)
+        self.assertEqual(p1.note_numbers, [48, 51, 55])
+        self.assertEqual(p1.quarter_length, 2)
+        self.assertIsNot(p1, PopularChord.cached('C', name='major', quarter_length=2))
+        self.assertRaises(NoteException, setattr, p1, 'root', 'D')
+        self.assertRaises(NoteException, setattr, p1, 'name', 'major')
+        self.assertRaises(NoteException, setattr, p1, 'bass', 'G')
+        self.assertRaises(NoteException, setattr, p1, 'quarter_length', 1.0)
+        self.assertRaises(NoteException, setattr, p1.root, 'input', 'D')
+        self.assertRaises(NoteException, p1.add_note, 'B')
+        # A clef places the shared chord rather than taking it over
+        clef = Clef()
+        clef.add_note(p1, quarter_length=1.0)
+        self.assertIs(clef.head.value, p1)
+        self.assertIsNone(p1.parent)
+        self.assertEqual(p1.quarter_length, 2.0)
+
 
 class TestRomanNumeral(unittest.TestCase):
 
@@ -114,4 +184,10 @@ class TestRomanNumeral(unittest.TestCase):
         r.root = 'A'
         r.numeral = 'i'
         self.assertEqual(r.note_numbers, [57, 60, 64])
-        self.assertRaises(ChordException, RomanNumeral, numeral='iv')
\ No newline at end of file
+        self.assertRaises(ChordException, RomanNumeral, numeral='iv')
+
+    def test_cached(self):
+        r1 = RomanNumeral.cached('C', numeral='V7')
+        r2 = RomanNumeral.cached('C', numeral='V7')
+        self.assertIs(r1, r2)
+        self.assertEqual(r1.note_numbers, [55, 59, 50, 53])
\ No newline at end of file
@@ -0,0 +1,101 @@
+import os
+import unittest
+
+from ..base import ChordException
+from ..chord import Chord, PopularChord
+from ..chord_bank import ChordBank, SortedEntries
+from ..consonance import ChordConsonance
+from ..key import Key
+
+
+class TestChordBank(unittest.TestCase):
+
+    def setUp(self):
+        self.bank_file = '{}/test_bank.json'.format(os.path.dirname(os.path.realpath(__file__)))
+        self.bank = ChordBank()
+        for name in ['major', 'minor', 'diminished', 'augmented', 'dominant-seventh']:
+            for root in range(60, 72):
+                self.bank.add(PopularChord(root, name=name))
+
+    def tearDown(self):
+        if os.path.exists(self.bank_file):
+            os.remove(self.bank_file)
+
+    def consonances(self, chords):
+        return [ChordConsonance.consonance_of_numbers(c) for c in chords]
+
+    def test_add(self):
+        self.assertEqual(len(self.bank), 60)
+        self.bank.add(Chord([60, 64, 67]))
+        self.bank.add([67, 60, 64])
+        self.assertEqual(len(self.bank), 60)
+        self.assertIn([60, 64, 67], self.bank)
+        self.assertNotIn([60, 61, 62], self.bank)
+        self.assertEqual(self.bank.root([60, 63, 66]), 60)
+        self.assertRaises(ChordException, self.bank.add, [])
+        self.assertRaises(ChordException, self.bank.root, [60, 61, 62])
+        consonances = self.consonances(self.bank)
+        self.assertEqual(consonances, sorted(consonances))
+
+    def test_best(self):
+        best = self.bank.best(3)
+        self.assertEqual(len(best), 3)
+        self.assertEqual(self.consonances(best), self.consonances(list(self.bank)[:3]))
+        in_c = self.bank.best(4, key='C')
+        self.assertEqual(len(in_c), 4)
+        mask = Key('C').pitch_class_mask
+        for chord in in_c:
+            for n in chord:
+                self.assertTrue(mask & (1 << (n % 12)))
+
+    def test_in_range(self):
+        chords = self.bank.in_range(50, 60)
+        self.assertTrue(len(chords) > 0)
+        for c in self.consonances(chords):
+            self.assertTrue(50 <= c <= 60)
+        outside = [c for c in self.consonances(self.bank) if not 50 <= c <= 60]
+        self.assertEqual(len(chords) + len(outside), len(self.bank))
+        in_key = self.bank.in_range(0, 1000, key='a')
+        self.assertEqual(in_key, self.bank.in_key(Key('a')))
+
+    def test_in_key(self):
+        chords = self.bank.in_key('C')
+        expected = [c for c in self.bank
+                    if all(n % 12 in [0, 2, 4, 5, 7, 9, 11] for n in c)]
+        self.assertEqual(sorted(chords), sorted(expected))
+        self.assertIn((67, 71, 74, 77), chords)
+        consonances = self.consonances(chords)
+        self.assertEqual(consonances, sorted(consonances))
+
+    def test_save_and_load(self):
+        self.bank.save(self.bank_file)
+        bank = ChordBank.load(self.bank_file)
+        self.assertEqual(list(bank), list(self.bank))
+        self.assertEqual(bank.in_key('G'), self.bank.in_key('G'))
+        self.assertEqual(bank.root([62, 65, 69]), 62)
+        bank.add([60, 62, 64])
+        self.assertEqual(len(bank), len(self.bank) + 1)
+
+
+class TestSortedEntries(unittest.TestCase):
+
+    def test_insert(self):
+        import random
+        rng = random.Random(3)
+        items = [rng.randint(0, 50) for i in range(0, 200)]
+        entries = SortedEntries(load=4)
+        for item in items:
+            entries.insert(item)
+        self.assertEqual(list(entries), sorted(items))
+        self.assertEqual(len(entries), 200)
+        self.assertGreater(len(entries._blocks), 20)
+        self.assertTrue(all(len(block) <= 8 for block in entries._blocks))
+        self.assertEqual(list(entries.irange(25)), [i for i in sorted(items) if i >= 25])
+        self.assertEqual(list(entries.irange(51)), [])
+
+    def test_append(self):
+        entries = SortedEntries(load=2)
+        for item in range(0, 10):
+            entries.append(item)
+        entries.insert(4)
+        self.assertEqual(list(entries), [0, 1, 2, 3, 4, 4, 5, 6, 7, 8, 9])
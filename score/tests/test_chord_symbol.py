@@ -0,0 +1,45 @@
+import unittest
+
+from ..base import ChordException
+from ..chord_symbol import AliasTrie, ALIAS_TRIE, parse_symbol, parse_progression
+
+
+class TestAliasTrie(unittest.TestCase):
+
+    def test_matches(self):
+        trie = AliasTrie([('m', 'minor'), ('m7', 'minor-seventh'), ('', 'major'),
+                          ('m', 'other')])
+        self.assertEqual(trie.matches('Cm7', 1), [(1, 'major'), (2, 'minor'), (3, 'minor-seventh')])
+        self.assertEqual(trie.matches('x'), [(0, 'major')])
+        self.assertEqual(ALIAS_TRIE.matches('m7b5'), [(0, 'major'), (1, 'minor'),
+                                                      (2, 'minor-seventh'),
+                                                      (4, 'half-diminished-seventh')])
+
+
+class TestParseSymbol(unittest.TestCase):
+
+    def test_parse_symbol(self):
+        symbols = {
+            'C': ('C', 'major', None),
+            'F#m7b5/E': ('F#', 'half-diminished-seventh', 'E'),
+            'Bb': ('B-', 'major', None),
+            'Ebmaj7': ('E-', 'major-seventh', None),
+            'Am/G': ('A', 'minor', 'G'),
+            'C/o7': ('C', 'half-diminished-seventh', None),
+            'Dm7': ('D', 'minor-seventh', None),
+            'G7+': ('G', 'augmented-seventh', None),
+            'Ab13': ('A-', 'dominant-13th', None),
+            'C/Bb': ('C', 'major', 'B-'),
+        }
+        for symbol in symbols:
+            self.assertEqual(parse_symbol(symbol), symbols[symbol])
+        for symbol in ['', 'H7', 'Cxyz', 'C/', 'C/H', 'cm', 'Cm7/E/G']:
+            self.assertRaises(ChordException, parse_symbol, symbol)
+        self.assertRaises(ChordException, parse_symbol, None)
+        self.assertRaises(ChordException, parse_symbol, ['C'])
+
+    def test_parse_progression(self):
+        progression = parse_progression('| C  Am7 | Dm7b5/A G7 |\nC |')
+        self.assertEqual(len(progression), 5)
+        self.assertEqual(progression[2], ('D', 'half-diminished-seventh', 'A'))
+        self.assertEqual(parse_progression(''), [])
@@ -0,0 +1,41 @@
+import unittest
+
+from ..consonance import Consonance, ChordConsonance, CONSONANCE_TABLE, \
+    INTERVAL_CONSONANCE
+from ..note import Note
+
+
+class TestConsonance(unittest.TestCase):
+
+    def test_get_consonance(self):
+        csn = Consonance(tonic=Note('C'))
+        self.assertEqual(csn.get_consonance(Note('E')), 20)
+        self.assertEqual(csn.get_consonance(Note('G5')), 6)
+        csn = Consonance(tonic=Note('A'))
+        self.assertEqual(csn.get_consonance(Note('C')), 30)
+        self.assertEqual(csn.chromatic_scale, [9, 10, 11, 0, 1, 2, 3, 4, 5, 6, 7, 8])
+
+    def test_tables(self):
+        self.assertEqual(INTERVAL_CONSONANCE[0], 1)
+        self.assertEqual(INTERVAL_CONSONANCE[7], 6)
+        for i in range(0, 12):
+            self.assertEqual(CONSONANCE_TABLE[i][i], 0)
+            for j in range(0, 12):
+                self.assertEqual(CONSONANCE_TABLE[i][j], CONSONANCE_TABLE[j][i])
+
+
+class TestChordConsonance(unittest.TestCase):
+
+    def test_consonance(self):
+        con = ChordConsonance(notes=[Note('C'), Note('E')])
+        self.assertEqual(con.consonance, 20)
+        con = ChordConsonance(notes=[Note('C3'), Note('E4'), Note('G4'), Note('C5')])
+        self.assertEqual(con.consonance, 56)
+        self.assertEqual(ChordConsonance.consonance_of_numbers([48, 64, 67, 72]), 56)
+
+    def test_batch_consonance(self):
+        chords = [[60, 64, 67, 72], [60, 61, -1, -1], [62, 66, 69, 72], [60, -1, -1, -1]]
+        expected = [ChordConsonance.consonance_of_numbers([n for n in c if n >= 0])
+                    for c in chords]
+        self.assertEqual(list(ChordConsonance.batch_consonance(chords)), expected)
+        self.assertRaises(ValueError, ChordConsonance.batch_consonance, [60, 64])
@@ -0,0 +1,119 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from ..base import CorpusException, ScoreException
+from ..chord import Chord
+from ..corpus import Corpus, CorpusWriter, clef_events
+from ..note import Message, Note, Rest
+from ..score import Score
+from ..staff import Clef, Staff
+
+
+class TestCorpus(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'corpus')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def score(self, title, numbers):
+        sc = Score()
+        sc.title = title
+        st = Staff('GreatStaff')
+        sc.add_staff(st)
+        for n in numbers:
+            st.clefs[0].add_note(Note(n))
+        st.clefs[1].add_note(Chord([36, 40]), quarter_length=2.0)
+        return sc
+
+    def test_clef_events(self):
+        c = Clef()
+        c.volume = 10
+        c.add_note(Note(60, quarter_length=0.5))
+        c.add_note(Rest())
+        c.add_message(Message('random', a=5))
+        c.add_note(Chord([64, 67]))
+        c.attack_velocity = 80
+        self.assertEqual(clef_events(c), ([60, 64, 67], [0.5, 1.0, 1.0],
+                                          [80, 80, 80], [0.0, 1.5, 1.5]))
+
+    def test_write_and_read(self):
+        with CorpusWriter(self.path) as writer:
+            self.assertEqual(writer.add(self.score('One', [60, 62])), 0)
+            self.assertEqual(writer.add(self.score('Two', [64])), 1)
+        corpus = Corpus(self.path)
+        self.assertEqual(len(corpus), 2)
+        self.assertIsInstance(corpus.pitch, np.memmap)
+        self.assertEqual(corpus.pitch.tolist(), [60, 62, 36, 40, 64, 36, 40])
+        self.assertEqual(corpus.onset.tolist(), [0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 0.0])
+        self.assertEqual(corpus.clefs['stop'].tolist(), [2, 4, 5, 7])
+        events = corpus.events(1)
+        self.assertEqual(events['pitch'].tolist(), [64, 36, 40])
+        self.assertEqual(events['duration'].tolist(), [1.0, 2.0, 2.0])
+        self.assertEqual(corpus.events(0, staff=0, clef=1)['pitch'].tolist(), [36, 40])
+        self.assertEqual(corpus.events(0, clef=0)['pitch'].tolist(), [60, 62])
+        self.assertEqual(corpus.events(0, staff=1)['pitch'].tolist(), [])
+        sc = corpus.score(1)
+        self.assertEqual(sc.title, 'Two')
+        self.assertEqual(sc.staves[0].clefs[0].head.number, 64)
+        self.assertRaises(IndexError, corpus.score, 2)
+
+    def test_append(self):
+        with CorpusWriter(self.path) as writer:
+            writer.add(self.score('One', [60]))
+        with CorpusWriter(self.path) as writer:
+            self.assertEqual(writer.add(self.score('Two', [62])), 1)
+            self.assertRaises(ScoreException, writer.add, Staff())
+        corpus = Corpus(self.path)
+        self.assertEqual(len(corpus), 2)
+        self.assertEqual(corpus.score(0).title, 'One')
+        self.assertEqual(corpus.events(1)['pitch'].tolist(), [62, 36, 40])
+
+    def test_interrupted_writer(self):
+        with CorpusWriter(self.path) as writer:
+            writer.add(self.score('One', [60]))
+        # A writer that is never closed leaves its data without a manifest
+        writer = CorpusWriter(self.path)
+        writer.add(self.score('Seventy', [70]))
+        for data_file in writer._files.values():
+            data_file.flush()
+        with CorpusWriter(self.path) as writer:
+            self.assertEqual(writer.add(self.score('Eighty', [80])), 1)
+        corpus = Corpus(self.path)
+        self.assertEqual(len(corpus), 2)
+        self.assertEqual(corpus.events(1)['pitch'].tolist(), [80, 36, 40])
+        self.assertEqual(corpus.score(1).title, 'Eighty')
+        self.assertEqual(len(corpus.pitch), 6)
+
+    def test_failed_add(self):
+        class Failing(Score):
+            def dumps(self):
+                raise RuntimeError('dumps failed')
+        with CorpusWriter(self.path) as writer:
+            failing = Failing()
+            failing.add_staff(Staff())
+            failing.staves[0].clefs[0].add_note(Note(70))
+            self.assertRaises(RuntimeError, writer.add, failing)
+            self.assertEqual(writer.add(self.score('One', [60])), 0)
+        corpus = Corpus(self.path)
+        self.assertEqual(corpus.pitch.tolist(), [60, 36, 40])
+
+    def test_truncated_corpus(self):
+        with CorpusWriter(self.path) as writer:
+            writer.add(self.score('One', [60]))
+        with open(os.path.join(self.path, 'scores.native'), 'r+b') as native:
+            native.truncate(10)
+        self.assertRaises(CorpusException, CorpusWriter, self.path)
+
+    def test_empty(self):
+        CorpusWriter(self.path).close()
+        corpus = Corpus(self.path)
+        self.assertEqual(len(corpus), 0)
+        self.assertEqual(len(corpus.pitch), 0)
+        self.assertRaises(CorpusException, Corpus, self.directory)
@@ -0,0 +1,139 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from ..base import CorpusException
+from ..chord import Chord
+from ..corpus import CorpusWriter
+from ..corpus_index import CorpusIndex, ScoreHandle, extract
+from ..note import Note
+from ..score import Score
+from ..staff import Staff
+
+
+class TestCorpusIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'corpus')
+        self.index = CorpusIndex(os.path.join(self.directory, 'index.sqlite'))
+
+    def tearDown(self):
+        self.index.close()
+        shutil.rmtree(self.directory)
+
+    def score(self, title, numbers, time_signature='4/4', tempo=120,
+              instrument='Acoustic Grand Piano'):
+        sc = Score(time_signature=time_signature)
+        sc.title = title
+        sc.tempo = tempo
+        st = Staff()
+        sc.add_staff(st)
+        st.instrument = instrument
+        for n in numbers:
+            st.clefs[0].add_note(Note(n))
+        return sc
+
+    def write(self, *scores):
+        with CorpusWriter(self.path) as writer:
+            for sc in scores:
+                writer.add(sc)
+
+    def test_extract(self):
+        sc = self.score('Waltz', [48, 52, 55], time_signature='3/4', tempo=150,
+                        instrument='Violin')
+        sc.staves[0].clefs[0].add_note(Chord([48, 52, 55]), quarter_length=2.0)
+        self.write(sc)
+        [(row, instruments)] = extract(self.path, [0])
+        self.assertEqual(row[4:], ('Waltz', 'Uknown', 'Unknown', 'Pop', 150, '3/4',
+                                   'C major', 5.0, 6, 48, 55))
+        self.assertEqual(instruments, [(0, 41, 'Violin', 0, 0, 1, 0)])
+
+    def test_find(self):
+        self.write(self.score('Waltz', [60, 64, 67], '3/4', 150, 'Violin'),
+                   self.score('Slow waltz', [60, 64, 67], '3/4', 90, 'Violin'),
+                   self.score('March', [60, 62], '4/4', 150, 'Violin'),
+                   self.score('Piano waltz', [60, 64], '3/4', 160))
+        self.assertEqual(self.index.update(self.path, processes=1), 4)
+        handles = self.index.find(time_signature='3/4', min_tempo=140,
+                                  family='string')
+        self.assertEqual([handle.title for handle in handles], ['Waltz'])
+        self.assertIsInstance(handles[0], ScoreHandle)
+        self.assertEqual(handles[0].tempo, 150)
+        self.assertEqual([h.title for h in self.index.find(instrument=1)],
+                         ['Piano waltz'])
+        self.assertEqual([h.title for h in self.index.find(highest=64)],
+                         ['March', 'Piano waltz'])
+        self.assertEqual(len(self.index.query('note_count = ?', (3,))), 2)
+        self.assertEqual(self.index.instruments(handles[0]), [(0, 41, 'Violin')])
+        self.assertRaises(CorpusException, self.index.find, family='brass')
+
+    def test_handle_loads_lazily(self):
+        self.write(self.score('One', [60, 62]))
+        self.index.update(self.path, processes=1)
+        handle = self.index.find(title='One')[0]
+        self.assertIsNone(handle._score)
+        self.assertEqual(handle.score.staves[0].clefs[0].head.number, 60)
+        self.assertIs(handle.score, handle.score)
+
+    def test_incremental_update(self):
+        self.write(self.score('One', [60]), self.score('Two', [62]))
+        self.assertEqual(self.index.update(self.path, processes=1), 2)
+        self.assertEqual(self.index.update(self.path, processes=1), 0)
+        self.write(self.score('Three', [64]))
+        self.assertEqual(self.index.update(self.path, processes=1), 1)
+        self.assertEqual(len(self.index), 3)
+
+        # Only the last indexed score and the new ones are read
+        from .. import corpus_index
+        self.write(self.score('Four', [65]))
+        read = []
+
+        def fingerprint(corpus, position):
+            read.append(position)
+            return original(corpus, position)
+        original = corpus_index.fingerprint
+        corpus_index.fingerprint = fingerprint
+        try:
+            self.assertEqual(self.index.update(self.path, processes=1), 1)
+        finally:
+            corpus_index.fingerprint = original
+        self.assertEqual(sorted(set(read)), [2, 3])
+
+        # A rewritten corpus re-indexes what changed and drops what is gone
+        shutil.rmtree(self.path)
+        self.write(self.score('One', [60]), self.score('Deux', [62]))
+        self.assertEqual(self.index.update(self.path, processes=1), 1)
+        self.assertEqual([h.title for h in self.index.query()], ['One', 'Deux'])
+        self.assertEqual(len(self.index.query('id NOT IN (SELECT score_id FROM instruments)')), 0)
+
+    def test_earlier_layout(self):
+        database = os.path.join(self.directory, 'earlier.sqlite')
+        connection = sqlite3.connect(database)
+        connection.execute('CREATE TABLE scores (id INTEGER PRIMARY KEY, corpus TEXT, '
+                           'position INTEGER, size INTEGER, checksum INTEGER)')
+        connection.commit()
+        connection.close()
+        self.write(self.score('One', [60]))
+        with CorpusIndex(database) as index:
+            self.assertEqual(index.update(self.path, processes=1), 1)
+            self.assertEqual(index.find(title='One')[0].offset, 0)
+        connection = sqlite3.connect(database)
+        connection.execute('PRAGMA user_version = 99')
+        connection.close()
+        self.assertRaises(CorpusException, CorpusIndex, database)
+
+    def test_parallel_update(self):
+        from .. import corpus_index
+        self.write(*[self.score(str(i), [60 + i % 12]) for i in range(0, 5)])
+        chunk_size = corpus_index.CHUNK_SIZE
+        corpus_index.CHUNK_SIZE = 2
+        try:
+            self.assertEqual(self.index.update(self.path, processes=2), 5)
+        finally:
+            corpus_index.CHUNK_SIZE = chunk_size
+        self.assertEqual([h.title for h in self.index.query()],
+                         ['0', '1', '2', '3', '4'])
+        self.assertEqual(self.index.find(title='3')[0].lowest, 63)
@@ -1,7 +1,9 @@
 import unittest
 
+from ..base import InstrumentException
 from ..config import instrument_data
 from ..instrument import Instrument
+from ..note import Note
 
 
 class TestInstrument(unittest.TestCase):
@@ -28,3 +30,35 @@ class TestInstrument(unittest.TestCase):
         i.set_number(num, is_percussion=True)
         name = Instrument.name_from_number(num, is_percussion=True)
         self.assertEqual(i.name, name)
+
+    def test_name_from_number(self):
+        for name in instrument_data.INSTRUMENTS:
+            number = instrument_data.INSTRUMENTS[name][0]
+            self.assertEqual(Instrument.name_from_number(number), name)
+        for name in instrument_data.PERCUSSION:
+            number = instrument_data.PERCUSSION[name][0]
+            self.assertEqual(Instrument.name_from_number(number, is_percussion=True), name)
+        self.assertIsNone(Instrument.name_from_number(129))
+
+    def test_shared(self):
+        self.assertIs(Instrument.from_number(40), Instrument.from_number(40))
+        self.assertIsNot(Instrument.from_number(40),
+                         Instrument.from_number(40, is_percussion=True))
+        self.assertIs(Instrument.shared('Cello'),
+                      Instrument.from_number(instrument_data.INSTRUMENTS['Cello'][0]))
+        self.assertIs(Instrument.shared(Instrument('Cello')), Instrument.shared('Cello'))
+        self.assertTrue(Instrument.shared('Low Bongo').is_percussion)
+        self.assertRaises(ValueError, Instrument.shared, 'Kazoo')
+        i = Instrument.shared()
+        self.assertTrue(i.is_shared)
+        self.assertRaises(InstrumentException, i.set_number, 40)
+        self.assertRaises(InstrumentException, setattr, i, 'name', 'Cello')
+        self.assertEqual(i.name, 'Acoustic Grand Piano')
+        self.assertFalse(Instrument().is_shared)
+
+    def test_music_objects_share_instruments(self):
+        self.assertIs(Note(60).instrument, Note(62).instrument)
+        n = Note(60)
+        n.instrument = 'Cello'
+        self.assertIs(n.instrument, Instrument.shared('Cello'))
+        self.assertIs(Note(60).instrument, Instrument.shared())
@@ -0,0 +1,91 @@
+import unittest
+
+from ..base import KeyException, pitch_class_mask
+from ..key import Key, KeySignature, Accidentals
+
+
+class TestKey(unittest.TestCase):
+
+    def test_property_setters(self):
+        k = Key('E-')
+        self.assertEqual(k.tonic, 'E-')
+        self.assertEqual(k.mode_type, 'major')
+        self.assertEqual(k.name, 'E- major')
+        self.assertEqual(Key('f#').mode_type, 'minor')
+        self.assertRaises(KeyException, Key, 'H')
+
+    def test_pitch_class_mask(self):
+        self.assertEqual(Key('C').pitch_class_mask, pitch_class_mask([0, 2, 4, 5, 7, 9, 11]))
+        self.assertEqual(Key('a').pitch_class_mask, Key('C').pitch_class_mask)
+        self.assertEqual(Key('E-').pitch_class_mask, pitch_class_mask([3, 5, 7, 8, 10, 0, 2]))
+        self.assertEqual(Key('E-').tonic_pitch_class, 3)
+
+    def test_interned(self):
+        self.assertIs(Key('E-'), Key('E-'))
+        self.assertIsNot(Key('E-'), Key('e-'))
+        k = Key('G')
+        k.key = 'G'
+        with self.assertRaises(KeyException):
+            k.key = 'D'
+        self.assertEqual(Key('G').key, 'G')
+
+
+class TestAccidentals(unittest.TestCase):
+
+    def test_masks(self):
+        a = Accidentals()
+        a.sharpen = ['F', 'C']
+        self.assertTrue(a.is_sharpened('F'))
+        self.assertFalse(a.is_flattened('F'))
+        self.assertTrue(a.is_naturalized('D'))
+        a.flatten = ['F']
+        self.assertFalse(a.is_sharpened('F'))
+        self.assertTrue(a.is_flattened('F'))
+        a.naturalize = ['F', 'C']
+        self.assertEqual(a.sharpen_mask, 0)
+        self.assertEqual(a.flatten_mask, 0)
+        self.assertEqual(sorted(a.naturalize), ['A', 'B', 'C', 'D', 'E', 'F', 'G'])
+
+
+class TestKeySignature(unittest.TestCase):
+
+    def test_interned(self):
+        self.assertIs(KeySignature('E-'), KeySignature('E-'))
+        self.assertIs(KeySignature(Key('E-')), KeySignature('E-'))
+        self.assertIs(KeySignature('E-').key, Key('E-'))
+
+    def test_accidentals(self):
+        accidentals = KeySignature('E-').accidentals
+        self.assertEqual(sorted(accidentals.flatten), ['A', 'B', 'E'])
+        self.assertEqual(accidentals.sharpen, [])
+        self.assertTrue(accidentals.is_flattened('A'))
+        self.assertEqual(KeySignature('e').accidentals.sharpen, ['F'])
+        self.assertEqual(KeySignature('C').accidentals.naturalize_mask, 127)
+        self.assertEqual(KeySignature('D').accidentals.sharpen, ['F', 'C'])
+        self.assertEqual(KeySignature('D').accidentals.flatten, [])
+        self.assertEqual(len(KeySignature('D-').accidentals.flatten), 5)
+
+    def test_shared_accidentals(self):
+        accidentals = KeySignature('D').accidentals
+        self.assertRaises(KeyException, setattr, accidentals, 'sharpen', ['B'])
+        self.assertRaises(KeyException, setattr, accidentals, 'naturalize', ['F'])
+        accidentals.sharpen.append('B')
+        copy = accidentals.copy()
+        copy.sharpen = ['B']
+        self.assertEqual(copy.sharpen, ['F', 'C', 'B'])
+        self.assertEqual(KeySignature('D').accidentals.sharpen, ['F', 'C'])
+        self.assertFalse(KeySignature('D').accidentals.is_sharpened('B'))
+
+    def test_spellings(self):
+        self.assertEqual(KeySignature('A').spellings,
+                         ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B'])
+        self.assertEqual(KeySignature('f').spellings,
+                         ['C', 'D-', 'D', 'E-', 'E', 'F', 'G-', 'G', 'A-', 'A', 'B-', 'B'])
+        # E# is not a standard spelling, F is used instead
+        self.assertEqual(KeySignature('F#').spellings[5], 'F')
+
+    def test_scale(self):
+        signature = KeySignature('D')
+        self.assertEqual([n.name for n in signature.scale.note_sequence],
+                         ['D4', 'E4', 'F#4', 'G4', 'A4', 'B4', 'D-5'])
+        self.assertIs(signature.scale, signature.scale)
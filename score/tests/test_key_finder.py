@@ -0,0 +1,92 @@
+import unittest
+
+import numpy as np
+
+from ..chord import Chord
+from ..key_finder import KeyFinder
+from ..note import Note, Rest, Message
+from ..score import Score
+from ..staff import Clef, Staff
+
+
+class TestKeyFinder(unittest.TestCase):
+
+    def setUp(self):
+        self.finder = KeyFinder()
+
+    def clef(self, numbers, quarter_length=1.0):
+        clef = Clef()
+        for n in numbers:
+            clef.add_note(Note(n), quarter_length=quarter_length)
+        return clef
+
+    def test_note_events(self):
+        clef = Clef()
+        clef.add_message(Message('control_change', control=10, value=10))
+        clef.add_note(Note(60), quarter_length=2.0)
+        clef.add_note(Rest())
+        clef.add_note(Chord([64, 67]), quarter_length=0.5)
+        onsets, durations, pitch_classes = KeyFinder.note_events(clef)
+        self.assertEqual(list(onsets), [0.0, 3.0, 3.0])
+        self.assertEqual(list(durations), [2.0, 0.5, 0.5])
+        self.assertEqual(list(pitch_classes), [0, 4, 7])
+        histogram = self.finder.histogram(clef)
+        self.assertEqual(histogram[0], 2.0)
+        self.assertEqual(histogram.sum(), 3.0)
+
+    def test_find(self):
+        self.assertEqual(self.finder.find(self.clef([60, 62, 64, 65, 67, 69, 71, 72, 67, 60])).key, 'C')
+        self.assertEqual(self.finder.find(self.clef([57, 59, 60, 62, 64, 65, 68, 69, 64, 57])).key, 'a')
+        staff = Staff('GreatStaff')
+        for n in [62, 66, 69, 74, 66, 67, 71, 73]:
+            staff.clefs[0].add_note(Note(n))
+        for n in [50, 45, 50, 57]:
+            staff.clefs[1].add_note(Note(n), quarter_length=2.0)
+        score = Score()
+        score.add_staff(staff)
+        self.assertEqual(self.finder.find(score).key, 'D')
+        self.assertEqual(self.finder.find(Clef()), None)
+
+    def test_correlations(self):
+        correlations = self.finder.correlations(np.eye(12)[[0, 0]])
+        self.assertEqual(correlations.shape, (2, 24))
+        self.assertIn(correlations[0].argmax(), [0, 12])
+        self.assertEqual(list(correlations[0]), list(correlations[1]))
+        self.assertTrue(np.all(self.finder.correlations(np.zeros(12)) == 0))
+
+    def test_find_windows(self):
+        c_major = [60, 62, 64, 65, 67, 69, 71, 72]
+        f_sharp_major = [66, 68, 70, 71, 73, 75, 77, 78]
+        clef = self.clef(c_major * 2, quarter_length=0.5)
+        clef.add_note(Rest(), quarter_length=8.0)
+        for n in f_sharp_major * 2:
+            clef.add_note(Note(n), quarter_length=0.5)
+        windows = self.finder.find_windows(clef, window=8.0, step=4.0)
+        self.assertEqual([onset for onset, key in windows], [0.0, 4.0, 8.0, 12.0, 16.0])
+        self.assertEqual(windows[0][1].key, 'C')
+        self.assertEqual(windows[1][1].key, 'C')
+        self.assertEqual(windows[2][1], None)
+        self.assertEqual(windows[4][1].key, 'F#')
+        self.assertRaises(ValueError, self.finder.find_windows, clef, window=6.0, step=4.0)
+        self.assertRaises(ValueError, self.finder.find_windows, clef, window=8.0, step=0)
+        self.assertEqual(self.finder.find_windows(Clef()), [])
+
+    def test_find_windows_histograms(self):
+        clef = self.clef([60, 64, 67], quarter_length=3.0)
+        windows = self.finder.find_windows(clef, window=2.0, step=1.0)
+        self.assertEqual(len(windows), 8)
+        onsets, durations, pitch_classes = KeyFinder.note_events(clef)
+        edges = np.arange(10, dtype=float)
+        sounding = KeyFinder._sounding_time(onsets, onsets + durations, edges)
+        self.assertEqual(list(sounding), [0, 1, 2, 3, 4, 5, 6, 7, 8, 9])
+        sounding = KeyFinder._sounding_time(np.array([0.5]), np.array([1.5]), edges[:3])
+        self.assertEqual(list(sounding), [0.0, 0.5, 1.0])
+
+    def test_find_histograms(self):
+        histograms = [self.finder.histogram(self.clef([60, 64, 67])),
+                      np.zeros(12),
+                      self.finder.histogram(self.clef([57, 60, 64, 56]))]
+        keys = self.finder.find_histograms(histograms)
+        self.assertEqual(str(keys[0]), str(self.finder.find(self.clef([60, 64, 67]))))
+        self.assertIsNone(keys[1])
+        self.assertEqual(str(keys[2]), str(self.finder.find(self.clef([57, 60, 64, 56]))))
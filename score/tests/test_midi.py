@@ -49,7 +49,7 @@ class TestMidi(unittest.TestCase):
         instr = 10
         sc.copyright = copyright
         sc.time_signature = ts
-        sc.instrument.set_number(instr)
+        sc.instrument = Instrument.from_number(instr)
         tempo = 120
         sc.tempo = tempo
         st = Staff('TrebleStaff')
@@ -134,6 +134,22 @@ class TestMidi(unittest.TestCase):
         m.add_clef(c2, track_index=1, channel=3)
         self.assertEqual(m.tracks[1][0].channel, 9)
 
+    def test_add_shared_notes(self):
+        m = Midi(Score())
+        motif = [Note(60), Chord([64, 67]), Rest()]
+        c = Clef()
+        for _ in range(0, 2):
+            for obj in motif:
+                c.add_note(obj)
+        c.add_note(motif[0], quarter_length=2.0)
+        c.attack_velocity = 90
+        m.add_clef(c, track_index=0, channel=0)
+        numbers = [msg.note for msg in m.tracks[0][1:]]
+        self.assertEqual(numbers, [60, 60, 64, 67, 64, 67, 60, 60] * 2 + [60, 60])
+        self.assertEqual(m.tracks[0][-1].time, 2 * m.ticks_per_beat)
+        self.assertEqual(m.tracks[0][-2].velocity, 90)
+        self.assertEqual(m.tracks[0][12].velocity, 90)
+
     def test_add_message(self):
         sc = Score()
         m = Midi(sc)
@@ -193,6 +209,69 @@ class TestMidi(unittest.TestCase):
         self.assertEqual(m.tracks[0][2].note, chd.note_numbers[1])
         self.assertEqual(m.tracks[0][3].note, chd.note_numbers[2])
 
+    def test_triplets_are_exact(self):
+        c = Clef()
+        for i in range(0, 300):
+            c.add_note(Note(60, quarter_length=1 / 3.0))
+        m = c.midi
+        m._score_to_midi()
+        times = [msg.time for msg in m.tracks[0] if msg.type == 'note_off']
+        self.assertEqual(sum(times), 100 * m.ticks_per_beat)
+        self.assertEqual(set(times), {m.ticks_per_beat // 3})
+
+    def test_add_shared_chord(self):
+        c1 = Clef()
+        c2 = Clef()
+        chd = Chord([60, 64])
+        c1.add_note(chd)
+        c2.add_note(chd)
+        c2.attack_velocity = 100
+        m = c2.midi
+        m._score_to_midi()
+        velocities = [msg.velocity for msg in m.tracks[0] if msg.type == 'note_on']
+        self.assertEqual(velocities, [100, 100])
+
+    def test_plan_ticks_per_beat(self):
+        c = Clef()
+        c.add_note(Note(60, quarter_length=1 / 3.0))
+        c.add_note(Note(60, quarter_length=0.2))
+        m = c.midi
+        m._score_to_midi()
+        self.assertEqual(m.ticks_per_beat, 105)
+        self.assertEqual(m.rounding_error, 0.0)
+        self.assertEqual(Midi.smallest_ticks_per_beat(1), 96)
+        self.assertEqual(Midi.smallest_ticks_per_beat(128), 128)
+        self.assertEqual(Midi.best_ticks_per_beat(0.5, 0.75), 96)
+
+    def test_plan_ticks_per_beat_after_edit(self):
+        c = Clef()
+        for _ in range(0, 4):
+            c.add_note(Note(60))
+        c.head.quarter_length = 0.2
+        c.head.next.value.ticks = 2 * c.head.next.ticks
+        m = c.midi
+        m._score_to_midi()
+        self.assertEqual(m.ticks_per_beat, 100)
+        self.assertEqual(m.rounding_error, 0.0)
+        times = [msg.time for msg in m.tracks[0] if msg.type == 'note_off']
+        self.assertEqual(times, [20, 200, 100, 100])
+
+    def test_plan_ticks_per_beat_capped(self):
+        c = Clef()
+        for i in range(0, 100):
+            for tuplet in [7.0, 9.0, 11.0, 13.0, 64.0]:
+                c.add_note(Note(60, quarter_length=1 / tuplet))
+        m = c.midi
+        with self.assertLogs('score.midi', level='WARNING'):
+            m._score_to_midi()
+        self.assertEqual(m.ticks_per_beat, 32760)
+        self.assertGreater(m.rounding_error, 0.0)
+        self.assertLess(m.rounding_error, 1.0 / 32760)
+        # Onsets are rounded, not durations, so the end does not drift
+        times = [msg.time for msg in m.tracks[0] if msg.type == 'note_off']
+        exact = c.total_quarter_length * m.ticks_per_beat
+        self.assertLessEqual(abs(sum(times) - exact), 0.5)
+
     def test_score_to_midi(self):
         st = Staff(time_signature=TimeSignature('3/4'))
         st.copyright = 'AlgoTunes'
@@ -0,0 +1,100 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from ..base import NativeFormatException
+from ..chord import Chord, PopularChord
+from ..native import loads, PRELUDE, MAGIC
+from ..note import Message, Note, Rest
+from ..score import Score
+from ..staff import Staff
+
+
+class TestNative(unittest.TestCase):
+
+    def score(self):
+        sc = Score(time_signature='3/4')
+        sc.title = 'Nocturne'
+        sc.copyright = 'AlgoTunes'
+        sc.tempo = 90
+        st = Staff('GreatStaff')
+        sc.add_staff(st)
+        treble, bass = st.clefs
+        treble.volume = 30
+        treble.add_note(Note('C#5', quarter_length=0.5))
+        treble.add_note(Rest(), quarter_length=2.0)
+        chd = Chord(['C', 'E-', 'G'])
+        chd.set_attack_velocities(90)
+        chd.lyric = 'la'
+        treble.add_note(chd)
+        treble.add_message(Message('control_change', control=10, value=10))
+        treble.add_note(PopularChord(root='D4', name='minor', bass='F3'))
+        nte = Note(40)
+        nte.release_velocity = 12
+        bass.add_note(nte, inherit=False)
+        bass.add_note(Note(43, quarter_length=1 / 3))
+        return sc
+
+    def sequence(self, clef):
+        return [(type(node.value).__name__, str(node.value), node.ticks,
+                 node.lyric, node.attack_velocity, node.release_velocity,
+                 node.volume, node.tempo) for node in clef.note_sequence]
+
+    def test_round_trip(self):
+        sc = self.score()
+        data = sc.dumps()
+        loaded = Score.loads(data)
+        self.assertEqual(loaded.title, 'Nocturne')
+        self.assertEqual(loaded.copyright, 'AlgoTunes')
+        self.assertEqual(loaded.tempo, 90)
+        self.assertEqual(loaded.time_signature.value, '3/4')
+        self.assertEqual(loaded.staves[0].name, 'GreatStaff')
+        for clef, loaded_clef in zip(sc.staves[0].clefs, loaded.staves[0].clefs):
+            self.assertEqual(self.sequence(loaded_clef), self.sequence(clef))
+        treble, bass = loaded.staves[0].clefs
+        self.assertEqual(treble.head.pitch, 'C#')
+        self.assertEqual(treble.note_sequence[2].notes[0].attack_velocity, 90)
+        self.assertEqual(treble.note_sequence[4].bass.number, 41)
+        self.assertIsNone(bass.head.parent)
+        self.assertEqual(loaded.dumps(), data)
+
+    def test_loads_lazily(self):
+        data = self.score().dumps()
+        loaded = Score.loads(data)
+        treble = loaded.staves[0].clefs[0]
+        columns, _ = treble._stored
+        self.assertTrue(np.shares_memory(columns['number'],
+                                         np.frombuffer(data, dtype='u1')))
+        self.assertEqual(columns['kind'].tolist(), [0, 1, 2, 3, 2])
+        self.assertEqual(columns['ticks'].dtype, np.dtype('<u8'))
+        self.assertEqual(sorted(treble.unique_quarter_lengths), [0.5, 1.0, 2.0])
+        self.assertIsNone(treble._stored)
+        clone = loaded.staves[0].clefs[1].clone()
+        self.assertEqual(clone.head.number, 40)
+
+    def test_save_native(self):
+        directory = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(directory, 'score.native')
+            sc = self.score()
+            sc.save_native(filename)
+            loaded = Score.load_native(filename)
+            self.assertEqual(self.sequence(loaded.staves[0].clefs[0]),
+                             self.sequence(sc.staves[0].clefs[0]))
+        finally:
+            shutil.rmtree(directory)
+
+    def test_invalid_data(self):
+        self.assertRaises(NativeFormatException, loads, b'SCORE')
+        self.assertRaises(NativeFormatException, loads, b'MThd' + bytes(20))
+        newer = PRELUDE.pack(MAGIC, 99, 2) + b'{}'
+        self.assertRaises(NativeFormatException, loads, newer)
+        self.assertEqual(len(Score.loads(Score().dumps()).staves), 0)
+
+    def test_truncated_data(self):
+        data = self.score().dumps()
+        for length in [len(data) - 8, len(data) // 2, PRELUDE.size + 4]:
+            self.assertRaises(NativeFormatException, loads, data[:length])
@@ -1,9 +1,13 @@
+import gc
 import unittest
+import weakref
 
-from ..base import ScoreException
+from ..base import ScoreException, NoteException
+from ..chord import Chord
 from ..config import config
 from ..instrument import Instrument
-from ..note import MusicObject, Note, NoteBase, Message, Rest
+from ..midi import MidiNote
+from ..note import MusicObject, Note, NoteBase, Message, Placement, Rest
 from ..time_signature import TimeSignature
 
 
@@ -71,6 +75,55 @@ class TestNoteBase(unittest.TestCase):
             setattr(nb, key, props[key])
         self.assertEqual(nb.next.prev, nb)
 
+    def test_ticks(self):
+        from fractions import Fraction
+        ticks_per_quarter = config.TICKS_PER_QUARTER
+        nb = NoteBase(quarter_length=1 / 3.0)
+        self.assertEqual(nb.ticks * 3, ticks_per_quarter)
+        nb.quarter_length = Fraction(1, 7)
+        self.assertEqual(nb.ticks * 7, ticks_per_quarter)
+        nb.ticks = ticks_per_quarter // 16
+        self.assertEqual(nb.quarter_length, 0.0625)
+        self.assertRaises(ScoreException, setattr, nb, 'ticks', 1.5)
+        self.assertRaises(ValueError, setattr, nb, 'ticks', -1)
+        chd = Chord([60, 64], quarter_length=0.5)
+        chd.ticks = ticks_per_quarter * 2
+        self.assertEqual([note.quarter_length for note in chd.notes], [2.0, 2.0])
+
+    def test_total_ticks(self):
+        # A thousand triplets make exactly a thousand thirds of a quarter
+        nte = Note(60, quarter_length=1 / 3.0)
+        current = nte
+        for i in range(0, 2999):
+            current.next = Note(60, quarter_length=1 / 3.0)
+            current = current.next
+        self.assertEqual(nte.total_ticks, 1000 * config.TICKS_PER_QUARTER)
+        self.assertEqual(nte.total_quarter_length, 1000.0)
+
+    def test_compact_layout(self):
+        for obj in [Note(60), Rest(), Message('note_on'), Chord()]:
+            self.assertFalse(hasattr(obj, '__dict__'))
+        nte = Note(60)
+        self.assertIsNone(nte.lyric)
+        nte.lyric = 'la'
+        self.assertEqual(nte.lyric, 'la')
+        self.assertIsNone(Note(60).lyric)
+        self.assertIsInstance(nte.midi, MidiNote)
+
+    def test_no_reference_cycles(self):
+        nb = NoteBase()
+        nb.next = Note(60)
+        nb.next.next = Chord()
+        self.assertIs(nb.head, nb)
+        self.assertIs(nb.next.next.prev, nb.next)
+        last = weakref.ref(nb.next.next)
+        gc.disable()
+        try:
+            del nb
+            self.assertIsNone(last())
+        finally:
+            gc.enable()
+
     def test_reset_position(self):
         nb = NoteBase()
         nb.next = Note(60)
@@ -83,11 +136,56 @@ class TestNoteBase(unittest.TestCase):
 
     def test_set_prev(self):
         nb = NoteBase()
-        nb.set_prev(Note(60))
+        prev = Note(60)
+        nb.set_prev(prev)
         self.assertEqual(nb.prev.number, 60)
+        # Previous notes are weak references
+        del prev
+        self.assertIsNone(nb.prev)
         self.assertRaises(ScoreException, nb.set_prev, prev_item=100)
 
 
+class TestPlacement(unittest.TestCase):
+
+    def test_init(self):
+        nte = Note('E', quarter_length=2.0)
+        nte.lyric = 'la'
+        nte.tempo = 90
+        pl = Placement(nte)
+        self.assertIs(pl.value, nte)
+        self.assertIs(Placement(pl).value, nte)
+        self.assertEqual(pl.number, nte.number)
+        self.assertEqual(pl.quarter_length, 2.0)
+        self.assertEqual(pl.lyric, 'la')
+        self.assertEqual(pl.tempo, 90)
+        self.assertEqual(pl.volume, 64)
+        self.assertRaises(ScoreException, Placement, 60)
+
+    def test_value_is_not_modified(self):
+        nte = Note('E')
+        pl = Placement(nte, quarter_length=3.0)
+        pl.lyric = 'lo'
+        pl.volume = 20
+        self.assertEqual(pl.quarter_length, 3.0)
+        self.assertEqual(Placement(pl).quarter_length, 3.0)
+        self.assertEqual(nte.quarter_length, 1.0)
+        self.assertIsNone(nte.lyric)
+        self.assertEqual(nte.volume, 64)
+        self.assertRaises(AttributeError, setattr, pl, 'number', 61)
+        pl.value = Note('F')
+        self.assertEqual(pl.number, 53)
+        self.assertEqual(nte.name, 'E4')
+
+    def test_links(self):
+        nte = Note('E')
+        first = Placement(nte)
+        first.next = Placement(nte)
+        self.assertIs(first.next.prev, first)
+        self.assertIsNone(nte.next)
+        self.assertFalse(nte.is_placed)
+        self.assertTrue(first.is_placed)
+
+
 class TestMessage(unittest.TestCase):
 
     def test_property_setters(self):
@@ -125,6 +223,23 @@ class TestNote(unittest.TestCase):
             closest_nte = nte.closest_note(letter)
             self.assertIn(closest_nte.name, closest[letter])
 
+    def test_next_number(self):
+        self.assertEqual(Note.next_number(60, 'D'), 62)
+        self.assertEqual(Note.next_number(60, 'C'), 72)
+        self.assertEqual(Note.next_number(60, 'B#', forward=False), 48)
+        self.assertEqual(Note.next_number(60, 11, forward=False), 59)
+        self.assertEqual(Note.next_number(125, 'C'), None)
+        self.assertEqual(Note.next_number(1, 'D', forward=False), None)
+        self.assertEqual(Note.next_number(60, 'H'), None)
+
+    def test_closest_notes(self):
+        numbers = [60, 125, 2, 60]
+        self.assertEqual(list(Note.closest_notes(numbers, ['D', 'C', 'E-', 'H'])),
+                         [62, 120, 3, -1])
+        self.assertEqual(list(Note.closest_notes(numbers, [2, 0, 3, 0], forward=False)),
+                         [50, 120, 3, 48])
+        self.assertEqual(list(Note.closest_notes(numbers, 'G')), [67, 127, 7, 67])
+
     def test_property_setters(self):
         num = 60
         ql = 20.0
@@ -267,6 +382,16 @@ class TestNote(unittest.TestCase):
             self.assertEqual(Note.number_to_name(number[i]),
                              name[i])
 
+    def test_spell(self):
+        n = Note(61)
+        n.spell('C#')
+        self.assertEqual(n.name, 'C#5')
+        self.assertEqual(n.pitch, 'C#')
+        self.assertEqual(n.enharmonic, 'D-5')
+        self.assertEqual(n.number, 61)
+        self.assertRaises(NoteException, n.spell, 'D')
+        self.assertRaises(NoteException, Note(60).spell, 'B#')
+
     def test_get_accidental(self):
         self.assertRaises(ValueError, Note.get_accidental, note_name=4)
         self.assertEqual(Note.get_accidental('f#'), '#')
@@ -1,8 +1,9 @@
 import unittest
 
-from ..base import ScaleException
+from ..base import ScaleException, ScoreException
 from ..note import Note
-from ..scale import ScaleBase, Scale, MajorScale, MinorScale, DiatonicScale
+from ..scale import ScaleBase, Scale, MajorScale, MinorScale, DiatonicScale, \
+    DIATONIC_MODES, rotate_intervals
 
 
 class TestScaleBase(unittest.TestCase):
@@ -30,6 +31,33 @@ class TestScaleBase(unittest.TestCase):
         self.assertEqual(sb.leap(Note('D3'), 2).name, 'F3')
         self.assertEqual(sb.leap(Note('D3'), 2, forward=False).name, 'B3')
 
+    def test_degree_of(self):
+        sb = ScaleBase('G')
+        self.assertEqual(sb.degree_of(Note('G2')), 0)
+        self.assertEqual(sb.degree_of('F#'), 6)
+        self.assertEqual(sb.degree_of(48), 3)
+        self.assertEqual(sb.degree_of('F'), None)
+        self.assertRaises(ValueError, sb.degree_of, 'X')
+
+    def test_note_at_degree(self):
+        sb = ScaleBase('G')
+        self.assertEqual(sb.note_at_degree(0), 55)
+        self.assertEqual(sb.note_at_degree(6), 66)
+        self.assertEqual(sb.note_at_degree(7), 67)
+        self.assertEqual(sb.note_at_degree(-1, octave=5), 66)
+        self.assertEqual(list(sb.notes_at_degrees([0, 6, 7, -1], octave=4)), [55, 66, 67, 54])
+
+    def test_leap_number(self):
+        sb = ScaleBase('C')
+        self.assertEqual(sb.leap_number(38, 2), 41)
+        self.assertEqual(sb.leap_number('D3', 2, forward=False), 47)
+        self.assertEqual(sb.leap_number(38, 0), 38)
+        self.assertEqual(sb.leap_number(127, 1), 117)
+        self.assertRaises(ScaleException, sb.leap_number, 39, 1)
+        self.assertEqual(list(sb.leap_numbers([38, 127, 60], 1)), [40, 117, 62])
+        self.assertEqual(list(sb.leap_numbers([38, 60], 2, forward=False)), [47, 69])
+        self.assertRaises(ScaleException, sb.leap_numbers, [38, 39], 1)
+
     def test_property_setters(self):
         sb = ScaleBase('C')
         notes = ['C4', 'D4', 'E4', 'F4', 'G4', 'A4', 'B4']
@@ -129,3 +157,29 @@ class TestDiatonicScale(unittest.TestCase):
         notes = sc.locrian_mode.note_sequence
         for i in range(0, len(notes)):
             self.assertEqual(notes[i].name, locrian[i])
+
+    def test_mode(self):
+        sc = DiatonicScale('G')
+        self.assertIs(sc.mode('dorian'), sc.dorian_mode)
+        self.assertIs(sc.mode(5), sc.aeolian_mode)
+        self.assertEqual(sc.mode('aeolian').tonic.name, 'E5')
+        self.assertEqual(sc.mode('lydian').intervals, DIATONIC_MODES['lydian'])
+        self.assertIs(DiatonicScale('G').mixolydian_mode, sc.mixolydian_mode)
+        self.assertRaises(ScaleException, sc.mode, 'hypodorian')
+        self.assertRaises(ScaleException, sc.mode, 7)
+        self.assertRaises(ValueError, DiatonicScale, 'X')
+        self.assertRaises(ScoreException, sc.mode, 1.0)
+
+    def test_mode_cache(self):
+        tonic = Note('A-3')
+        ionian = DiatonicScale(tonic).ionian_mode
+        self.assertIsNot(ionian.tonic, tonic)
+        tonic.input = 'C3'
+        self.assertEqual(DiatonicScale('A-3').ionian_mode.tonic.name, 'A-3')
+        self.assertIs(DiatonicScale(Note('A-3').number).dorian_mode,
+                      DiatonicScale('A-3').dorian_mode)
+
+    def test_rotate_intervals(self):
+        self.assertEqual(rotate_intervals([0, 2, 4, 5, 7, 9, 11], 1), [0, 2, 3, 5, 7, 9, 10])
+        self.assertEqual(rotate_intervals([0, 2, 4, 7, 9], 4), [0, 3, 5, 7, 10])
+        self.assertEqual(DIATONIC_MODES['locrian'], [0, 1, 3, 5, 6, 8, 10])
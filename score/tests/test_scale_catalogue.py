@@ -0,0 +1,49 @@
+import unittest
+
+from ..base import ScaleException
+from ..config import config
+from ..note import Note
+from ..scale import ScaleBase, DIATONIC_MODES
+from ..scale_catalogue import ScaleCatalogue
+
+
+class TestScaleCatalogue(unittest.TestCase):
+
+    def setUp(self):
+        self.catalogue = ScaleCatalogue()
+
+    def test_register(self):
+        self.assertEqual(len(self.catalogue), 12 * (len(config.SCALE_PROPS) + len(DIATONIC_MODES)))
+        self.catalogue.register('blues', [0, 3, 5, 6, 7, 10])
+        self.assertIn(('blues', 0), self.catalogue.containing(['C', 'E-', 'F#']))
+        self.assertRaises(ScaleException, self.catalogue.register, 'blues', [0, 3])
+        self.assertRaises(ScaleException, self.catalogue.register, 'bad', [0, 14])
+        self.assertRaises(ScaleException, self.catalogue.intervals, 'unknown')
+
+    def test_containing(self):
+        scales = self.catalogue.containing(['F#', 'B', 'D'])
+        self.assertIn(('ionian', 7), scales)
+        self.assertIn(('dorian', 9), scales)
+        self.assertIn(('dodecatonic', 5), scales)
+        self.assertNotIn(('ionian', 0), scales)
+        for name, tonic in scales:
+            scale = self.catalogue.scale(name, tonic)
+            for pitch in ['F#', 'B', 'D']:
+                self.assertTrue(scale.degree_of(pitch) is not None)
+        self.assertEqual(len(self.catalogue.containing([])), len(self.catalogue))
+        self.assertEqual(self.catalogue.containing([Note(60), 61, 62, 63, 64, 65, 66, 67, 68]),
+                         [('dodecatonic', t) for t in range(0, 12)])
+
+    def test_closest(self):
+        closest = self.catalogue.closest([60, 62, 64, 65, 67, 69, 71], k=3)
+        self.assertEqual(closest[0], (0, 'heptatonic', 0))
+        self.assertEqual([c[0] for c in closest], [0, 0, 0])
+        closest = self.catalogue.closest([60, 62, 64, 66, 67, 69, 71], k=1)
+        self.assertEqual(closest, [(0, 'heptatonic', 7)])
+        self.assertEqual(self.catalogue.closest(['C', 'D#'], k=1)[0][0], 1)
+
+    def test_scale(self):
+        scale = self.catalogue.scale('dorian', 2)
+        self.assertTrue(isinstance(scale, ScaleBase))
+        self.assertEqual(scale.tonic.name, 'D4')
+        self.assertEqual(self.catalogue.mask('ionian', 0), self.catalogue.mask('aeolian', 9))
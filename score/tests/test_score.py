@@ -1,6 +1,9 @@
+import gc
 import unittest
+import weakref
 
 from ..base import ScoreException
+from ..chord import Chord
 from ..instrument import Instrument
 from ..note import Note, Rest
 from ..score import Score
@@ -160,6 +163,59 @@ class TestScore(unittest.TestCase):
         sc = Score()
         sc.add_staff(st)
         self.assertEqual(sc.staves[0], st)
+        self.assertIs(st.parent, sc)
+
+    def test_inherited_attributes(self):
+        sc = Score(time_signature='6/8')
+        st = Staff()
+        n = Note('C')
+        st.clefs[0].add_note(n)
+        self.assertEqual(n.time_signature.value, '4/4')
+        sc.add_staff(st)
+        self.assertEqual(n.time_signature.value, '6/8')
+        sc.tempo = 80
+        sc.release_velocity = 10
+        self.assertEqual(n.tempo, 80)
+        self.assertEqual(n.release_velocity, 10)
+        loose = Staff()
+        sc.add_staff(loose, inherit=False)
+        self.assertEqual(loose.tempo, 120)
+
+    def test_clone(self):
+        sc = Score(time_signature='6/8')
+        sc.title = 'Variations'
+        st = Staff()
+        st.clefs[0].add_note(Note('C'))
+        st.clefs[0].add_note(Note('E'))
+        sc.add_staff(st)
+        cl = sc.clone()
+        self.assertEqual(cl.title, 'Variations')
+        self.assertEqual(cl.time_signature.value, '6/8')
+        self.assertIs(cl.staves[0].parent, cl)
+        cl.tempo = 60
+        cl.staves[0].clefs[0].head.next.value = Note('F')
+        self.assertEqual(cl.staves[0].clefs[0].head.next.tempo, 60)
+        self.assertEqual(sc.staves[0].clefs[0].head.next.tempo, 120)
+        self.assertEqual(sc.staves[0].clefs[0].head.next.name, 'E4')
+
+    def test_freed_without_collector(self):
+        sc = Score()
+        st = Staff('GreatStaff')
+        for clef in st.clefs:
+            clef.add_note(Note('C'))
+            clef.add_note(Chord(['C', 'E', 'G']))
+            clef.add_note(Rest())
+        sc.add_staff(st)
+        refs = [weakref.ref(obj) for obj in [sc, st, st.clefs[0],
+                                            st.clefs[1].head.next.notes[0]]]
+        del st, clef
+        gc.disable()
+        try:
+            del sc
+            for ref in refs:
+                self.assertIsNone(ref())
+        finally:
+            gc.enable()
 
     def test_has_instrument(self):
         st1 = Staff()
@@ -0,0 +1,70 @@
+import unittest
+
+from ..chord import Chord
+from ..key import KeySignature
+from ..note import Note, Rest
+from ..score import Score
+from ..spelling import respell, notes
+from ..staff import Clef, Staff
+
+
+class TestSpelling(unittest.TestCase):
+
+    def clef(self, numbers):
+        clef = Clef()
+        for n in numbers:
+            clef.add_note(Note(n))
+        return clef
+
+    def names(self, obj):
+        return [note.name for note in notes(obj)]
+
+    def test_notes(self):
+        clef = Clef()
+        clef.add_note(Note(60))
+        clef.add_note(Rest())
+        clef.add_note(Chord([64, 67]))
+        self.assertEqual(self.names(clef), ['C5', 'E5', 'G5'])
+        self.assertEqual(self.names(Chord([64, 67])), ['E5', 'G5'])
+
+    def test_respell_key(self):
+        clef = self.clef([61, 63, 66, 68, 70])
+        self.assertIs(respell(clef, 'B'), KeySignature('B'))
+        self.assertEqual(self.names(clef), ['C#5', 'D#5', 'F#5', 'G#5', 'A#5'])
+        respell(clef, KeySignature('E-'))
+        self.assertEqual(self.names(clef), ['D-5', 'E-5', 'G-5', 'A-5', 'B-5'])
+
+    def test_respell_detected_key(self):
+        clef = self.clef([62, 64, 66, 67, 69, 71, 73, 74, 66, 69, 62])
+        key_signature = respell(clef)
+        self.assertEqual(key_signature.key.name, 'D major')
+        self.assertIn('C#6', self.names(clef))
+        self.assertIsNone(respell(Clef()))
+
+    def test_respell_score(self):
+        score = Score()
+        staff = Staff()
+        staff.clefs[0].add_note(Chord([61, 66, 69]))
+        score.add_staff(staff)
+        respell(score, 'A')
+        self.assertEqual(self.names(score), ['C#5', 'F#5', 'A5'])
+
+    def test_respell_shared(self):
+        clef = self.clef([61, 63])
+        clef.add_note(Chord([61, 63]))
+        clone = clef.clone()
+        respell(clone, 'D')
+        self.assertEqual(self.names(clone), ['C#5', 'D#5', 'C#5', 'D#5'])
+        self.assertEqual(self.names(clef), ['D-5', 'E-5', 'D-5', 'E-5'])
+
+        # A note placed in two clefs is respelled in one of them only
+        motif = Note(61)
+        other = Clef()
+        clef = Clef()
+        clef.add_note(motif)
+        other.add_note(motif)
+        respell(clef, 'D')
+        self.assertEqual(self.names(clef), ['C#5'])
+        self.assertEqual(self.names(other), ['D-5'])
+        self.assertEqual(motif.name, 'D-5')
+        self.assertEqual(clef.total_quarter_length, 1.0)
@@ -2,7 +2,7 @@ import unittest
 
 from ..base import NoteException, ScoreException, StaffException
 from ..chord import Chord
-from ..note import Note, Rest, Message
+from ..note import Note, Rest, Message, Placement
 from ..staff import Clef, Staff
 
 
@@ -27,6 +27,51 @@ class TestClef(unittest.TestCase):
             self.assertEqual(notes[i], seq[i])
         self.assertRaises(NoteException, c.add_note, note='j')
 
+    def test_inherited_attributes(self):
+        c = Clef()
+        n = Note('C')
+        chord = Chord(['C', 'E'])
+        c.add_note(n)
+        c.add_note(chord)
+        loose = Note('D')
+        c.add_note(loose, inherit=False)
+        c.tempo = 90
+        c.attack_velocity = 100
+        self.assertEqual(n.tempo, 90)
+        self.assertEqual(chord.notes[1].attack_velocity, 100)
+        self.assertEqual(loose.tempo, 120)
+        self.assertIsNone(n._tempo)
+        n.tempo = 60
+        self.assertEqual(n.tempo, 60)
+        self.assertEqual(c.tempo, 90)
+        c.tempo = 100
+        self.assertEqual(n.tempo, 60)
+        self.assertEqual(chord.tempo, 100)
+
+    def test_inherited_after_parent_is_gone(self):
+        c = Clef()
+        c.tempo = 60
+        n = Note('C')
+        c.add_note(n)
+        c.add_note(Chord(['C', 'E']))
+        chord_note = c.head.next.notes[0]
+        del c
+        self.assertIsNone(n.parent)
+        self.assertEqual(n.tempo, 60)
+        self.assertEqual(chord_note.tempo, 60)
+        # Through a placement that is gone, and its clef
+        chd = Chord(['C', 'E'])
+        Clef().add_note(chd)
+        c = Clef()
+        c.tempo = 80
+        c.add_note(chd)
+        c.head.volume = 30
+        views = c.head.notes
+        del c
+        self.assertEqual([view.volume for view in views], [30, 30])
+        self.assertEqual([view.tempo for view in views], [80, 80])
+        self.assertEqual(chd.tempo, 120)
+
     def test_add_message(self):
         c = Clef()
         msgs = [Message('control_change', control=10, value=10),
@@ -42,6 +87,160 @@ class TestClef(unittest.TestCase):
         self.assertEqual(seq[1], msgs[1])
         self.assertRaises(ScoreException, c.add_message, Note('D'))
 
+    def test_add_shared_note(self):
+        c1 = Clef()
+        c2 = Clef('Bass')
+        motif = Note('C')
+        c1.add_note(motif)
+        c1.add_note(motif, quarter_length=2.0)
+        c2.add_note(motif)
+        c1.volume = 30
+        self.assertIs(c1.head, motif)
+        self.assertIsInstance(motif.next, Placement)
+        self.assertIs(c1.head.next.value, motif)
+        self.assertIs(c2.head.value, motif)
+        self.assertEqual(c1.total_quarter_length, 3.0)
+        self.assertEqual(motif.quarter_length, 1.0)
+        self.assertEqual(c1.head.next.volume, 30)
+        self.assertEqual(c2.head.volume, 64)
+        msg = Message('random', a=5)
+        c1.add_message(msg)
+        c2.add_message(msg)
+        self.assertIs(c2.head.next.value, msg)
+
+    def test_shared_values_are_read_only(self):
+        c1 = Clef()
+        c2 = Clef()
+        motif = Note(60)
+        chd = Chord([60, 64])
+        for c in [c1, c2]:
+            c.add_note(motif)
+            c.add_note(chd)
+        self.assertTrue(motif.is_shared)
+        self.assertRaises(NoteException, setattr, motif, 'input', 62)
+        self.assertRaises(NoteException, motif.spell, 'B#')
+        self.assertRaises(NoteException, setattr, motif, 'quarter_length', 2.0)
+        self.assertRaises(NoteException, setattr, motif, 'tempo', 90)
+        self.assertRaises(NoteException, chd.add_note, 67)
+        self.assertRaises(NoteException, chd.set_attack_velocities, 20)
+        self.assertRaises(NoteException, chd.notes[0].spell, 'B#')
+        # Changes through a placement go to a copy of its own
+        c2.head.input = 62
+        c2.head.next.own_value().set_attack_velocities(20)
+        self.assertEqual(motif.number, 60)
+        self.assertEqual(c1.head.number, 60)
+        self.assertEqual(c2.head.number, 62)
+        self.assertEqual([n.attack_velocity for n in c1.head.next.notes], [75, 75])
+        self.assertEqual([n.attack_velocity for n in c2.head.next.notes], [20, 20])
+        self.assertFalse(c2.head.value.is_shared)
+        # Placed notes are taken as notes
+        chd2 = Chord([48])
+        chd2.add_note(c2.head)
+        self.assertEqual([n.number for n in chd2.notes], [48, 62])
+        self.assertTrue(chd2.has_pitch(c1.head))
+        self.assertTrue(Note.is_note_instance(c1.head))
+
+    def test_add_shared_chord(self):
+        c1 = Clef()
+        c2 = Clef()
+        chd = Chord([60, 64])
+        c1.add_note(chd)
+        c2.add_note(chd)
+        c2.attack_velocity = 100
+        pl = c2.head
+        self.assertEqual(pl.attack_velocity, 100)
+        self.assertEqual([n.attack_velocity for n in pl.notes], [100, 100])
+        self.assertEqual([n.attack_velocity for n in chd.notes], [75, 75])
+        self.assertEqual([n.number for n in pl.notes], [60, 64])
+        self.assertIs(pl.notes, pl.notes)
+        pl.notes[0].attack_velocity = 20
+        self.assertEqual(pl.notes[0].attack_velocity, 20)
+        self.assertEqual(chd.notes[0].attack_velocity, 75)
+
+    def test_clone(self):
+        c = Clef('Bass')
+        c.volume = 50
+        notes = [Note('C'), Chord(['C', 'E']), Rest(), Note('D')]
+        for n in notes:
+            c.add_note(n)
+        c.head.next.next.lyric = 'la'
+        cl = c.clone()
+        self.assertEqual(cl.name, 'Bass')
+        self.assertEqual(cl.volume, 50)
+        self.assertEqual([n.value for n in cl.note_sequence], notes)
+        self.assertEqual(cl.head.next.next.lyric, 'la')
+        c.add_note(Note('E'))
+        cl.add_note(Note('F'), quarter_length=2.0)
+        self.assertEqual([n.value.name for n in cl.note_sequence[-2:]], ['D4', 'F4'])
+        self.assertEqual(c.note_sequence[-1].name, 'E4')
+        self.assertEqual(cl.total_quarter_length, 6.0)
+        cl.head.value = Note('G')
+        cl.volume = 20
+        self.assertEqual(c.head.name, 'C4')
+        self.assertEqual(cl.head.value.name, 'G4')
+        self.assertEqual(cl.head.next.volume, 20)
+        self.assertEqual(c.head.next.volume, 50)
+        self.assertEqual(sorted(cl.unique_quarter_lengths), [1.0, 2.0])
+        self.assertIsNone(Clef().clone().head)
+
+    def test_clone_isolation(self):
+        c = Clef()
+        for n in [60, 62, 64, 65]:
+            c.add_note(Note(n))
+        numbers = lambda clef: [n.number for n in clef.note_sequence]
+
+        # Edits to the original after cloning
+        cl = c.clone()
+        c.head.next.input = 70
+        c.head.next.attack_velocity = 10
+        self.assertEqual(numbers(c), [60, 70, 64, 65])
+        self.assertEqual(numbers(cl), [60, 62, 64, 65])
+        self.assertEqual(cl.head.next.attack_velocity, c.attack_velocity)
+
+        # Edits to the clone
+        cl.head.next.next.input = 40
+        cl.head.attack_velocity = 20
+        self.assertEqual(numbers(cl), [60, 62, 40, 65])
+        self.assertEqual(numbers(c), [60, 70, 64, 65])
+        self.assertEqual(c.head.attack_velocity, cl.attack_velocity)
+
+        # Edits to a clone that was cloned again
+        a = cl.clone()
+        b = a.clone()
+        a.head.next.value = Note(40)
+        a.head.input = 41
+        self.assertEqual(numbers(a), [41, 40, 40, 65])
+        self.assertEqual(numbers(b), [60, 62, 40, 65])
+        b.head.next.next.next.input = 50
+        self.assertEqual(numbers(a), [41, 40, 40, 65])
+        self.assertEqual(numbers(b), [60, 62, 40, 50])
+        self.assertEqual(numbers(cl), [60, 62, 40, 65])
+
+        # Edits made by library transforms
+        from ..spelling import respell
+        c = Clef()
+        for n in [61, 63]:
+            c.add_note(Note(n))
+        c.add_note(Chord([61, 66]))
+        cl = c.clone()
+        cl2 = cl.clone()
+        names = lambda clef: [n.name for n in clef.note_sequence[:2]] + \
+            [n.name for n in clef.current.notes]
+        respell(c, 'D')
+        self.assertEqual(names(c), ['C#5', 'D#5', 'C#5', 'F#5'])
+        self.assertEqual(names(cl), ['D-5', 'E-5', 'D-5', 'F#5'])
+        respell(cl, 'D')
+        self.assertEqual(names(cl2), ['D-5', 'E-5', 'D-5', 'F#5'])
+        self.assertIsInstance(c.head, Placement)
+
+        # Chords are copied with their notes
+        c = Clef()
+        c.add_note(Chord([48, 52]))
+        cl = c.clone()
+        cl.head.input = [50, 53]
+        self.assertEqual([n.number for n in c.head.notes], [48, 52])
+        self.assertEqual([n.number for n in cl.head.notes], [50, 53])
+
     def test_round_up(self):
         c = Clef()
         qls = [1.0, 2.0, 3.0]
@@ -89,6 +288,48 @@ class TestClef(unittest.TestCase):
         for nte in c.unique_quarter_lengths:
             self.assertIn(nte, [1.0, 2.0, 2.5, 1.5])
 
+    def test_denominator(self):
+        c = Clef('Treble')
+        self.assertEqual(c.denominator, 1)
+        c.add_note(Note('C', quarter_length=1.5))
+        c.add_note(Note('D', quarter_length=1 / 3.0))
+        self.assertEqual(c.denominator, 6)
+        clone = c.clone()
+        c.add_note(Rest(quarter_length=0.2))
+        self.assertEqual(c.denominator, 30)
+        self.assertEqual(clone.denominator, 6)
+
+        # Durations changed after the notes were added
+        c.head.quarter_length = 0.25
+        c.head.next.value = Note('E', quarter_length=1.0)
+        self.assertEqual(c.denominator, 20)
+        self.assertEqual(sorted(c.unique_quarter_lengths), [0.2, 0.25, 1.0])
+        clone.head.next.quarter_length = 1 / 7.0
+        self.assertEqual(clone.denominator, 14)
+        self.assertEqual(c.denominator, 20)
+        single = Clef()
+        single.add_note(Note('C'), inherit=False)
+        single.head.quarter_length = 0.5
+        self.assertEqual(single.denominator, 2)
+
+        # A change only makes the clef of the changed note count again
+        other = Clef()
+        other.add_note(Note('C', quarter_length=0.5))
+        other.add_note(Note('D'))
+        self.assertEqual(other.denominator, 2)
+        counted = other._durations
+        c.head.quarter_length = 0.125
+        self.assertEqual(c.denominator, 40)
+        self.assertEqual(other.denominator, 2)
+        self.assertIs(other._durations, counted)
+        # Through the copy a placement takes of its shared value
+        other.add_note(c.head.next)
+        counted = c._durations
+        other.own_value(other.current).quarter_length = 1 / 3.0
+        self.assertEqual(other.denominator, 6)
+        self.assertEqual(c.denominator, 40)
+        self.assertIs(c._durations, counted)
+
 
 class TestStaff(unittest.TestCase):
 
@@ -122,6 +363,18 @@ class TestStaff(unittest.TestCase):
         self.assertEqual(len(s.clefs[1].note_sequence), len(clef2_ql) + 1)
         self.assertTrue(isinstance(s.clefs[1].note_sequence[-1], Rest))
 
+    def test_round_up_ticks(self):
+        s = Staff('GreatStaff')
+        for _ in range(0, 3):
+            s.clefs[0].add_note(Note(60), quarter_length=1 / 3.0)
+        s.clefs[1].add_note(Note(60))
+        s.clefs[1].head.ticks += 1
+        s.round_up()
+        self.assertEqual(s.clefs[0].total_ticks, s.clefs[1].total_ticks)
+        self.assertEqual(s.clefs[0].note_sequence[-1].ticks, 1)
+        s.round_up(1.0)
+        self.assertEqual(len(s.clefs[0].note_sequence), 4)
+
 
     def test_property_setters(self):
         names = ['TrebleStaff', 'BassStaff', 'PercussionStaff']
@@ -132,4 +385,51 @@ class TestStaff(unittest.TestCase):
         gs = Staff('GreatStaff')
         self.assertEqual(len(gs.clefs), 2)
         self.assertEqual(gs.clefs[0].name, 'Treble')
-        self.assertEqual(gs.clefs[1].name, 'Bass')
\ No newline at end of file
+        self.assertEqual(gs.clefs[1].name, 'Bass')
+
+    def test_clone(self):
+        st = Staff('GreatStaff', time_signature='3/4')
+        st.copyright = 'AlgoTunes'
+        st.clefs[1].add_note(Note('C'))
+        cl = st.clone()
+        self.assertEqual(cl.name, 'GreatStaff')
+        self.assertEqual(cl.copyright, 'AlgoTunes')
+        self.assertEqual(len(cl.clefs), 2)
+        self.assertIsNot(cl.clefs, st.clefs)
+        self.assertIs(cl.clefs[1].parent, cl)
+        self.assertIs(cl.clefs[1].head.value, st.clefs[1].head.value)
+        cl.time_signature = '6/8'
+        self.assertEqual(cl.clefs[1].head.time_signature.value, '6/8')
+        self.assertEqual(st.clefs[1].head.time_signature.value, '3/4')
+
+    def test_inherited_attributes(self):
+        st = Staff('GreatStaff', time_signature='3/4')
+        n = Note('C')
+        st.clefs[1].add_note(n)
+        self.assertEqual(n.time_signature.value, '3/4')
+        self.assertEqual(str(st), 'GreatStaff 3/4')
+        st.volume = 30
+        self.assertEqual(n.volume, 30)
+        st.clefs[1].volume = 40
+        self.assertEqual(n.volume, 40)
+        self.assertEqual(st.clefs[0].volume, 30)
+
+    def test_inherited_after_parent_is_gone(self):
+        st = Staff(time_signature='3/4')
+        st.tempo = 90
+        clef = st.clefs[0]
+        n = Note('C')
+        clef.add_note(n)
+        self.assertEqual(n.tempo, 90)
+        del st
+        self.assertIsNone(clef.parent)
+        self.assertEqual(clef.time_signature.value, '3/4')
+        self.assertEqual(clef.tempo, 90)
+        self.assertEqual(n.tempo, 90)
+        # The resolutions the clef caches follow its parent
+        other = Staff()
+        other.tempo = 70
+        clef.parent = other
+        self.assertEqual(n.tempo, 70)
+        clef._parent = None
+        self.assertEqual(n.tempo, 120)
@@ -0,0 +1,67 @@
+import unittest
+
+from ..base import ChordException, ScoreException
+from ..chord import Chord, PopularChord, RomanNumeral
+from ..config import config
+from ..staff import Clef, Staff
+from ..voice_leading import VoiceLeader
+
+
+class TestVoiceLeader(unittest.TestCase):
+
+    def test_lead(self):
+        leader = VoiceLeader()
+        chords = [PopularChord('C'), PopularChord('F'), PopularChord('G'), PopularChord('C')]
+        path = leader.lead(chords)
+        self.assertEqual(path[0], (60, 64, 67))
+        self.assertEqual(path[1], (60, 65, 69))
+        self.assertEqual(sorted(n % 12 for n in path[-1]), [0, 4, 7])
+        self.assertEqual(len(path), len(chords))
+        bottom, top = config.TREBLE_RANGE
+        for voicing in path:
+            self.assertTrue(min(voicing) >= bottom and max(voicing) <= top)
+        self.assertEqual(leader.lead([]), [])
+
+    def test_lead_is_optimal(self):
+        chords = [RomanNumeral('C', numeral=n) for n in ['I', 'vi', 'IV', 'V7', 'I']]
+        leader = VoiceLeader(register=config.BASS_RANGE, beam_width=1000)
+        path = leader.lead(chords)
+        best = [0]
+        candidates = [leader.candidates(c) for c in chords]
+
+        def search(i, prev, cost):
+            if i == len(candidates):
+                best[0] = cost if best[0] == 0 else min(best[0], cost)
+                return
+            for v in candidates[i]:
+                step = 0 if prev is None else VoiceLeader.voice_movement(prev, v)
+                search(i + 1, v, cost + step)
+        search(0, None, 0)
+        total = sum(VoiceLeader.voice_movement(a, b) for a, b in zip(path, path[1:]))
+        self.assertEqual(total, best[0])
+
+    def test_voice_movement(self):
+        self.assertEqual(VoiceLeader.voice_movement((60, 64, 67), (60, 65, 69)), 3)
+        self.assertEqual(VoiceLeader.voice_movement((60, 64), (60, 64, 67)), 3)
+
+    def test_to_clef_and_staff(self):
+        chords = [PopularChord('C', quarter_length=2.0), PopularChord('G')]
+        clef = VoiceLeader(register=config.BASS_RANGE).to_clef(chords, name='Bass')
+        self.assertTrue(isinstance(clef, Clef))
+        seq = clef.note_sequence
+        self.assertEqual(len(seq), 2)
+        self.assertEqual(seq[0].quarter_length, 2.0)
+        self.assertEqual(sorted(n % 12 for n in seq[0].note_numbers), [0, 4, 7])
+        for chd in seq:
+            self.assertTrue(Chord.are_bass_clef_numbers(chd.note_numbers))
+        staff = VoiceLeader().to_staff(chords)
+        self.assertTrue(isinstance(staff, Staff))
+        self.assertEqual(len(staff.clefs[0].note_sequence), 2)
+
+    def test_property_setters(self):
+        self.assertRaises(ValueError, VoiceLeader, register=(60, 40))
+        self.assertRaises(ScoreException, VoiceLeader, register=[36, 60])
+        self.assertRaises(ValueError, VoiceLeader, beam_width=0)
+        leader = VoiceLeader(register=(60, 62))
+        self.assertRaises(ChordException, leader.lead, [Chord()])
+        self.assertRaises(ScoreException, leader.lead, ['C'])
@@ -0,0 +1,170 @@
+"""
+Voice leading of chord progressions by dynamic programming over the
+candidate voicings of every chord
+"""
+import heapq
+from operator import itemgetter
+
+from score.base import ScoreObject, ChordException
+from score.chord import Chord
+from score.config import config
+from score.staff import Clef, Staff
+
+
+class VoiceLeader(ScoreObject):
+    """Finds the sequence of voicings of a chord progression with the
+    least total voice movement (Viterbi search). Every chord is voiced
+    within the register, a (bottom, top) pair of note numbers. Only the
+    beam_width cheapest voicings of each chord are carried forward, so
+    the cost is linear in the length of the progression.
+
+    Example:
+    >>> leader = VoiceLeader()
+    >>> leader.lead([PopularChord('C'), PopularChord('F'), PopularChord('G')])
+    [(60, 64, 67), (60, 65, 69), (62, 67, 71)]
+    """
+    def __init__(self, register=config.TREBLE_RANGE, max_span=12,
+                 max_spacing=None, beam_width=16):
+        self._register = None
+        self._max_span = max_span
+        self._max_spacing = max_spacing
+        self._beam_width = None
+        self._candidates = {}
+        self._costs = {}
+
+        self.register = register
+        self.beam_width = beam_width
+
+    def candidates(self, chord):
+        """Voicings of the chord within the register. Cached by the
+        pitch classes of the chord, so repeated chords cost a lookup
+        """
+        self.validate_type(chord, Chord)
+        key = tuple(sorted(n % 12 for n in chord.note_numbers))
+        voicings = self._candidates.get(key)
+        if voicings is None:
+            bottom, top = self._register
+            voicings = tuple(tuple(v) for v in chord.voicings(
+                bottom=bottom, top=top, max_span=self._max_span,
+                max_spacing=self._max_spacing))
+            if not voicings:
+                raise ChordException('The chord {} has no voicing within '
+                                     'the register {}'.format(chord,
+                                                              self._register))
+            self._candidates[key] = voicings
+        return voicings
+
+    def transition_cost(self, voicing1, voicing2):
+        key = (voicing1, voicing2)
+        cost = self._costs.get(key)
+        if cost is None:
+            cost = self.voice_movement(voicing1, voicing2)
+            self._costs[key] = cost
+        return cost
+
+    def lead(self, chords):
+        """Returns the voicing, as a tuple of note numbers, chosen for
+        each chord of the progression
+        """
+        layers = []
+        beam = None
+        for chord in chords:
+            layer = []
+            for voicing in self.candidates(chord):
+                if beam is None:
+                    layer.append((0, -1, voicing))
+                    continue
+                best_cost = None
+                best_index = -1
+                for index, (cost, _, prev_voicing) in enumerate(beam):
+                    cost += self.transition_cost(prev_voicing, voicing)
+                    if best_cost is None or cost < best_cost:
+                        best_cost = cost
+                        best_index = index
+                layer.append((best_cost, best_index, voicing))
+            if len(layer) > self._beam_width:
+                layer = heapq.nsmallest(self._beam_width, layer,
+                                        key=itemgetter(0))
+            layers.append(layer)
+            beam = layer
+
+        if not layers:
+            return []
+        index = min(range(len(beam)), key=lambda i: beam[i][0])
+        path = []
+        for layer in reversed(layers):
+            _, back, voicing = layer[index]
+            path.append(voicing)
+            index = back
+        path.reverse()
+        return path
+
+    def to_clef(self, chords, name='Treble'):
+        """Returns a new clef holding the voiced progression"""
+        clef = Clef(name)
+        self._add_chords(clef, chords)
+        return clef
+
+    def to_staff(self, chords, name='TrebleStaff'):
+        """Returns a new staff whose first clef holds the voiced
+        progression
+        """
+        staff = Staff(name)
+        self._add_chords(staff.clefs[0], chords)
+        return staff
+
+    def _add_chords(self, clef, chords):
+        chords = list(chords)
+        for chord, voicing in zip(chords, self.lead(chords)):
+            new_chord = Chord(list(voicing), quarter_length=chord.quarter_length)
+            if chord.lyric:
+                new_chord.lyric = chord.lyric
+            clef.add_note(new_chord)
+
+    @staticmethod
+    def voice_movement(voicing1, voicing2):
+        """Total number of semitones the voices move between two
+        voicings. Voicings of equal size are matched voice by voice,
+        otherwise every note is matched to the nearest note of the
+        other voicing
+        """
+        if len(voicing1) == len(voicing2):
+            return sum(abs(a - b) for a, b in zip(voicing1, voicing2))
+        movement = 0
+        for a in voicing1:
+            movement += min(abs(a - b) for b in voicing2)
+        for b in voicing2:
+            movement += min(abs(a - b) for a in voicing1)
+        return movement
+
+    @property
+    def register(self):
+        return self._register
+
+    @register.setter
+    def register(self, register):
+        self.validate_type(register, tuple)
+        bottom, top = register
+        if not (config.MIN_NOTE_NUM <= bottom < top <= config.MAX_NOTE_NUM):
+            raise ValueError('Invalid register {}'.format(register))
+        self._register = register
+        self._candidates = {}
+
+    @property
+    def beam_width(self):
+        return self._beam_width
+
+    @beam_width.setter
+    def beam_width(self, beam_width):
+        self.validate_type(beam_width, int)
+        if beam_width < 1:
+            raise ValueError('Beam width should be positive')
+        self._beam_width = beam_width
+
+
+def main():
+    pass
+
+
+if __name__ == '__main__':
+    main()
@@ -13,6 +13,7 @@ setup(
     description=DESCRIPTION,
     long_description=open('README.md').read(),
     install_requires=[
-        'mido'
+        'mido',
+        'numpy'
     ]
 )